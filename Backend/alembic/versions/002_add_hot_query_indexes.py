@@ -0,0 +1,36 @@
+"""Add composite indexes for hot query shapes
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+
+
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_tasks_project_status_assignee_order', 'tasks', ['project_id', 'status', 'assignee_id', 'order']),
+    ('ix_tasks_story_order', 'tasks', ['story_id', 'order']),
+    ('ix_epics_project_order', 'epics', ['project_id', 'order']),
+    ('ix_stories_epic_order', 'stories', ['epic_id', 'order']),
+    ('ix_notifications_user_read_created', 'notifications', ['user_id', 'read', 'created_at']),
+    ('ix_messages_channel_created', 'messages', ['channel_id', 'created_at']),
+    ('ix_messages_dm_created', 'messages', ['sender_id', 'recipient_id', 'created_at']),
+    ('ix_issues_project_status_created', 'issues', ['project_id', 'status', 'created_at']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
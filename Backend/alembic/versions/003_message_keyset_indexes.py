@@ -0,0 +1,29 @@
+"""Index message history along the id for keyset paging
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+
+
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # History pages are now ordered by id, so the created_at variants are replaced
+    op.drop_index('ix_messages_channel_created', table_name='messages')
+    op.drop_index('ix_messages_dm_created', table_name='messages')
+    op.create_index('ix_messages_channel_id_id', 'messages', ['channel_id', 'id'], unique=False)
+    op.create_index('ix_messages_dm_id', 'messages', ['sender_id', 'recipient_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_messages_dm_id', table_name='messages')
+    op.drop_index('ix_messages_channel_id_id', table_name='messages')
+    op.create_index('ix_messages_dm_created', 'messages', ['sender_id', 'recipient_id', 'created_at'], unique=False)
+    op.create_index('ix_messages_channel_created', 'messages', ['channel_id', 'created_at'], unique=False)
@@ -0,0 +1,60 @@
+"""Full-text index over message content
+
+SQLite gets an FTS5 external-content table kept in sync by triggers,
+Postgres a GIN index over to_tsvector(content).
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+
+
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("""
+            CREATE VIRTUAL TABLE messages_fts USING fts5(
+                content, content='messages', content_rowid='id', tokenize='unicode61'
+            )
+        """)
+        op.execute("""
+            CREATE TRIGGER messages_fts_ai AFTER INSERT ON messages BEGIN
+                INSERT INTO messages_fts(rowid, content) VALUES (new.id, new.content);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER messages_fts_ad AFTER DELETE ON messages BEGIN
+                INSERT INTO messages_fts(messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER messages_fts_au AFTER UPDATE OF content ON messages BEGIN
+                INSERT INTO messages_fts(messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+                INSERT INTO messages_fts(rowid, content) VALUES (new.id, new.content);
+            END
+        """)
+        op.execute("INSERT INTO messages_fts(messages_fts) VALUES ('rebuild')")
+    elif dialect == 'postgresql':
+        op.execute(
+            "CREATE INDEX ix_messages_content_tsv ON messages "
+            "USING GIN (to_tsvector('english', content))"
+        )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS messages_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS messages_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS messages_fts_ai")
+        op.execute("DROP TABLE IF EXISTS messages_fts")
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_messages_content_tsv")
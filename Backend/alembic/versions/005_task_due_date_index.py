@@ -0,0 +1,22 @@
+"""Index tasks by due date for scheduled risk scans
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+
+
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tasks_due_date', 'tasks', ['due_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_due_date', table_name='tasks')
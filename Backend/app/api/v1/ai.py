@@ -1,5 +1,7 @@
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+import json
 
 from app.core.security import get_current_user
 from app.services.ai_service import ai_service
@@ -9,7 +11,25 @@ router = APIRouter()
 class DiscoverMessage(BaseModel):
     message: str
 
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
 @router.post("/discover")
 async def discover(message: DiscoverMessage, current_user: dict = Depends(get_current_user)):
     response_text = await ai_service.get_discover_response(message.message, current_user)
     return {"sender": "ai", "text": response_text}
+
+@router.post("/discover/stream")
+async def discover_stream(message: DiscoverMessage, current_user: dict = Depends(get_current_user)):
+    """Server-Sent Events version of /discover: token, progress and done events"""
+    async def events():
+        async for event, data in ai_service.stream_discover_response(message.message, current_user):
+            yield sse_event(event, data)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query, Depends, HTTPException
 from app.services.ai_automation_service import automation_service
-from app.core.security import get_current_user
+from app.core.security import get_current_user, decode_token
 import jwt
 from starlette.config import Config
 import logging
@@ -15,7 +15,7 @@ async def automation_websocket(websocket: WebSocket, token: str = Query(...)):
     try:
         # Verify JWT token
         try:
-            payload = jwt.decode(token, config('JWT_SECRET_KEY'), algorithms=["HS256"])
+            payload = decode_token(token)
             user_id = payload['id']
             logger.info(f"User {user_id} connected to AI automation")
         except jwt.ExpiredSignatureError:
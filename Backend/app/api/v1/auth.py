@@ -3,8 +3,7 @@ from pydantic import BaseModel, EmailStr
 from sqlalchemy.future import select
 from app.models.user import User
 from app.config.database import SessionLocal
-from app.services.auth_service import auth_service
-from datetime import timedelta
+from app.services.auth_service import auth_service, InvalidRefreshToken
 
 router = APIRouter()
 
@@ -19,9 +18,14 @@ class UserLogin(BaseModel):
 
 class Token(BaseModel):
     access_token: str
+    refresh_token: str
     token_type: str
+    expires_in: int
     user: dict
 
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
 @router.post("/register", response_model=Token)
 async def register(user_data: UserRegister):
     """Register a new user with email and password"""
@@ -43,7 +47,7 @@ async def register(user_data: UserRegister):
             )
         
         # Create new user
-        hashed_password = auth_service.get_password_hash(user_data.password)
+        hashed_password = await auth_service.get_password_hash_async(user_data.password)
         new_user = User(
             username=user_data.username,
             email=user_data.email,
@@ -65,29 +69,8 @@ async def register(user_data: UserRegister):
         except Exception as e:
             print(f"Warning: Could not create organization: {e}")
         
-        # Create access token
-        access_token = auth_service.create_access_token(
-            data={
-                "id": new_user.id,
-                "username": new_user.username,
-                "email": new_user.email,
-                "role": new_user.role,
-                "avatar_url": new_user.avatar_url
-            },
-            expires_delta=timedelta(days=7)
-        )
-        
-        return {
-            "access_token": access_token,
-            "token_type": "bearer",
-            "user": {
-                "id": new_user.id,
-                "username": new_user.username,
-                "email": new_user.email,
-                "avatar_url": new_user.avatar_url,
-                "role": new_user.role
-            }
-        }
+        # Short-lived access token plus a refresh token for /auth/refresh
+        return await auth_service.issue_session(new_user)
 
 @router.post("/login", response_model=Token)
 async def login(credentials: UserLogin):
@@ -106,7 +89,7 @@ async def login(credentials: UserLogin):
             )
         
         # Verify password
-        if not auth_service.verify_password(credentials.password, user.password_hash):
+        if not await auth_service.verify_password_async(credentials.password, user.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password"
@@ -118,29 +101,8 @@ async def login(credentials: UserLogin):
                 detail="Inactive user"
             )
         
-        # Create access token
-        access_token = auth_service.create_access_token(
-            data={
-                "id": user.id,
-                "username": user.username,
-                "email": user.email,
-                "role": user.role,
-                "avatar_url": user.avatar_url
-            },
-            expires_delta=timedelta(days=7)
-        )
-        
-        return {
-            "access_token": access_token,
-            "token_type": "bearer",
-            "user": {
-                "id": user.id,
-                "username": user.username,
-                "email": user.email,
-                "avatar_url": user.avatar_url,
-                "role": user.role
-            }
-        }
+        # Short-lived access token plus a refresh token for /auth/refresh
+        return await auth_service.issue_session(user)
 
 @router.post("/demo-login", response_model=Token)
 async def demo_login():
@@ -157,7 +119,7 @@ async def demo_login():
         
         if not user:
             # Create demo user
-            hashed_password = auth_service.get_password_hash("demo123")
+            hashed_password = await auth_service.get_password_hash_async("demo123")
             user = User(
                 username="demo_user",
                 email="demo@atlas.ai",
@@ -189,7 +151,7 @@ async def demo_login():
             session.add(member)
             
             # Create a demo team member
-            demo_member_password = auth_service.get_password_hash("member123")
+            demo_member_password = await auth_service.get_password_hash_async("member123")
             demo_member = User(
                 username="team_member",
                 email="member@atlas.ai",
@@ -213,26 +175,23 @@ async def demo_login():
             await session.commit()
             await session.refresh(user)
         
-        # Create access token
-        access_token = auth_service.create_access_token(
-            data={
-                "id": user.id,
-                "username": user.username,
-                "email": user.email,
-                "role": user.role,
-                "avatar_url": user.avatar_url
-            },
-            expires_delta=timedelta(days=7)
+        # Short-lived access token plus a refresh token for /auth/refresh
+        return await auth_service.issue_session(user)
+
+@router.post("/refresh", response_model=Token)
+async def refresh(body: RefreshRequest):
+    """Exchange a refresh token for a new access token and a rotated refresh token"""
+    try:
+        claims, refresh_token = await auth_service.rotate_refresh_token(body.refresh_token)
+    except InvalidRefreshToken:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token"
         )
-        
-        return {
-            "access_token": access_token,
-            "token_type": "bearer",
-            "user": {
-                "id": user.id,
-                "username": user.username,
-                "email": user.email,
-                "avatar_url": user.avatar_url,
-                "role": user.role
-            }
-        }
+    return auth_service.session_response(claims, refresh_token)
+
+@router.post("/logout")
+async def logout(body: RefreshRequest):
+    """Revoke the refresh token and every token rotated from the same login"""
+    await auth_service.revoke_refresh_token(body.refresh_token)
+    return {"message": "Logged out successfully"}
@@ -1,17 +1,18 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, Query
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, Query, HTTPException, Response
 from pydantic import BaseModel
-from app.core.security import get_current_user
+from app.core.security import get_current_user, decode_token
 from app.services.websocket_manager import manager
+from app.services.message_search import message_search_service, InvalidSearchCursor
+from app.services.notification_service import notification_service
 from app.models.message import Message, Channel, ChannelMember, UserPresence
 from app.config.database import SessionLocal
 from sqlalchemy.future import select
-from sqlalchemy import and_, or_, desc
+from sqlalchemy import and_, or_, desc, delete
 from datetime import datetime
-import jwt
-from starlette.config import Config
+import base64
+import binascii
 
 router = APIRouter()
-config = Config(".env")
 
 class SendMessageRequest(BaseModel):
     content: str
@@ -23,23 +24,83 @@ class CreateChannelRequest(BaseModel):
     description: str = ""
     channel_type: str = "public"
 
+def _encode_cursor(direction: str, message_id: int) -> str:
+    """Opaque page cursor: base64 of '<direction>:<message id>'"""
+    return base64.urlsafe_b64encode(f"{direction}:{message_id}".encode()).decode().rstrip("=")
+
+def _decode_cursor(cursor: str) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        direction, message_id = base64.urlsafe_b64decode(padded).decode().split(":")
+        if direction not in ('before', 'after'):
+            raise ValueError(direction)
+        return direction, int(message_id)
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _resolve_page(before_id: int, after_id: int, cursor: str) -> tuple:
+    """Return (direction, anchor message id); the newest page when no anchor is given"""
+    if cursor:
+        return _decode_cursor(cursor)
+    if before_id is not None and after_id is not None:
+        raise HTTPException(status_code=400, detail="Use either before_id or after_id, not both")
+    if after_id is not None:
+        return 'after', after_id
+    return 'before', before_id
+
+def _keyset_page(query, direction: str, anchor_id: int, limit: int):
+    """Restrict a message query to one page along the message id"""
+    if direction == 'after':
+        if anchor_id is not None:
+            query = query.where(Message.id > anchor_id)
+        return query.order_by(Message.id).limit(limit)
+    if anchor_id is not None:
+        query = query.where(Message.id < anchor_id)
+    return query.order_by(desc(Message.id)).limit(limit)
+
+def _chronological(messages: list, direction: str) -> list:
+    return list(reversed(messages)) if direction == 'before' else list(messages)
+
+def _set_next_cursor(response: Response, messages: list, direction: str, limit: int):
+    """A full page may have more rows beyond it; hand out the cursor to continue"""
+    if len(messages) < limit:
+        return
+    edge = messages[0] if direction == 'before' else messages[-1]
+    response.headers["X-Next-Cursor"] = _encode_cursor(direction, edge.id)
+
 @router.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket, token: str = Query(...)):
-    """WebSocket endpoint for real-time chat"""
+async def websocket_endpoint(
+    websocket: WebSocket,
+    token: str = Query(...),
+    last_notification_id: int = Query(None)
+):
+    """
+    WebSocket endpoint for real-time chat and notifications.
+    On connect the client gets a notification_sync frame with the unread count and
+    any notifications newer than last_notification_id, then live notification frames.
+    """
+    user_id = None
     try:
         # Verify JWT token
-        payload = jwt.decode(token, config('JWT_SECRET_KEY'), algorithms=["HS256"])
+        payload = decode_token(token)
         user_id = payload['id']
         
-        await manager.connect(websocket, user_id)
+        # Hold live frames until the sync frame is queued so it is always the first one
+        await manager.connect(websocket, user_id, hold=True)
+        manager.start_sending(
+            websocket, await notification_service.resume_frame(user_id, last_notification_id)
+        )
         
         try:
             while True:
                 # Receive message from client
                 data = await websocket.receive_json()
+                manager.touch(websocket)
                 
                 # Handle different message types
-                if data['type'] == 'message':
+                if data['type'] == 'pong':
+                    continue  # Heartbeat reply; touch() already recorded it
+                elif data['type'] == 'message':
                     # Save message to database
                     async with SessionLocal() as session:
                         message = Message(
@@ -70,22 +131,18 @@ async def websocket_endpoint(websocket: WebSocket, token: str = Query(...)):
                             await manager.send_personal_message(message_data, user_id)
                 
                 elif data['type'] == 'typing':
-                    # Broadcast typing indicator
-                    typing_data = {
-                        'type': 'typing',
-                        'user_id': user_id,
-                        'channel_id': data.get('channel_id')
-                    }
+                    # Only start/stop transitions are broadcast to the channel
                     if data.get('channel_id'):
-                        await manager.broadcast_to_channel(typing_data, data['channel_id'], exclude_user=user_id)
+                        await manager.typing.update(user_id, data['channel_id'], data.get('is_typing', True))
         
         except WebSocketDisconnect:
+            # Presence goes offline once the user's last socket has been gone for the grace period
             manager.disconnect(websocket, user_id)
-            await manager.update_presence(user_id, 'offline')
-            await manager.broadcast_presence_update(user_id, 'offline')
     
     except Exception as e:
         print(f"WebSocket error: {e}")
+        if user_id is not None:
+            manager.disconnect(websocket, user_id)
         await websocket.close()
 
 @router.get("/channels")
@@ -139,6 +196,7 @@ async def join_channel(channel_id: int, current_user: dict = Depends(get_current
         existing = result.scalars().first()
         
         if existing:
+            await manager.channel_joined(current_user['id'], channel_id)
             return {"message": "Already a member"}
         
         # Add as member
@@ -149,8 +207,29 @@ async def join_channel(channel_id: int, current_user: dict = Depends(get_current
         )
         session.add(member)
         await session.commit()
-        
-        return {"message": "Joined channel successfully"}
+
+    # Start delivering the channel to the user's open sockets
+    await manager.channel_joined(current_user['id'], channel_id)
+    return {"message": "Joined channel successfully"}
+
+@router.post("/channels/{channel_id}/leave")
+async def leave_channel(channel_id: int, current_user: dict = Depends(get_current_user)):
+    """Leave a channel"""
+    async with SessionLocal() as session:
+        result = await session.execute(
+            delete(ChannelMember).where(
+                and_(
+                    ChannelMember.channel_id == channel_id,
+                    ChannelMember.user_id == current_user['id']
+                )
+            )
+        )
+        await session.commit()
+
+    await manager.channel_left(current_user['id'], channel_id)
+    if not result.rowcount:
+        raise HTTPException(status_code=404, detail="Not a member of this channel")
+    return {"message": "Left channel successfully"}
 
 @router.post("/channels")
 async def create_channel(
@@ -177,6 +256,8 @@ async def create_channel(
         session.add(member)
         await session.commit()
         await session.refresh(channel)
+
+        await manager.channel_joined(current_user['id'], channel.id)
         
         return {
             'id': channel.id,
@@ -188,11 +269,21 @@ async def create_channel(
 @router.get("/channels/{channel_id}/messages")
 async def get_channel_messages(
     channel_id: int,
+    response: Response,
     limit: int = Query(50, le=100),
     search: str = Query(None),
+    before_id: int = Query(None),
+    after_id: int = Query(None),
+    cursor: str = Query(None),
     current_user: dict = Depends(get_current_user)
 ):
-    """Get messages from a channel with optional search"""
+    """
+    Get messages from a channel with optional search.
+    Pages backwards with before_id (or forwards with after_id) along
+    (channel_id, id); the cursor for the next page is returned in X-Next-Cursor.
+    """
+    direction, anchor_id = _resolve_page(before_id, after_id, cursor)
+    
     async with SessionLocal() as session:
         query = select(Message).where(Message.channel_id == channel_id)
         
@@ -200,9 +291,10 @@ async def get_channel_messages(
         if search:
             query = query.where(Message.content.contains(search))
         
-        query = query.order_by(desc(Message.created_at)).limit(limit)
+        query = _keyset_page(query, direction, anchor_id, limit)
         result = await session.execute(query)
-        messages = result.scalars().all()
+        messages = _chronological(result.scalars().all(), direction)
+        _set_next_cursor(response, messages, direction, limit)
         
         return [
             {
@@ -212,102 +304,101 @@ async def get_channel_messages(
                 'created_at': msg.created_at.isoformat(),
                 'is_edited': msg.is_edited
             }
-            for msg in reversed(messages)
+            for msg in messages
         ]
 
 @router.get("/search")
 async def search_messages(
+    response: Response,
     query: str = Query(..., min_length=2),
     limit: int = Query(20, le=50),
+    cursor: str = Query(None),
     current_user: dict = Depends(get_current_user)
 ):
-    """Search messages across all channels and DMs"""
-    async with SessionLocal() as session:
-        # Search in channels user is member of
-        result = await session.execute(
-            select(Message).join(Channel).join(ChannelMember).where(
-                and_(
-                    ChannelMember.user_id == current_user['id'],
-                    Message.content.contains(query)
-                )
-            ).order_by(desc(Message.created_at)).limit(limit)
-        )
-        channel_messages = result.scalars().all()
-        
-        # Search in DMs
-        result = await session.execute(
-            select(Message).where(
-                and_(
-                    or_(
-                        Message.sender_id == current_user['id'],
-                        Message.recipient_id == current_user['id']
-                    ),
-                    Message.content.contains(query)
-                )
-            ).order_by(desc(Message.created_at)).limit(limit)
+    """Search messages across all channels and DMs, best match first"""
+    try:
+        messages, next_cursor = await message_search_service.search(
+            current_user['id'], query, limit=limit, cursor=cursor
         )
-        dm_messages = result.scalars().all()
-        
-        all_messages = list(channel_messages) + list(dm_messages)
-        all_messages.sort(key=lambda x: x.created_at, reverse=True)
-        
-        return [
-            {
-                'id': msg.id,
-                'sender_id': msg.sender_id,
-                'content': msg.content,
-                'channel_id': msg.channel_id,
-                'recipient_id': msg.recipient_id,
-                'created_at': msg.created_at.isoformat(),
-                'type': 'channel' if msg.channel_id else 'dm'
-            }
-            for msg in all_messages[:limit]
-        ]
+    except InvalidSearchCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
+    return [
+        {
+            'id': msg.id,
+            'sender_id': msg.sender_id,
+            'content': msg.content,
+            'channel_id': msg.channel_id,
+            'recipient_id': msg.recipient_id,
+            'created_at': msg.created_at.isoformat(),
+            'type': 'channel' if msg.channel_id else 'dm'
+        }
+        for msg in messages
+    ]
 
 @router.get("/online-users")
 async def get_online_users(current_user: dict = Depends(get_current_user)):
-    """Get list of currently online users"""
-    online_user_ids = manager.get_online_users()
-    
+    """Get list of currently online users in the current user's organizations, on any worker"""
     async with SessionLocal() as session:
         from app.models.user import User
+        from app.models.organization import OrganizationMember
+        user_orgs = select(OrganizationMember.organization_id).where(
+            OrganizationMember.user_id == current_user['id']
+        )
         result = await session.execute(
-            select(User).where(User.id.in_(online_user_ids))
+            select(User.id, User.username, User.avatar_url)
+            .join(OrganizationMember, OrganizationMember.user_id == User.id)
+            .where(OrganizationMember.organization_id.in_(user_orgs))
+            .distinct()
         )
-        users = result.scalars().all()
-        
-        return [
-            {
-                'id': user.id,
-                'username': user.username,
-                'avatar_url': user.avatar_url
-            }
-            for user in users
-        ]
+        members = result.all()
+
+    online_user_ids = set(await manager.online_users([member.id for member in members]))
+    return [
+        {
+            'id': member.id,
+            'username': member.username,
+            'avatar_url': member.avatar_url
+        }
+        for member in members if member.id in online_user_ids
+    ]
 
 @router.get("/direct-messages/{user_id}")
 async def get_direct_messages(
     user_id: int,
+    response: Response,
     limit: int = Query(50, le=100),
+    before_id: int = Query(None),
+    after_id: int = Query(None),
+    cursor: str = Query(None),
     current_user: dict = Depends(get_current_user)
 ):
-    """Get direct messages with a specific user"""
+    """
+    Get direct messages with a specific user.
+    Paged the same way as channel messages.
+    """
+    direction, anchor_id = _resolve_page(before_id, after_id, cursor)
+    
     async with SessionLocal() as session:
-        result = await session.execute(
-            select(Message).where(
-                or_(
-                    and_(
-                        Message.sender_id == current_user['id'],
-                        Message.recipient_id == user_id
-                    ),
-                    and_(
-                        Message.sender_id == user_id,
-                        Message.recipient_id == current_user['id']
-                    )
+        # One keyset range per direction of the conversation so each side is
+        # a bounded index range scan, then merge the two pages
+        messages = []
+        for sender_id, recipient_id in ((current_user['id'], user_id), (user_id, current_user['id'])):
+            query = select(Message).where(
+                and_(
+                    Message.sender_id == sender_id,
+                    Message.recipient_id == recipient_id
                 )
-            ).order_by(desc(Message.created_at)).limit(limit)
-        )
-        messages = result.scalars().all()
+            )
+            result = await session.execute(_keyset_page(query, direction, anchor_id, limit))
+            messages.extend(result.scalars().all())
+        
+        messages.sort(key=lambda msg: msg.id, reverse=(direction == 'before'))
+        messages = _chronological(messages[:limit], direction)
+        _set_next_cursor(response, messages, direction, limit)
         
         return [
             {
@@ -318,7 +409,7 @@ async def get_direct_messages(
                 'created_at': msg.created_at.isoformat(),
                 'is_edited': msg.is_edited
             }
-            for msg in reversed(messages)
+            for msg in messages
         ]
 
 @router.get("/conversations")
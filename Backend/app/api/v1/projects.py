@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from pydantic import BaseModel
 from app.core.security import get_current_user
 from app.services.task_service import task_service
@@ -20,6 +20,17 @@ class BulkTaskAssignRequest(BaseModel):
     task_ids: list[str]
     assigned_to: int
 
+class BulkTaskChangeGroup(BaseModel):
+    task_ids: list[str]
+    assigned_to: Optional[int] = None
+    status: Optional[str] = None
+    due_date: Optional[str] = None
+    estimate_hours: Optional[int] = None
+    progress_percentage: Optional[int] = None
+
+class BulkTaskUpdateRequest(BaseModel):
+    groups: list[BulkTaskChangeGroup]
+
 @router.get("")
 async def get_user_projects(current_user: dict = Depends(get_current_user)):
     """Get all projects for the current user"""
@@ -68,6 +79,20 @@ async def bulk_assign_tasks(
         "failed_tasks": results['failed_tasks']
     }
 
+@router.post("/tasks/bulk")
+async def bulk_update_tasks(
+    request: BulkTaskUpdateRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """Apply assignee, status, due date, estimate or progress changes to many tasks at once"""
+    results = await task_service.bulk_update_tasks([group.dict() for group in request.groups])
+    return {
+        "message": f"Successfully updated {results['success_count']} tasks",
+        "success_count": results['success_count'],
+        "failed_count": results['failed_count'],
+        "failed_tasks": results['failed_tasks']
+    }
+
 @router.post("/detect-delays")
 async def detect_delays(current_user: dict = Depends(get_current_user)):
     """Manually trigger delay detection (normally runs on schedule)"""
@@ -77,5 +102,5 @@ async def detect_delays(current_user: dict = Depends(get_current_user)):
 @router.get("/{project_id}/epics")
 async def get_project_epics(project_id: str, current_user: dict = Depends(get_current_user)):
     """Get all epics with stories and tasks for a project"""
-    epics = await project_service.get_project_epics(project_id)
-    return epics
+    payload = await project_service.get_project_epics_json(project_id)
+    return Response(content=payload, media_type="application/json")
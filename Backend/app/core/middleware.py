@@ -0,0 +1,15 @@
+from app.services.organization_service import membership_scope
+
+
+class MembershipScopeMiddleware:
+    """Give every HTTP request its own memo of organization lookups"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with membership_scope():
+            await self.app(scope, receive, send)
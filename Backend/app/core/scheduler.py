@@ -0,0 +1,186 @@
+"""
+In-process asyncio scheduler for periodic background jobs.
+
+Every worker process runs the same schedule; a per-job lock makes sure only
+one of them executes a given tick, and a tick is skipped when any worker
+completed the job less than one interval ago, so the job runs once per
+interval however many workers there are. On POSIX the lock is an flock()ed
+file in SCHEDULER_LOCK_DIR that also records the job's last completed run, so
+the next run picks up where the previous one stopped whichever worker ran it.
+Without fcntl the lock and the last run time are kept in-process.
+"""
+from starlette.config import Config
+from datetime import datetime
+import asyncio
+import logging
+import os
+import random
+import tempfile
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+config = Config(".env")
+SCHEDULER_ENABLED = config("SCHEDULER_ENABLED", cast=bool, default=True)
+SCHEDULER_LOCK_DIR = config("SCHEDULER_LOCK_DIR", default=tempfile.gettempdir())
+RISK_SCAN_INTERVAL_SECONDS = config("RISK_SCAN_INTERVAL_SECONDS", cast=float, default=900)
+RISK_SCAN_JITTER_SECONDS = config("RISK_SCAN_JITTER_SECONDS", cast=float, default=60)
+REFRESH_TOKEN_PURGE_INTERVAL_SECONDS = config("REFRESH_TOKEN_PURGE_INTERVAL_SECONDS", cast=float, default=6 * 3600)
+
+
+class FileJobLock:
+    """Non-blocking flock() on <lock_dir>/atlas-<job>.lock; the file holds the last run time"""
+
+    def __init__(self, name: str, lock_dir: str):
+        self.path = os.path.join(lock_dir, f"atlas-{name}.lock")
+        self._file = None
+
+    def acquire(self) -> bool:
+        lock_file = open(self.path, "a+")
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+        except OSError:
+            lock_file.close()
+            raise
+        self._file = lock_file
+        return True
+
+    def last_run(self) -> datetime:
+        self._file.seek(0)
+        content = self._file.read().strip()
+        return datetime.fromisoformat(content) if content else None
+
+    def record_run(self, when: datetime):
+        self._file.seek(0)
+        self._file.truncate()
+        self._file.write(when.isoformat())
+        self._file.flush()
+
+    def release(self):
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        self._file.close()
+        self._file = None
+
+
+class MemoryJobLock:
+    """Fallback lock for platforms without fcntl; only guards this process"""
+    _held = set()
+    _last_runs = {}
+
+    def __init__(self, name: str, lock_dir: str = None):
+        self.name = name
+
+    def acquire(self) -> bool:
+        if self.name in self._held:
+            return False
+        self._held.add(self.name)
+        return True
+
+    def last_run(self) -> datetime:
+        return self._last_runs.get(self.name)
+
+    def record_run(self, when: datetime):
+        self._last_runs[self.name] = when
+
+    def release(self):
+        self._held.discard(self.name)
+
+
+class ScheduledJob:
+    def __init__(self, name: str, func, interval: float, jitter: float = 0.0):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.runs = 0
+        self.skipped = 0
+        self.failures = 0
+
+
+class Scheduler:
+    def __init__(self, lock_dir: str = SCHEDULER_LOCK_DIR):
+        self.lock_dir = lock_dir
+        self.jobs = {}
+        self._tasks = []
+
+    def add_job(self, name: str, func, interval: float, jitter: float = 0.0) -> ScheduledJob:
+        """
+        Register `async func(last_run, now)` to run every `interval` seconds plus up
+        to `jitter` seconds. last_run is None until the job has completed once.
+        """
+        job = ScheduledJob(name, func, interval, jitter)
+        self.jobs[name] = job
+        return job
+
+    def _lock(self, name: str):
+        if fcntl is not None:
+            return FileJobLock(name, self.lock_dir)
+        return MemoryJobLock(name)
+
+    async def run_job(self, name: str) -> bool:
+        """
+        Run one tick of a job; returns False when it did not run: locked elsewhere,
+        already run by some worker within the interval, or the lock is unusable
+        """
+        job = self.jobs[name]
+        lock = self._lock(name)
+        try:
+            acquired = lock.acquire()
+        except OSError as e:
+            # e.g. an unwritable SCHEDULER_LOCK_DIR; keep the loop alive and retry next tick
+            job.failures += 1
+            logger.error(f"❌ Scheduled job {name} could not take its lock: {e}")
+            return False
+        if not acquired:
+            job.skipped += 1
+            logger.debug(f"Job {name} is running elsewhere, skipping tick")
+            return False
+
+        try:
+            now = datetime.utcnow()
+            last_run = lock.last_run()
+            if last_run is not None and (now - last_run).total_seconds() < job.interval:
+                # Another worker already ran this interval
+                job.skipped += 1
+                return False
+            await job.func(last_run, now)
+            # Only a completed run moves the window, so failures are retried next tick
+            lock.record_run(now)
+            job.runs += 1
+        except Exception as e:
+            job.failures += 1
+            logger.error(f"❌ Scheduled job {name} failed: {e}")
+        finally:
+            lock.release()
+        return True
+
+    async def _loop(self, job: ScheduledJob):
+        # Start after a random fraction of the jitter so workers don't all fire together
+        delay = random.uniform(0, job.jitter)
+        while True:
+            await asyncio.sleep(delay)
+            await self.run_job(job.name)
+            delay = job.interval + random.uniform(0, job.jitter)
+
+    def start(self):
+        if self._tasks:
+            return
+        for job in self.jobs.values():
+            self._tasks.append(asyncio.create_task(self._loop(job), name=f"scheduler:{job.name}"))
+        logger.info(f"✅ Scheduler started: {', '.join(self.jobs) or 'no jobs'}")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+scheduler = Scheduler()
@@ -1,5 +1,9 @@
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from collections import OrderedDict
+import hashlib
+import threading
+import time
 import jwt
 from starlette.config import Config
 
@@ -7,9 +11,68 @@ config = Config(".env")
 
 security = HTTPBearer()
 
+TOKEN_CACHE_SIZE = config("TOKEN_CACHE_SIZE", cast=int, default=1024)
+
+
+class TokenCache:
+    """
+    LRU of verified JWT claims keyed by the token's sha256 digest, so a token
+    polled with every few seconds is verified once. Entries stop being served
+    at the token's exp; tokens that fail verification are never cached.
+    """
+
+    def __init__(self, max_size: int = TOKEN_CACHE_SIZE):
+        self.max_size = max_size
+        # digest -> (claims, exp or None)
+        self._entries = OrderedDict()
+        # get_current_user runs in the threadpool
+        self._lock = threading.Lock()
+        self.metrics = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0}
+
+    def decode(self, token: str) -> dict:
+        """Return the token's claims; raises the same jwt errors as jwt.decode"""
+        digest = hashlib.sha256(token.encode()).digest()
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                claims, expires_at = entry
+                if expires_at is None or time.time() < expires_at:
+                    self._entries.move_to_end(digest)
+                    self.metrics['hits'] += 1
+                    return dict(claims)
+                del self._entries[digest]
+                self.metrics['expired'] += 1
+                raise jwt.ExpiredSignatureError("Signature has expired")
+            self.metrics['misses'] += 1
+
+        claims = jwt.decode(token, config('JWT_SECRET_KEY'), algorithms=["HS256"])
+        with self._lock:
+            self._entries[digest] = (claims, claims.get('exp'))
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.metrics['evictions'] += 1
+        return dict(claims)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {**self.metrics, 'size': len(self._entries), 'max_size': self.max_size}
+
+
+token_cache = TokenCache()
+
+
+def decode_token(token: str) -> dict:
+    """Verify a JWT through the shared cache (HTTP dependencies and websocket handshakes)"""
+    return token_cache.decode(token)
+
+
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     try:
-        payload = jwt.decode(credentials.credentials, config('JWT_SECRET_KEY'), algorithms=["HS256"])
+        payload = decode_token(credentials.credentials)
         return payload
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
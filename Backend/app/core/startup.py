@@ -4,6 +4,7 @@ Startup checks and database initialization
 from sqlalchemy import inspect, text
 from app.config.database import engine, SessionLocal
 from app.models.user import Base
+from app.services.message_search import create_search_index
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,6 +23,7 @@ async def check_database_schema():
             if not tables:
                 logger.info("No tables found. Creating database schema...")
                 await conn.run_sync(Base.metadata.create_all)
+                await conn.run_sync(create_search_index)
                 logger.info("✅ Database schema created successfully")
                 return True
             
@@ -89,6 +91,29 @@ async def check_database_schema():
                     await conn.commit()
                     logger.info("✅ Database schema migrated successfully")
             
+            # Create composite indexes added after the tables were created
+            def create_missing_indexes(connection):
+                inspector = inspect(connection)
+                existing_tables = set(inspector.get_table_names())
+                for table in Base.metadata.sorted_tables:
+                    if table.name not in existing_tables:
+                        continue
+                    existing_indexes = {ix['name'] for ix in inspector.get_indexes(table.name)}
+                    existing_columns = {col['name'] for col in inspector.get_columns(table.name)}
+                    for index in table.indexes:
+                        if index.name in existing_indexes:
+                            continue
+                        if not all(col.name in existing_columns for col in index.columns):
+                            logger.warning(f"⚠️  Skipping index {index.name}: table {table.name} is missing columns")
+                            continue
+                        logger.info(f"Creating index {index.name}...")
+                        index.create(connection)
+            
+            await conn.run_sync(create_missing_indexes)
+
+            if 'messages' in tables:
+                await conn.run_sync(create_search_index)
+            
             logger.info(f"✅ Database check passed. Tables: {', '.join(tables)}")
             return True
             
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Text, ForeignKey, TIMESTAMP, func, Integer
+from sqlalchemy import Column, String, Text, ForeignKey, TIMESTAMP, func, Integer, Index
 from sqlalchemy.orm import relationship
 from app.models.user import Base
 
@@ -8,6 +8,9 @@ def generate_uuid():
 
 class Epic(Base):
     __tablename__ = 'epics'
+    __table_args__ = (
+        Index('ix_epics_project_order', 'project_id', 'order'),
+    )
 
     id = Column(String(36), primary_key=True, default=generate_uuid)
     project_id = Column(String(36), ForeignKey('projects.id'), nullable=False)
@@ -1,8 +1,11 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, func, Index
 from app.config.database import Base
 
 class Issue(Base):
     __tablename__ = "issues"
+    __table_args__ = (
+        Index('ix_issues_project_status_created', 'project_id', 'status', 'created_at'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(String(36), ForeignKey('projects.id'), nullable=False, index=True)
@@ -1,9 +1,14 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean, Index
 from sqlalchemy.sql import func
 from app.config.database import Base
 
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        # Keyset paging of channel and direct message history along the id
+        Index('ix_messages_channel_id_id', 'channel_id', 'id'),
+        Index('ix_messages_dm_id', 'sender_id', 'recipient_id', 'id'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     sender_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
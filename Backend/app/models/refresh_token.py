@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
+from sqlalchemy.sql import func
+from app.config.database import Base
+
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        # Revoking a session revokes every token rotated from it
+        Index('ix_refresh_tokens_family_id', 'family_id'),
+        Index('ix_refresh_tokens_expires_at', 'expires_at'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # sha256 hex of the token; the token itself is only ever held by the client
+    token_hash = Column(String(64), nullable=False, unique=True)
+    # Shared by every token rotated from the same login
+    family_id = Column(String(36), nullable=False)
+    expires_at = Column(DateTime, nullable=False)  # UTC
+    revoked_at = Column(DateTime, nullable=True)  # UTC; set on rotation, logout or reuse
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
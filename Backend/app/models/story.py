@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Text, ForeignKey, TIMESTAMP, func, Integer
+from sqlalchemy import Column, String, Text, ForeignKey, TIMESTAMP, func, Integer, Index
 from sqlalchemy.orm import relationship
 from app.models.user import Base
 
@@ -8,6 +8,9 @@ def generate_uuid():
 
 class Story(Base):
     __tablename__ = 'stories'
+    __table_args__ = (
+        Index('ix_stories_epic_order', 'epic_id', 'order'),
+    )
 
     id = Column(String(36), primary_key=True, default=generate_uuid)
     epic_id = Column(String(36), ForeignKey('epics.id'), nullable=False)
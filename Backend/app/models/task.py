@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Text, ForeignKey, TIMESTAMP, func, Integer, VARCHAR
+from sqlalchemy import Column, String, Text, ForeignKey, TIMESTAMP, func, Integer, VARCHAR, Index
 from sqlalchemy.orm import relationship
 from app.models.user import Base
 
@@ -8,6 +8,14 @@ def generate_uuid():
 
 class Task(Base):
     __tablename__ = 'tasks'
+    __table_args__ = (
+        # Next unassigned task lookup in TaskService.complete_task
+        Index('ix_tasks_project_status_assignee_order', 'project_id', 'status', 'assignee_id', 'order'),
+        # Task listing per story in the project epic tree
+        Index('ix_tasks_story_order', 'story_id', 'order'),
+        # Due-date threshold windows scanned by the risk scheduler
+        Index('ix_tasks_due_date', 'due_date'),
+    )
 
     id = Column(String(36), primary_key=True, default=generate_uuid)
     project_id = Column(String(36), ForeignKey('projects.id'), nullable=False)
@@ -5,9 +5,33 @@ from openai import AsyncOpenAI
 
 from app.services.user_service import user_service
 from app.services.project_service import project_service
+from app.services.plan_cache import plan_cache
 
 load_dotenv()
 
+PLAN_MODEL = "gpt-4o-mini"
+# Part of every plan cache key; bump it whenever PLAN_SYSTEM_PROMPT changes
+PLAN_PROMPT_VERSION = "1"
+PLAN_SYSTEM_PROMPT = """You are a project planning assistant. Generate a detailed project plan in JSON format.
+The plan should include:
+- project_name: A concise name for the project
+- description: A brief description
+- epics: An array of 2-3 major epics, each with:
+  - name: Epic name
+  - description: Epic description
+  - stories: An array of 2-3 user stories, each with:
+    - name: Story name
+    - description: Story description
+    - tasks: An array of 3-5 specific tasks (strings)
+
+Return ONLY valid JSON, no markdown formatting."""
+
+QUESTION_KEYWORDS = ["what", "how", "why", "when", "where", "who", "can you", "tell me", "explain"]
+QUESTION_SYSTEM_PROMPT = """You are a helpful project management assistant.
+Answer the user's question concisely and friendly.
+Keep responses short (2-3 sentences max).
+Use emojis occasionally."""
+
 class AIService:
     def __init__(self):
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
@@ -30,17 +54,18 @@ class AIService:
         if user_id in self.user_conversations:
             del self.user_conversations[user_id]
 
-    async def _get_formatted_users(self, user_id: int):
-        """Get formatted list of users in the same organization"""
+    async def _get_formatted_users(self, user_id: int, members: list = None):
+        """Get formatted list of users in the same organization; pass members when already resolved"""
         from app.services.organization_service import organization_service
         
-        # Get user's organization
-        org = await organization_service.get_user_organization(user_id)
-        if not org:
-            return "No team members yet. Please add team members first."
-        
-        # Get organization members (pass UUID object directly)
-        members = await organization_service.get_organization_members(org.id)
+        if members is None:
+            # Get user's organization
+            org = await organization_service.get_user_organization(user_id)
+            if not org:
+                return "No team members yet. Please add team members first."
+            
+            # Get organization members (pass UUID object directly)
+            members = await organization_service.get_organization_members(org.id)
         
         if not members:
             return "No team members yet. Please add team members first."
@@ -50,50 +75,48 @@ class AIService:
             for member in members
         ])
 
-    async def _call_openai(self, messages: list) -> str:
-        """Call OpenAI API with conversation history"""
+    async def _stream_openai(self, messages: list):
+        """Stream an OpenAI chat completion, yielding text as it arrives"""
         if not self.client:
-            return "OpenAI API key not configured. Please set OPENAI_API_KEY in your .env file."
-        
+            yield "OpenAI API key not configured. Please set OPENAI_API_KEY in your .env file."
+            return
+
         try:
-            response = await self.client.chat.completions.create(
+            stream = await self.client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=messages,
                 temperature=0.7,
-                max_tokens=1000
+                max_tokens=1000,
+                stream=True
             )
-            return response.choices[0].message.content
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
         except Exception as e:
             print(f"OpenAI API error: {e}")
-            return f"I'm having trouble connecting to my AI brain right now. Error: {str(e)}"
+            yield f"I'm having trouble connecting to my AI brain right now. Error: {str(e)}"
 
     async def _generate_project_plan(self, project_description: str) -> dict:
-        """Use OpenAI to generate a structured project plan"""
+        """Use OpenAI to generate a structured project plan, reusing cached plans for the same description"""
         if not self.client:
             # Fallback to mock plan if no API key
             return self._get_mock_plan(project_description)
-        
-        system_prompt = """You are a project planning assistant. Generate a detailed project plan in JSON format.
-The plan should include:
-- project_name: A concise name for the project
-- description: A brief description
-- epics: An array of 2-3 major epics, each with:
-  - name: Epic name
-  - description: Epic description
-  - stories: An array of 2-3 user stories, each with:
-    - name: Story name
-    - description: Story description
-    - tasks: An array of 3-5 specific tasks (strings)
 
-Return ONLY valid JSON, no markdown formatting."""
+        return await plan_cache.get_or_create(
+            project_description,
+            f"{PLAN_PROMPT_VERSION}:{PLAN_MODEL}",
+            lambda: self._request_project_plan(project_description)
+        )
 
+    async def _request_project_plan(self, project_description: str) -> tuple:
+        """Call OpenAI for a plan; returns (plan, cacheable), where the mock fallback is not cacheable"""
         user_prompt = f"Create a project plan for: {project_description}"
 
         try:
             response = await self.client.chat.completions.create(
-                model="gpt-4o-mini",
+                model=PLAN_MODEL,
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": PLAN_SYSTEM_PROMPT},
                     {"role": "user", "content": user_prompt}
                 ],
                 temperature=0.7,
@@ -109,10 +132,10 @@ Return ONLY valid JSON, no markdown formatting."""
                 content = content.strip()
             
             plan = json.loads(content)
-            return plan
+            return plan, True
         except Exception as e:
             print(f"Error generating plan: {e}")
-            return self._get_mock_plan(project_description)
+            return self._get_mock_plan(project_description), False
 
     def _get_mock_plan(self, project_description: str) -> dict:
         """Fallback mock plan when OpenAI is not available"""
@@ -158,28 +181,39 @@ Return ONLY valid JSON, no markdown formatting."""
         """
         One-shot project creation - generates project immediately without follow-up questions.
         """
+        text = ""
+        async for event, data in self.stream_discover_response(user_message, current_user):
+            if event == "done":
+                text = data["text"]
+        return text
+
+    async def stream_discover_response(self, user_message: str, current_user: dict):
+        """
+        Same flow as get_discover_response, as (event, data) pairs for Server-Sent Events:
+        "token" chunks of a question's answer, "progress" stages of project creation,
+        and a final "done" carrying the complete reply text.
+        """
         user_id = current_user['id']
         
         # Check if user is asking a question or wants to chat (not create a project)
-        question_keywords = ["what", "how", "why", "when", "where", "who", "can you", "tell me", "explain"]
-        is_question = any(user_message.lower().strip().startswith(keyword) for keyword in question_keywords)
+        is_question = any(user_message.lower().strip().startswith(keyword) for keyword in QUESTION_KEYWORDS)
         
         if is_question:
             # Just answer the question, don't create a project
-            if self.client:
-                system_prompt = """You are a helpful project management assistant.
-Answer the user's question concisely and friendly.
-Keep responses short (2-3 sentences max).
-Use emojis occasionally."""
-                
-                messages = [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message}
-                ]
-                response = await self._call_openai(messages)
-                return response
-            else:
-                return "👋 I'm here to help you create projects! Just describe what you want to build, and I'll generate a complete project plan for you instantly."
+            if not self.client:
+                yield "done", {"text": "👋 I'm here to help you create projects! Just describe what you want to build, and I'll generate a complete project plan for you instantly."}
+                return
+
+            messages = [
+                {"role": "system", "content": QUESTION_SYSTEM_PROMPT},
+                {"role": "user", "content": user_message}
+            ]
+            answer = []
+            async for text in self._stream_openai(messages):
+                answer.append(text)
+                yield "token", {"text": text}
+            yield "done", {"text": "".join(answer)}
+            return
         
         # User wants to create a project - do it immediately!
         try:
@@ -188,27 +222,37 @@ Use emojis occasionally."""
             # Get user's organization
             org = await organization_service.get_user_organization(current_user['id'])
             if not org:
-                return "❌ Please create an organization and add team members before creating projects.\n\nGo to your dashboard to set up your team first!"
+                yield "done", {"text": "❌ Please create an organization and add team members before creating projects.\n\nGo to your dashboard to set up your team first!"}
+                return
             
             # Check if organization has members (besides owner)
             members = await organization_service.get_organization_members(org.id)
             if len(members) < 2:  # Only owner
-                return "❌ Please add at least one team member before creating projects.\n\nGo to 'Team Management' to add your team members first!"
+                yield "done", {"text": "❌ Please add at least one team member before creating projects.\n\nGo to 'Team Management' to add your team members first!"}
+                return
             
+            yield "progress", {"stage": "generating_plan"}
+
             # Generate project plan from user's description
             plan = await self._generate_project_plan(user_message)
             owner_id = current_user['id']
+            yield "progress", {
+                "stage": "plan_generated",
+                "project_name": plan['project_name'],
+                "epics": len(plan.get('epics', []))
+            }
             
             # Create the project (pass UUID object directly)
             await project_service.create_project_from_plan(plan, owner_id, org.id)
+            yield "progress", {"stage": "epics_persisted"}
             
             # Get team info
-            formatted_users = await self._get_formatted_users(current_user['id'])
+            formatted_users = await self._get_formatted_users(current_user['id'], members)
             
             # Reset state for next project
             self._reset_user_state(user_id)
             
-            return f"""✅ **Project Created: {plan['project_name']}**
+            yield "done", {"text": f"""✅ **Project Created: {plan['project_name']}**
 
 📋 {plan['description']}
 
@@ -217,10 +261,10 @@ Use emojis occasionally."""
 👥 **Suggested Team:**
 {formatted_users}
 
-🚀 Head over to the Task Board to see your complete project plan and start working!"""
+🚀 Head over to the Task Board to see your complete project plan and start working!"""}
             
         except Exception as e:
             print(f"Error creating project: {e}")
-            return f"😅 Oops! I hit a snag creating your project: {str(e)}\n\nTry describing your project again, and I'll create it for you!"
+            yield "done", {"text": f"😅 Oops! I hit a snag creating your project: {str(e)}\n\nTry describing your project again, and I'll create it for you!"}
 
 ai_service = AIService()
@@ -1,11 +1,57 @@
 from datetime import datetime, timedelta
 import jwt
 from starlette.config import Config
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import select, update, delete
+from app.config.database import SessionLocal
+from app.models.user import User
+from app.models.refresh_token import RefreshToken
+import asyncio
+import hashlib
+import logging
+import os
+import secrets
+import uuid
 import bcrypt
 
+logger = logging.getLogger(__name__)
+
 config = Config(".env")
+# bcrypt cost factor for new hashes; existing hashes keep the cost they were made with
+BCRYPT_ROUNDS = config("BCRYPT_ROUNDS", cast=int, default=12)
+# Threads available for hashing; bcrypt releases the GIL, so these run in parallel
+BCRYPT_MAX_WORKERS = config("BCRYPT_MAX_WORKERS", cast=int, default=min(4, os.cpu_count() or 1))
+ACCESS_TOKEN_EXPIRE_MINUTES = config("ACCESS_TOKEN_EXPIRE_MINUTES", cast=int, default=15)
+REFRESH_TOKEN_EXPIRE_DAYS = config("REFRESH_TOKEN_EXPIRE_DAYS", cast=int, default=30)
+# A just-rotated token presented again within this window is rejected without ending
+# the session (two tabs refreshing at once); later reuse revokes the whole family
+REFRESH_REUSE_GRACE_SECONDS = config("REFRESH_REUSE_GRACE_SECONDS", cast=float, default=10)
+
+
+class InvalidRefreshToken(ValueError):
+    pass
+
+
+def hash_refresh_token(token: str) -> str:
+    """Refresh tokens are 256 random bits, so a plain sha256 is enough to store them"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def user_claims(user) -> dict:
+    return {
+        "id": user.id,
+        "username": user.username,
+        "email": user.email,
+        "role": user.role,
+        "avatar_url": user.avatar_url
+    }
+
 
 class AuthService:
+    def __init__(self, rounds: int = BCRYPT_ROUNDS, max_workers: int = BCRYPT_MAX_WORKERS):
+        self.rounds = rounds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify a password against a hash"""
         try:
@@ -32,7 +78,7 @@ class AuthService:
                 password = password[:72]
             
             # Generate salt and hash
-            salt = bcrypt.gensalt()
+            salt = bcrypt.gensalt(rounds=self.rounds)
             hashed = bcrypt.hashpw(password, salt)
             
             # Return as string
@@ -41,16 +87,128 @@ class AuthService:
             print(f"Password hashing error: {e}")
             raise
 
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        """verify_password on the bcrypt thread pool, so the event loop keeps serving"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.verify_password, plain_password, hashed_password)
+
+    async def get_password_hash_async(self, password: str) -> str:
+        """get_password_hash on the bcrypt thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.get_password_hash, password)
+
     def create_access_token(self, data: dict, expires_delta: timedelta = None) -> str:
         """Create a JWT access token"""
         to_encode = data.copy()
         if expires_delta:
             expire = datetime.utcnow() + expires_delta
         else:
-            expire = datetime.utcnow() + timedelta(minutes=15)
+            expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         
         to_encode.update({"exp": expire})
         encoded_jwt = jwt.encode(to_encode, config('JWT_SECRET_KEY'), algorithm="HS256")
         return encoded_jwt
 
+    def create_refresh_token(self, session, user_id: int, family_id: str = None) -> str:
+        """Add a refresh token row to the caller's session; returns the token for the client"""
+        token = secrets.token_urlsafe(32)
+        session.add(RefreshToken(
+            user_id=user_id,
+            token_hash=hash_refresh_token(token),
+            family_id=family_id or str(uuid.uuid4()),
+            expires_at=datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+        ))
+        return token
+
+    def session_response(self, claims: dict, refresh_token: str) -> dict:
+        """Token response for login, register and refresh"""
+        return {
+            "access_token": self.create_access_token(
+                data=claims, expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+            ),
+            "refresh_token": refresh_token,
+            "token_type": "bearer",
+            "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            "user": {key: claims[key] for key in ("id", "username", "email", "avatar_url", "role")}
+        }
+
+    async def issue_session(self, user) -> dict:
+        """Start a new refresh-token family for a user who just authenticated"""
+        async with SessionLocal() as session:
+            refresh_token = self.create_refresh_token(session, user.id)
+            await session.commit()
+        return self.session_response(user_claims(user), refresh_token)
+
+    async def rotate_refresh_token(self, token: str) -> tuple:
+        """
+        Exchange a refresh token for (user claims, new refresh token); no password hashing.
+        The presented token is revoked. Raises InvalidRefreshToken.
+        """
+        now = datetime.utcnow()
+        async with SessionLocal() as session:
+            result = await session.execute(
+                select(RefreshToken).where(RefreshToken.token_hash == hash_refresh_token(token))
+            )
+            row = result.scalars().first()
+            if row is None or row.expires_at <= now:
+                raise InvalidRefreshToken("unknown or expired")
+
+            if row.revoked_at is not None:
+                if (now - row.revoked_at).total_seconds() > REFRESH_REUSE_GRACE_SECONDS:
+                    # A rotated token came back: someone else has a copy, so end the session
+                    await session.execute(
+                        update(RefreshToken)
+                        .where(RefreshToken.family_id == row.family_id, RefreshToken.revoked_at.is_(None))
+                        .values(revoked_at=now)
+                    )
+                    user_id = row.user_id
+                    await session.commit()
+                    logger.warning(f"⚠️  Refresh token reuse for user {user_id}; session revoked")
+                raise InvalidRefreshToken("revoked")
+
+            # Claim the token atomically so two concurrent refreshes can't both rotate it
+            claimed = await session.execute(
+                update(RefreshToken)
+                .where(RefreshToken.id == row.id, RefreshToken.revoked_at.is_(None))
+                .values(revoked_at=now)
+            )
+            if claimed.rowcount != 1:
+                raise InvalidRefreshToken("revoked")
+
+            user = await session.get(User, row.user_id)
+            if user is None or not user.is_active:
+                await session.commit()
+                raise InvalidRefreshToken("inactive user")
+
+            claims = user_claims(user)
+            new_token = self.create_refresh_token(session, user.id, row.family_id)
+            await session.commit()
+        return claims, new_token
+
+    async def revoke_refresh_token(self, token: str) -> bool:
+        """Log out: revoke the token and every token rotated from the same login"""
+        async with SessionLocal() as session:
+            family = select(RefreshToken.family_id).where(
+                RefreshToken.token_hash == hash_refresh_token(token)
+            ).scalar_subquery()
+            result = await session.execute(
+                update(RefreshToken)
+                .where(RefreshToken.family_id == family, RefreshToken.revoked_at.is_(None))
+                .values(revoked_at=datetime.utcnow())
+            )
+            await session.commit()
+        return result.rowcount > 0
+
+    async def purge_expired_refresh_tokens(self, last_run: datetime = None, now: datetime = None) -> int:
+        """Scheduled job: delete refresh tokens past their expiry"""
+        now = now or datetime.utcnow()
+        async with SessionLocal() as session:
+            result = await session.execute(
+                delete(RefreshToken).where(RefreshToken.expires_at < now)
+            )
+            await session.commit()
+        if result.rowcount:
+            logger.info(f"Purged {result.rowcount} expired refresh tokens")
+        return result.rowcount
+
 auth_service = AuthService()
@@ -0,0 +1,128 @@
+"""
+Pub/sub backplane for WebSocket fan-out across workers.
+
+ConnectionManager publishes routing events (deliver a frame to a user, a
+channel or everyone; a membership change) and every worker applies them to
+the sockets it holds. The in-process backplane applies events directly; the
+Redis backplane also publishes them on WS_BACKPLANE_CHANNEL so the other
+workers apply them too. WS_BACKPLANE_URL (or REDIS_URL) selects Redis, and
+accepts redis://, rediss:// and unix:// URLs.
+"""
+from starlette.config import Config
+import asyncio
+import json
+import logging
+import uuid
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+config = Config(".env")
+WS_BACKPLANE_URL = config("WS_BACKPLANE_URL", default=config("REDIS_URL", default=""))
+WS_BACKPLANE_CHANNEL = config("WS_BACKPLANE_CHANNEL", default="atlas:ws")
+RECONNECT_DELAY_SECONDS = 1.0
+SUBSCRIBE_TIMEOUT_SECONDS = 5.0
+
+
+class InProcessBackplane:
+    """Single-worker backplane: events are applied locally as they are published"""
+    distributed = False
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.metrics = {'published': 0}
+
+    async def start(self):
+        pass
+
+    async def publish(self, event: dict):
+        self.metrics['published'] += 1
+        self.handler(event)
+
+    async def stop(self):
+        pass
+
+    def stats(self) -> dict:
+        return {'backend': 'in-process', **self.metrics}
+
+
+class RedisBackplane:
+    """Redis pub/sub backplane; each worker applies its own events locally and skips their echo"""
+    distributed = True
+
+    def __init__(self, handler, url: str = None, client=None, channel: str = WS_BACKPLANE_CHANNEL):
+        self.handler = handler
+        self.client = client if client is not None else aioredis.from_url(url)
+        self.channel = channel
+        self.worker_id = uuid.uuid4().hex
+        self._task = None
+        self._subscribed = asyncio.Event()
+        self.metrics = {'published': 0, 'received': 0, 'publish_errors': 0, 'reconnects': 0}
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen(), name="ws-backplane")
+            try:
+                await asyncio.wait_for(self._subscribed.wait(), SUBSCRIBE_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                # Keep serving local sockets; the listener retries in the background
+                logger.warning("⚠️  Backplane not subscribed yet; cross-worker delivery is delayed")
+
+    async def _listen(self):
+        while True:
+            pubsub = self.client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                self._subscribed.set()
+                async for message in pubsub.listen():
+                    if message['type'] != 'message':
+                        continue
+                    event = json.loads(message['data'])
+                    if event.pop('origin', None) == self.worker_id:
+                        continue
+                    self.metrics['received'] += 1
+                    try:
+                        self.handler(event)
+                    except Exception as e:
+                        logger.error(f"❌ Failed to apply backplane event: {e}")
+            except asyncio.CancelledError:
+                await pubsub.aclose()
+                raise
+            except Exception as e:
+                self.metrics['reconnects'] += 1
+                logger.warning(f"⚠️  Backplane subscription lost ({e}); reconnecting")
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+    async def publish(self, event: dict):
+        self.metrics['published'] += 1
+        self.handler(event)
+        try:
+            await self.client.publish(self.channel, json.dumps({**event, 'origin': self.worker_id}))
+        except Exception as e:
+            # Local recipients already have the frame; remote ones miss this event
+            self.metrics['publish_errors'] += 1
+            logger.error(f"❌ Failed to publish backplane event: {e}")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.client.aclose()
+
+    def stats(self) -> dict:
+        return {'backend': 'redis', 'worker_id': self.worker_id, **self.metrics}
+
+
+def create_backplane(handler, url: str = WS_BACKPLANE_URL):
+    """Redis backplane when a URL is configured and redis is installed, in-process otherwise"""
+    if not url:
+        return InProcessBackplane(handler)
+    if aioredis is None:
+        logger.warning("⚠️  WS_BACKPLANE_URL is set but the redis package is not installed; using in-process backplane")
+        return InProcessBackplane(handler)
+    return RedisBackplane(handler, url=url)
@@ -58,7 +58,7 @@ class IssueService:
             project = result.scalars().first()
             
             if project and project.owner_id != reporter_id:
-                await notification_service.create_notification(
+                await notification_service.queue_notification(
                     user_id=project.owner_id,
                     notification_type='new_issue',
                     title=f'🚨 New {issue_type.title()}: {title}',
@@ -130,7 +130,7 @@ class IssueService:
             await session.refresh(issue)
             
             # Notify assignee
-            await notification_service.create_notification(
+            await notification_service.queue_notification(
                 user_id=assignee_id,
                 notification_type='issue_assigned',
                 title=f'📌 Issue Assigned: {issue.title}',
@@ -164,7 +164,7 @@ class IssueService:
             
             # Notify reporter
             if issue.reporter_id != resolver_id:
-                await notification_service.create_notification(
+                await notification_service.queue_notification(
                     user_id=issue.reporter_id,
                     notification_type='issue_resolved',
                     title=f'✅ Issue Resolved: {issue.title}',
@@ -0,0 +1,171 @@
+"""
+Full-text search over chat messages.
+
+SQLite keeps an FTS5 external-content table (messages_fts) in step with
+messages through triggers; Postgres uses a GIN index over
+to_tsvector(content). Other backends fall back to a LIKE scan.
+"""
+from sqlalchemy import text, select, or_, and_, func, literal, literal_column, table, column
+from app.models.message import Message, ChannelMember
+from app.config.database import SessionLocal
+import base64
+import binascii
+import json
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+TS_CONFIG = 'english'
+
+SQLITE_FTS_TABLE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    content, content='messages', content_rowid='id', tokenize='unicode61'
+)
+"""
+
+SQLITE_FTS_TRIGGERS = {
+    'messages_fts_ai': """
+        CREATE TRIGGER messages_fts_ai AFTER INSERT ON messages BEGIN
+            INSERT INTO messages_fts(rowid, content) VALUES (new.id, new.content);
+        END
+    """,
+    'messages_fts_ad': """
+        CREATE TRIGGER messages_fts_ad AFTER DELETE ON messages BEGIN
+            INSERT INTO messages_fts(messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+        END
+    """,
+    'messages_fts_au': """
+        CREATE TRIGGER messages_fts_au AFTER UPDATE OF content ON messages BEGIN
+            INSERT INTO messages_fts(messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+            INSERT INTO messages_fts(rowid, content) VALUES (new.id, new.content);
+        END
+    """,
+}
+
+POSTGRES_GIN_INDEX = f"""
+CREATE INDEX IF NOT EXISTS ix_messages_content_tsv
+ON messages USING GIN (to_tsvector('{TS_CONFIG}', content))
+"""
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+messages_fts = table('messages_fts', column('rowid'))
+
+
+class InvalidSearchCursor(ValueError):
+    pass
+
+
+def create_search_index(connection):
+    """Create the full-text index for the connection's dialect (sync, for run_sync)"""
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        existing = {
+            row[0] for row in connection.execute(text(
+                "SELECT name FROM sqlite_master WHERE name = 'messages_fts' OR tbl_name = 'messages'"
+            ))
+        }
+        connection.execute(text(SQLITE_FTS_TABLE))
+        missing = [name for name in SQLITE_FTS_TRIGGERS if name not in existing]
+        for name in missing:
+            connection.execute(text(SQLITE_FTS_TRIGGERS[name]))
+        if 'messages_fts' not in existing or missing:
+            # Writes made without the triggers never reached the index
+            logger.info("Rebuilding messages_fts full-text index...")
+            connection.execute(text("INSERT INTO messages_fts(messages_fts) VALUES ('rebuild')"))
+    elif dialect == 'postgresql':
+        connection.execute(text(POSTGRES_GIN_INDEX))
+    else:
+        logger.warning(f"⚠️  No full-text index for dialect {dialect}; message search will scan")
+
+
+def search_terms(query: str) -> list:
+    """Split a user query into plain word terms; punctuation never reaches the match syntax"""
+    return _TERM.findall(query.lower())
+
+
+def encode_search_cursor(score: float, message_id: int) -> str:
+    payload = json.dumps([score, message_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, message_id = json.loads(base64.urlsafe_b64decode(padded))
+        return float(score), int(message_id)
+    except (ValueError, TypeError, UnicodeDecodeError, binascii.Error):
+        raise InvalidSearchCursor(cursor)
+
+
+class MessageSearchService:
+    def _visible_to(self, user_id: int):
+        """Messages in the user's channels plus their own DMs"""
+        member_channels = select(ChannelMember.channel_id).where(ChannelMember.user_id == user_id)
+        return or_(
+            Message.channel_id.in_(member_channels),
+            Message.sender_id == user_id,
+            Message.recipient_id == user_id
+        )
+
+    def _ranked_query(self, dialect: str, terms: list):
+        """Return (select of Message and score, score expression); higher score ranks first"""
+        if dialect == 'sqlite':
+            match = " ".join(f'"{term}"*' for term in terms)
+            score = -func.bm25(literal_column('messages_fts'))
+            query = (
+                select(Message, score.label('score'))
+                .join(messages_fts, messages_fts.c.rowid == Message.id)
+                .where(literal_column('messages_fts').op('MATCH')(match))
+            )
+            return query, score
+
+        if dialect == 'postgresql':
+            # Inline the config so the expression matches ix_messages_content_tsv
+            ts_config = literal_column(f"'{TS_CONFIG}'::regconfig")
+            vector = func.to_tsvector(ts_config, Message.content)
+            ts_query = func.to_tsquery(ts_config, " & ".join(f"{term}:*" for term in terms))
+            score = func.ts_rank(vector, ts_query)
+            query = select(Message, score.label('score')).where(vector.op('@@')(ts_query))
+            return query, score
+
+        # No index: every term must appear, newest first
+        score = literal(0.0)
+        query = select(Message, score.label('score')).where(
+            and_(*[Message.content.contains(term) for term in terms])
+        )
+        return query, score
+
+    async def search(self, user_id: int, query: str, limit: int = 20, cursor: str = None) -> tuple:
+        """
+        Rank the user's visible messages against the query.
+
+        Returns (messages, next cursor); the cursor is None on the last page.
+        """
+        terms = search_terms(query)
+        if not terms:
+            return [], None
+
+        async with SessionLocal() as session:
+            dialect = session.bind.dialect.name
+            statement, score = self._ranked_query(dialect, terms)
+            statement = statement.where(self._visible_to(user_id))
+
+            if cursor:
+                after_score, after_id = decode_search_cursor(cursor)
+                statement = statement.where(
+                    or_(score < after_score, and_(score == after_score, Message.id < after_id))
+                )
+
+            statement = statement.order_by(score.desc(), Message.id.desc()).limit(limit)
+            rows = (await session.execute(statement)).all()
+
+        next_cursor = None
+        if len(rows) == limit:
+            last_message, last_score = rows[-1]
+            next_cursor = encode_search_cursor(last_score, last_message.id)
+        return [message for message, _ in rows], next_cursor
+
+
+message_search_service = MessageSearchService()
@@ -1,11 +1,36 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import and_, desc
+from sqlalchemy import and_, desc, update, delete, func, insert
 from app.models.notification import Notification
 from app.config.database import SessionLocal
+from app.services.notification_writer import NotificationWriter
+from app.services.websocket_manager import manager
 from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+# How many missed notifications a reconnecting client is sent
+RESUME_LIMIT = 100
+
+
+def serialize_notification(notif) -> dict:
+    """Wire format shared by the REST list and WebSocket frames"""
+    return {
+        "id": notif.id,
+        "type": notif.type,
+        "title": notif.title,
+        "message": notif.message,
+        "link": notif.link,
+        "read": notif.read,
+        "created_at": notif.created_at.isoformat() if notif.created_at else None,
+        "read_at": notif.read_at.isoformat() if notif.read_at else None,
+    }
 
 class NotificationService:
+    def __init__(self):
+        self.writer = NotificationWriter(self.create_notifications, on_written=self.push_notifications)
+
     async def create_notification(
         self,
         user_id: int,
@@ -14,7 +39,7 @@ class NotificationService:
         message: str,
         link: str = None
     ) -> Notification:
-        """Create a new notification for a user"""
+        """Create a new notification for a user and return the row (use queue_notification when the id isn't needed)"""
         async with SessionLocal() as session:
             notification = Notification(
                 user_id=user_id,
@@ -26,7 +51,98 @@ class NotificationService:
             session.add(notification)
             await session.commit()
             await session.refresh(notification)
-            return notification
+        await self.push_notifications([notification])
+        return notification
+
+    async def queue_notification(
+        self,
+        user_id: int,
+        notification_type: str,
+        title: str,
+        message: str,
+        link: str = None
+    ) -> bool:
+        """Hand a notification to the batched writer; False if it was coalesced into a recent duplicate"""
+        return await self.writer.enqueue(user_id, notification_type, title, message, link)
+
+    async def create_notifications(self, session: AsyncSession, notifications: list) -> list:
+        """
+        Insert many notifications with one executemany inside the caller's transaction.
+        Each item is a dict with user_id, type, title, message and optional link.
+        Returns the inserted rows; pass them to push_notifications once committed.
+        """
+        if not notifications:
+            return []
+        result = await session.execute(
+            insert(Notification.__table__).returning(*Notification.__table__.c),
+            [
+                {
+                    "user_id": item["user_id"],
+                    "type": item["type"],
+                    "title": item["title"],
+                    "message": item["message"],
+                    "link": item.get("link"),
+                }
+                for item in notifications
+            ]
+        )
+        return result.all()
+
+    async def push_notifications(self, notifications: list):
+        """Send committed notifications, with a fresh unread count, to recipients that are connected"""
+        online = {n.user_id for n in notifications if manager.is_connected(n.user_id)}
+        if not online:
+            return
+        try:
+            unread = await self.get_unread_counts(online)
+            for notif in notifications:
+                if notif.user_id in online:
+                    await manager.send_personal_message({
+                        "type": "notification",
+                        "notification": serialize_notification(notif),
+                        "unread_count": unread.get(notif.user_id, 0),
+                    }, notif.user_id)
+        except Exception as e:
+            # Delivery is best effort; the rows are already committed
+            logger.error(f"❌ Failed to push notifications: {e}")
+
+    async def push_unread_count(self, user_id: int):
+        """Send the current unread count to every open tab of a connected user"""
+        if not manager.is_connected(user_id):
+            return
+        try:
+            await manager.send_personal_message({
+                "type": "unread_count",
+                "unread_count": await self.get_unread_count(user_id),
+            }, user_id)
+        except Exception as e:
+            logger.error(f"❌ Failed to push unread count: {e}")
+
+    async def resume_frame(self, user_id: int, last_notification_id: int = None) -> dict:
+        """
+        Catch-up frame for a (re)connecting client: notifications newer than the
+        last one it saw (none when it hasn't seen any) and the unread count.
+        """
+        missed = []
+        if last_notification_id is not None:
+            async with SessionLocal() as session:
+                result = await session.execute(
+                    select(Notification)
+                    .where(
+                        and_(
+                            Notification.user_id == user_id,
+                            Notification.id > last_notification_id
+                        )
+                    )
+                    .order_by(Notification.id)
+                    .limit(RESUME_LIMIT)
+                )
+                missed = [serialize_notification(n) for n in result.scalars()]
+        return {
+            "type": "notification_sync",
+            "notifications": missed,
+            "unread_count": await self.get_unread_count(user_id),
+        }
 
     async def get_user_notifications(
         self,
@@ -46,93 +162,93 @@ class NotificationService:
             result = await session.execute(query)
             notifications = result.scalars().all()
             
-            return [
-                {
-                    "id": notif.id,
-                    "type": notif.type,
-                    "title": notif.title,
-                    "message": notif.message,
-                    "link": notif.link,
-                    "read": notif.read,
-                    "created_at": notif.created_at.isoformat() if notif.created_at else None,
-                    "read_at": notif.read_at.isoformat() if notif.read_at else None,
-                }
-                for notif in notifications
-            ]
+            return [serialize_notification(notif) for notif in notifications]
 
     async def mark_as_read(self, notification_id: int, user_id: int) -> bool:
         """Mark a notification as read"""
         async with SessionLocal() as session:
             result = await session.execute(
-                select(Notification).where(
+                update(Notification)
+                .where(
                     and_(
                         Notification.id == notification_id,
                         Notification.user_id == user_id
                     )
                 )
+                .values(read=True, read_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
             )
-            notification = result.scalars().first()
-            
-            if notification:
-                notification.read = True
-                notification.read_at = datetime.utcnow()
-                await session.commit()
-                return True
-            return False
+            await session.commit()
+        if result.rowcount > 0:
+            await self.push_unread_count(user_id)
+            return True
+        return False
 
     async def mark_all_as_read(self, user_id: int) -> int:
         """Mark all notifications as read for a user"""
         async with SessionLocal() as session:
             result = await session.execute(
-                select(Notification).where(
+                update(Notification)
+                .where(
                     and_(
                         Notification.user_id == user_id,
                         Notification.read == False
                     )
                 )
+                .values(read=True, read_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
             )
-            notifications = result.scalars().all()
-            
-            count = 0
-            for notification in notifications:
-                notification.read = True
-                notification.read_at = datetime.utcnow()
-                count += 1
-            
             await session.commit()
-            return count
+        if result.rowcount:
+            await self.push_unread_count(user_id)
+        return result.rowcount
 
     async def get_unread_count(self, user_id: int) -> int:
         """Get count of unread notifications"""
         async with SessionLocal() as session:
+            # Answered from ix_notifications_user_read_created without touching rows
             result = await session.execute(
-                select(Notification).where(
+                select(func.count())
+                .select_from(Notification)
+                .where(
                     and_(
                         Notification.user_id == user_id,
                         Notification.read == False
                     )
                 )
             )
-            notifications = result.scalars().all()
-            return len(notifications)
+            return result.scalar_one()
+
+    async def get_unread_counts(self, user_ids) -> dict:
+        """Unread counts for several users in one grouped query"""
+        async with SessionLocal() as session:
+            result = await session.execute(
+                select(Notification.user_id, func.count())
+                .where(
+                    and_(
+                        Notification.user_id.in_(list(user_ids)),
+                        Notification.read == False
+                    )
+                )
+                .group_by(Notification.user_id)
+            )
+            return dict(result.all())
 
     async def delete_notification(self, notification_id: int, user_id: int) -> bool:
         """Delete a notification"""
         async with SessionLocal() as session:
             result = await session.execute(
-                select(Notification).where(
+                delete(Notification).where(
                     and_(
                         Notification.id == notification_id,
                         Notification.user_id == user_id
                     )
-                )
+                ).execution_options(synchronize_session=False)
             )
-            notification = result.scalars().first()
-            
-            if notification:
-                await session.delete(notification)
-                await session.commit()
-                return True
-            return False
+            await session.commit()
+        if result.rowcount > 0:
+            await self.push_unread_count(user_id)
+            return True
+        return False
 
 notification_service = NotificationService()
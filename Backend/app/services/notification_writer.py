@@ -0,0 +1,170 @@
+"""
+Batched, coalescing writer for notifications.
+
+Callers enqueue notification rows; a background task drains the queue and
+writes them with one multi-row insert every NOTIFICATION_FLUSH_MS or every
+NOTIFICATION_BATCH_SIZE rows, whichever comes first. Identical
+(user, type, link) notifications within NOTIFICATION_DEDUPE_SECONDS are
+dropped, so the link must identify what the notification is about. When
+the queue is full, enqueue waits (backpressure).
+"""
+from starlette.config import Config
+from app.config.database import SessionLocal
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+config = Config(".env")
+NOTIFICATION_FLUSH_MS = config("NOTIFICATION_FLUSH_MS", cast=float, default=50)
+NOTIFICATION_BATCH_SIZE = config("NOTIFICATION_BATCH_SIZE", cast=int, default=200)
+NOTIFICATION_QUEUE_SIZE = config("NOTIFICATION_QUEUE_SIZE", cast=int, default=10000)
+NOTIFICATION_DEDUPE_SECONDS = config("NOTIFICATION_DEDUPE_SECONDS", cast=float, default=5)
+
+
+class NotificationWriter:
+    def __init__(
+        self,
+        insert_batch,
+        on_written=None,
+        batch_size: int = NOTIFICATION_BATCH_SIZE,
+        flush_ms: float = NOTIFICATION_FLUSH_MS,
+        queue_size: int = NOTIFICATION_QUEUE_SIZE,
+        dedupe_seconds: float = NOTIFICATION_DEDUPE_SECONDS
+    ):
+        """
+        insert_batch(session, rows) writes a list of notification dicts in the caller's
+        transaction and returns the inserted rows; on_written(inserted) runs after commit.
+        """
+        self.insert_batch = insert_batch
+        self.on_written = on_written
+        self.batch_size = batch_size
+        self.flush_interval = flush_ms / 1000
+        self.queue_size = queue_size
+        self.dedupe_seconds = dedupe_seconds
+        self._queue = None
+        self._task = None
+        self._recent = {}
+        self._last_prune = time.monotonic()
+        self.metrics = {
+            'enqueued': 0,
+            'deduplicated': 0,
+            'written': 0,
+            'flushes': 0,
+            'failed': 0,
+            'backpressure_waits': 0,
+            'largest_batch': 0,
+            'last_flush_ms': 0.0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def _is_duplicate(self, row: dict) -> bool:
+        key = (row['user_id'], row['type'], row.get('link'))
+        now = time.monotonic()
+        last_seen = self._recent.get(key)
+        if last_seen is not None and now - last_seen < self.dedupe_seconds:
+            return True
+        self._recent[key] = now
+        return False
+
+    def _prune_recent(self):
+        """Forget expired dedupe keys; at most once per dedupe window"""
+        now = time.monotonic()
+        if now - self._last_prune < self.dedupe_seconds:
+            return
+        self._last_prune = now
+        cutoff = now - self.dedupe_seconds
+        self._recent = {key: seen for key, seen in self._recent.items() if seen >= cutoff}
+
+    async def enqueue(self, user_id: int, notification_type: str, title: str, message: str, link: str = None) -> bool:
+        """Queue a notification; returns False when it was coalesced into a recent identical one"""
+        row = {
+            'user_id': user_id,
+            'type': notification_type,
+            'title': title,
+            'message': message,
+            'link': link,
+        }
+        # Also pruned here: in write-through mode _run never prunes
+        self._prune_recent()
+        if self._is_duplicate(row):
+            self.metrics['deduplicated'] += 1
+            return False
+
+        self.metrics['enqueued'] += 1
+        if not self.running:
+            # No background writer (scripts, tests): write through
+            await self._write([row])
+            return True
+
+        if self._queue.full():
+            self.metrics['backpressure_waits'] += 1
+        await self._queue.put(row)
+        return True
+
+    async def _write(self, rows: list):
+        started = time.perf_counter()
+        try:
+            async with SessionLocal() as session:
+                inserted = await self.insert_batch(session, rows)
+                await session.commit()
+        except Exception as e:
+            self.metrics['failed'] += len(rows)
+            logger.error(f"❌ Failed to write {len(rows)} notifications: {e}")
+            return
+        self.metrics['written'] += len(rows)
+        self.metrics['flushes'] += 1
+        self.metrics['largest_batch'] = max(self.metrics['largest_batch'], len(rows))
+        self.metrics['last_flush_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        if self.on_written:
+            await self.on_written(inserted)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._write(batch)
+            for _ in batch:
+                self._queue.task_done()
+            self._prune_recent()
+
+    def start(self):
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._task = asyncio.create_task(self._run(), name="notification-writer")
+
+    async def flush(self):
+        """Wait until everything queued so far has been written"""
+        if self.running:
+            await self._queue.join()
+
+    async def stop(self):
+        """Flush pending notifications and stop the background task"""
+        if not self.running:
+            return
+        await self.flush()
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def stats(self) -> dict:
+        return {
+            **self.metrics,
+            'queue_depth': self._queue.qsize() if self.running else 0,
+            'running': self.running,
+        }
@@ -4,6 +4,103 @@ from app.models.organization import Organization, OrganizationMember
 from app.models.user import User
 from app.config.database import SessionLocal
 from app.services.auth_service import auth_service
+from starlette.config import Config
+from contextlib import contextmanager
+from contextvars import ContextVar
+import time
+
+config = Config(".env")
+MEMBERSHIP_CACHE_TTL_SECONDS = config("MEMBERSHIP_CACHE_TTL_SECONDS", cast=float, default=30)
+MEMBERSHIP_CACHE_SIZE = config("MEMBERSHIP_CACHE_SIZE", cast=int, default=10000)
+
+_MISSING = object()
+
+# Lookups already made by the current request: (kind, key) -> value
+_request_memo: ContextVar = ContextVar("organization_request_memo", default=None)
+
+
+@contextmanager
+def membership_scope():
+    """Memoize organization lookups for the duration of one request"""
+    token = _request_memo.set({})
+    try:
+        yield
+    finally:
+        _request_memo.reset(token)
+
+
+class MembershipCache:
+    """
+    TTL cache of user -> organization and organization -> members. Entries are
+    dropped by the service methods that change membership; writes made by
+    another worker show up once the TTL runs out.
+    """
+
+    def __init__(self, ttl: float = MEMBERSHIP_CACHE_TTL_SECONDS, max_size: int = MEMBERSHIP_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        # (kind, key) -> (expires_at, value)
+        self._entries = {}
+        self.metrics = {'hits': 0, 'misses': 0, 'memo_hits': 0, 'invalidations': 0}
+
+    async def resolve(self, kind: str, key, loader):
+        """Return the cached value for (kind, key), calling `await loader()` on a miss"""
+        cache_key = (kind, key)
+        memo = _request_memo.get()
+        if memo is not None and cache_key in memo:
+            self.metrics['memo_hits'] += 1
+            return memo[cache_key]
+
+        entry = self._entries.get(cache_key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.metrics['hits'] += 1
+            value = entry[1]
+        else:
+            self.metrics['misses'] += 1
+            value = await loader()
+            self._store(cache_key, value)
+
+        if memo is not None:
+            memo[cache_key] = value
+        return value
+
+    def _store(self, cache_key: tuple, value):
+        now = time.monotonic()
+        self._entries.pop(cache_key, None)
+        self._entries[cache_key] = (now + self.ttl, value)
+        if len(self._entries) > self.max_size:
+            self._entries = {k: entry for k, entry in self._entries.items() if entry[0] > now}
+            while len(self._entries) > self.max_size:
+                # Oldest insertion first
+                del self._entries[next(iter(self._entries))]
+
+    def _drop(self, cache_key: tuple):
+        self._entries.pop(cache_key, None)
+        memo = _request_memo.get()
+        if memo is not None:
+            memo.pop(cache_key, None)
+        self.metrics['invalidations'] += 1
+
+    def invalidate_user(self, user_id: int):
+        self._drop(('user', user_id))
+
+    def invalidate_organization(self, organization_id: str):
+        """Drop the member list and every user entry resolved to this organization"""
+        organization_id = str(organization_id)
+        self._drop(('members', organization_id))
+        for cache_key, (_, org) in list(self._entries.items()):
+            if cache_key[0] == 'user' and org is not None and str(org.id) == organization_id:
+                self._drop(cache_key)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {**self.metrics, 'size': len(self._entries), 'ttl_seconds': self.ttl}
+
+
+membership_cache = MembershipCache()
+
 
 class OrganizationService:
     
@@ -30,10 +127,17 @@ class OrganizationService:
             
             await session.commit()
             await session.refresh(org)
-            return org
+
+        membership_cache.invalidate_user(owner_id)
+        return org
     
     async def get_user_organization(self, user_id: int):
-        """Get the organization where user is a member"""
+        """Get the organization where user is a member (cached)"""
+        return await membership_cache.resolve(
+            'user', user_id, lambda: self._load_user_organization(user_id)
+        )
+
+    async def _load_user_organization(self, user_id: int):
         async with SessionLocal() as session:
             result = await session.execute(
                 select(Organization)
@@ -44,7 +148,12 @@ class OrganizationService:
             return result.scalars().first()
     
     async def get_organization_members(self, organization_id: str):
-        """Get all members of an organization"""
+        """Get all members of an organization (cached)"""
+        return await membership_cache.resolve(
+            'members', str(organization_id), lambda: self._load_organization_members(organization_id)
+        )
+
+    async def _load_organization_members(self, organization_id: str):
         async with SessionLocal() as session:
             # organization_id is now a string (String(36))
             result = await session.execute(
@@ -83,7 +192,7 @@ class OrganizationService:
                 user = existing_user
             else:
                 # Create new user
-                hashed_password = auth_service.get_password_hash(password)
+                hashed_password = await auth_service.get_password_hash_async(password)
                 user = User(
                     username=username,
                     email=email,
@@ -120,6 +229,9 @@ class OrganizationService:
             await session.commit()
             await session.refresh(member)
             await session.refresh(user)
+
+            membership_cache.invalidate_user(user.id)
+            membership_cache.invalidate_organization(org_id_str)
             
             return {
                 "user": user,
@@ -143,6 +255,9 @@ class OrganizationService:
             
             await session.delete(member)
             await session.commit()
+
+            membership_cache.invalidate_user(user_id)
+            membership_cache.invalidate_organization(organization_id)
             
             return {"message": "Member removed successfully"}
     
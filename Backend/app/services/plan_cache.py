@@ -0,0 +1,227 @@
+"""
+Content-addressed cache for generated project plans.
+
+Plans are keyed by sha256 of the prompt version and the normalized project
+description (lowercased words, punctuation and spacing dropped), so
+resubmitting the same idea skips the model call. Two tiers: an in-process
+LRU of PLAN_CACHE_MEMORY_ENTRIES, and a SQLite file at PLAN_CACHE_PATH
+shared by every worker, with entries expiring after PLAN_CACHE_TTL_SECONDS
+and the least recently used dropped beyond PLAN_CACHE_MAX_ENTRIES.
+"""
+from starlette.config import Config
+from collections import OrderedDict
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+config = Config(".env")
+PLAN_CACHE_PATH = config("PLAN_CACHE_PATH", default=os.path.join(tempfile.gettempdir(), "atlas-plan-cache.sqlite3"))
+PLAN_CACHE_TTL_SECONDS = config("PLAN_CACHE_TTL_SECONDS", cast=float, default=7 * 24 * 3600)
+PLAN_CACHE_MAX_ENTRIES = config("PLAN_CACHE_MAX_ENTRIES", cast=int, default=5000)
+PLAN_CACHE_MEMORY_ENTRIES = config("PLAN_CACHE_MEMORY_ENTRIES", cast=int, default=256)
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS plan_cache (
+    key TEXT PRIMARY KEY,
+    plan TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+
+def normalize_description(description: str) -> str:
+    return " ".join(_WORD.findall(description.lower()))
+
+
+def plan_cache_key(description: str, version: str) -> str:
+    return hashlib.sha256(f"{version}\0{normalize_description(description)}".encode()).hexdigest()
+
+
+class PlanCache:
+    def __init__(
+        self,
+        path: str = PLAN_CACHE_PATH,
+        ttl: float = PLAN_CACHE_TTL_SECONDS,
+        max_entries: int = PLAN_CACHE_MAX_ENTRIES,
+        memory_entries: int = PLAN_CACHE_MEMORY_ENTRIES
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        # key -> (created_at, plan JSON); JSON so every hit hands out a fresh copy
+        self._memory = OrderedDict()
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._disk_disabled = False
+        # key -> future of a generation in progress, so identical requests share one call
+        self._inflight = {}
+        self.metrics = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'shared_misses': 0,
+            'stores': 0,
+            'evictions': 0,
+            'disk_errors': 0,
+        }
+
+    # Persistent tier (blocking; called through asyncio.to_thread)
+
+    def _connection(self):
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(SCHEMA)
+            self._db.execute("CREATE INDEX IF NOT EXISTS ix_plan_cache_last_used ON plan_cache (last_used)")
+            self._db.commit()
+        return self._db
+
+    def _disk_get(self, key: str, now: float):
+        with self._db_lock:
+            db = self._connection()
+            row = db.execute("SELECT plan, created_at FROM plan_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] + self.ttl <= now:
+                db.execute("DELETE FROM plan_cache WHERE key = ?", (key,))
+                db.commit()
+                return None
+            db.execute("UPDATE plan_cache SET last_used = ? WHERE key = ?", (now, key))
+            db.commit()
+            return row
+
+    def _disk_put(self, key: str, plan: str, now: float) -> int:
+        """Store a plan and evict expired and least recently used rows; returns rows evicted"""
+        with self._db_lock:
+            db = self._connection()
+            db.execute(
+                "INSERT OR REPLACE INTO plan_cache (key, plan, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, plan, now, now)
+            )
+            evicted = db.execute("DELETE FROM plan_cache WHERE created_at <= ?", (now - self.ttl,)).rowcount
+            evicted += db.execute(
+                """
+                DELETE FROM plan_cache WHERE key IN (
+                    SELECT key FROM plan_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            ).rowcount
+            db.commit()
+            return evicted
+
+    async def _disk(self, func, *args):
+        if self._disk_disabled:
+            return None
+        try:
+            return await asyncio.to_thread(func, *args)
+        except sqlite3.Error as e:
+            self.metrics['disk_errors'] += 1
+            logger.error(f"❌ Plan cache at {self.path} failed: {e}")
+            if self._db is None:
+                # Could not even open the file; keep going with the memory tier only
+                self._disk_disabled = True
+            return None
+
+    # Memory tier
+
+    def _remember(self, key: str, created_at: float, plan: str):
+        self._memory[key] = (created_at, plan)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    async def get(self, key: str):
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None:
+            if entry[0] + self.ttl > now:
+                self._memory.move_to_end(key)
+                self.metrics['memory_hits'] += 1
+                return json.loads(entry[1])
+            del self._memory[key]
+
+        row = await self._disk(self._disk_get, key, now)
+        if row is not None:
+            self.metrics['disk_hits'] += 1
+            self._remember(key, row[1], row[0])
+            return json.loads(row[0])
+        return None
+
+    async def put(self, key: str, plan: dict):
+        now = time.time()
+        encoded = json.dumps(plan)
+        self._remember(key, now, encoded)
+        self.metrics['stores'] += 1
+        evicted = await self._disk(self._disk_put, key, encoded, now)
+        self.metrics['evictions'] += evicted or 0
+
+    async def get_or_create(self, description: str, version: str, create) -> dict:
+        """
+        Return the cached plan for the description, or `await create()` and cache it.
+        create() returns (plan, cacheable); fallback plans should not be cached.
+        """
+        key = plan_cache_key(description, version)
+        while True:
+            plan = await self.get(key)
+            if plan is not None:
+                return plan
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            try:
+                encoded = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled() or asyncio.current_task().cancelling():
+                    raise  # This request itself was cancelled
+                # The generating request went away; take over from it
+                continue
+            self.metrics['shared_misses'] += 1
+            return json.loads(encoded)
+
+        self.metrics['misses'] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            plan, cacheable = await create()
+            if cacheable:
+                await self.put(key, plan)
+            future.set_result(json.dumps(plan))
+            return plan
+        except asyncio.CancelledError:
+            # Waiters see the cancelled future and retry as the new leader
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else was waiting
+            raise
+        finally:
+            del self._inflight[key]
+
+    def stats(self) -> dict:
+        hits = self.metrics['memory_hits'] + self.metrics['disk_hits'] + self.metrics['shared_misses']
+        lookups = hits + self.metrics['misses']
+        return {
+            **self.metrics,
+            'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+            'memory_entries': len(self._memory),
+            'disk_enabled': not self._disk_disabled,
+        }
+
+
+plan_cache = PlanCache()
@@ -0,0 +1,174 @@
+"""
+Which users have an open socket on any worker.
+
+ConnectionManager registers a user when their first socket opens on this
+worker and unregisters them once the offline grace period ends, and asks the
+registry whether that made them come online or go offline everywhere. The
+in-process registry only knows this worker's users. The Redis registry keeps
+a hash per user of the workers holding them (WS_PRESENCE_PREFIX:user:<id>),
+and each worker refreshes a liveness key that expires after
+PRESENCE_WORKER_TTL_SECONDS, so users held by a crashed worker stop counting
+as online once its key expires.
+"""
+from starlette.config import Config
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+config = Config(".env")
+WS_PRESENCE_PREFIX = config("WS_PRESENCE_PREFIX", default="atlas:presence")
+PRESENCE_WORKER_TTL_SECONDS = config("PRESENCE_WORKER_TTL_SECONDS", cast=int, default=30)
+
+
+class LocalPresenceRegistry:
+    """Single-worker registry: a user is online while this worker holds them"""
+    distributed = False
+
+    def __init__(self):
+        self._online = set()
+
+    async def start(self):
+        pass
+
+    async def add(self, user_id: int) -> bool:
+        """Register a user; True when they were offline everywhere"""
+        came_online = user_id not in self._online
+        self._online.add(user_id)
+        return came_online
+
+    async def remove(self, user_id: int) -> bool:
+        """Unregister a user; True when no worker holds them any more"""
+        self._online.discard(user_id)
+        return True
+
+    async def online(self, user_ids) -> list:
+        return [user_id for user_id in user_ids if user_id in self._online]
+
+    async def stop(self):
+        self._online.clear()
+
+    def stats(self) -> dict:
+        return {'backend': 'in-process', 'users': len(self._online)}
+
+
+class RedisPresenceRegistry:
+    """Registry shared by every worker through Redis"""
+    distributed = True
+
+    def __init__(self, client, worker_id: str, prefix: str = WS_PRESENCE_PREFIX, ttl: int = PRESENCE_WORKER_TTL_SECONDS):
+        self.client = client
+        self.worker_id = worker_id
+        self.prefix = prefix
+        self.ttl = ttl
+        # Users registered by this worker, removed from Redis on stop
+        self._local = set()
+        self._task = None
+        self.metrics = {'errors': 0, 'dead_workers_pruned': 0}
+
+    def _user_key(self, user_id: int) -> str:
+        return f"{self.prefix}:user:{user_id}"
+
+    def _worker_key(self, worker_id: str) -> str:
+        return f"{self.prefix}:worker:{worker_id}"
+
+    async def start(self):
+        if self._task is None:
+            await self._beat()
+            self._task = asyncio.create_task(self._run(), name="presence-registry")
+
+    async def _beat(self):
+        try:
+            await self.client.set(self._worker_key(self.worker_id), 1, ex=self.ttl)
+        except Exception as e:
+            self.metrics['errors'] += 1
+            logger.error(f"❌ Failed to refresh presence worker key: {e}")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.ttl / 3)
+            await self._beat()
+
+    async def _live_workers(self, workers_by_user: dict) -> dict:
+        """Map each user to the workers holding them whose liveness key still exists"""
+        workers = sorted({worker for held_by in workers_by_user.values() for worker in held_by})
+        if not workers:
+            return {user_id: [] for user_id in workers_by_user}
+        flags = await self.client.mget([self._worker_key(worker) for worker in workers])
+        alive = {worker for worker, flag in zip(workers, flags) if flag is not None}
+        live = {}
+        for user_id, held_by in workers_by_user.items():
+            dead = [worker for worker in held_by if worker not in alive]
+            if dead:
+                # A crashed worker never unregisters its users
+                self.metrics['dead_workers_pruned'] += len(dead)
+                await self.client.hdel(self._user_key(user_id), *dead)
+            live[user_id] = [worker for worker in held_by if worker in alive]
+        return live
+
+    @staticmethod
+    def _decode(workers) -> list:
+        return [worker.decode() if isinstance(worker, bytes) else worker for worker in workers]
+
+    async def add(self, user_id: int) -> bool:
+        self._local.add(user_id)
+        try:
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.hkeys(self._user_key(user_id))
+                pipe.hset(self._user_key(user_id), self.worker_id, 1)
+                held_by, _ = await pipe.execute()
+            others = [worker for worker in self._decode(held_by) if worker != self.worker_id]
+            live = await self._live_workers({user_id: others})
+            return not live[user_id]
+        except Exception as e:
+            self.metrics['errors'] += 1
+            logger.error(f"❌ Failed to register presence for user {user_id}: {e}")
+            return True
+
+    async def remove(self, user_id: int) -> bool:
+        self._local.discard(user_id)
+        try:
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.hdel(self._user_key(user_id), self.worker_id)
+                pipe.hkeys(self._user_key(user_id))
+                _, held_by = await pipe.execute()
+            live = await self._live_workers({user_id: self._decode(held_by)})
+            return not live[user_id]
+        except Exception as e:
+            self.metrics['errors'] += 1
+            logger.error(f"❌ Failed to unregister presence for user {user_id}: {e}")
+            return True
+
+    async def online(self, user_ids) -> list:
+        user_ids = list(user_ids)
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for user_id in user_ids:
+                    pipe.hkeys(self._user_key(user_id))
+                held_by = await pipe.execute()
+            live = await self._live_workers({
+                user_id: self._decode(workers) for user_id, workers in zip(user_ids, held_by) if workers
+            })
+        except Exception as e:
+            self.metrics['errors'] += 1
+            logger.error(f"❌ Failed to read shared presence: {e}")
+            return [user_id for user_id in user_ids if user_id in self._local]
+        return [user_id for user_id in user_ids if live.get(user_id)]
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for user_id in self._local:
+                    pipe.hdel(self._user_key(user_id), self.worker_id)
+                pipe.delete(self._worker_key(self.worker_id))
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"❌ Failed to clear presence for worker {self.worker_id}: {e}")
+        self._local.clear()
+
+    def stats(self) -> dict:
+        return {'backend': 'redis', 'users': len(self._local), **self.metrics}
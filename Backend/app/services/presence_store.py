@@ -0,0 +1,136 @@
+"""
+Write-behind store for user presence.
+
+Presence lives in memory (status plus last-seen time per user) and is
+written to user_presence every PRESENCE_FLUSH_SECONDS with one batched
+upsert of the users that changed since the previous flush.
+"""
+from starlette.config import Config
+from sqlalchemy import select, update, insert, bindparam
+from app.config.database import SessionLocal
+from app.models.message import UserPresence
+from datetime import datetime
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+config = Config(".env")
+PRESENCE_FLUSH_SECONDS = config("PRESENCE_FLUSH_SECONDS", cast=float, default=2)
+PRESENCE_OFFLINE_GRACE_SECONDS = config("PRESENCE_OFFLINE_GRACE_SECONDS", cast=float, default=5)
+# Presence changes are sent to each organization as one diff per tick
+PRESENCE_BATCH_MS = config("PRESENCE_BATCH_MS", cast=float, default=250)
+
+
+class PresenceStore:
+    def __init__(self, flush_seconds: float = PRESENCE_FLUSH_SECONDS):
+        self.flush_seconds = flush_seconds
+        self._status = {}
+        self._last_seen = {}
+        self._dirty = set()
+        self._task = None
+        self.metrics = {
+            'transitions': 0,
+            'flushes': 0,
+            'rows_written': 0,
+            'failed_flushes': 0,
+        }
+
+    def get(self, user_id: int) -> str:
+        return self._status.get(user_id, 'offline')
+
+    def set(self, user_id: int, status: str) -> bool:
+        """Record a status; returns True when it differs from the current one"""
+        changed = self._status.get(user_id, 'offline') != status
+        self._status[user_id] = status
+        self._last_seen[user_id] = datetime.utcnow()
+        self._dirty.add(user_id)
+        if changed:
+            self.metrics['transitions'] += 1
+        return changed
+
+    def forget(self, user_id: int):
+        """Drop a user whose presence another worker now owns, without writing anything"""
+        self._status.pop(user_id, None)
+        self._last_seen.pop(user_id, None)
+        self._dirty.discard(user_id)
+
+    async def flush(self):
+        """Upsert every user whose presence changed since the last flush"""
+        if not self._dirty:
+            return
+        user_ids, self._dirty = self._dirty, set()
+        rows = [
+            {'user_id': uid, 'status': self._status[uid], 'last_seen': self._last_seen[uid]}
+            for uid in user_ids
+        ]
+        try:
+            async with SessionLocal() as session:
+                await self._upsert(session, rows)
+                await session.commit()
+        except Exception as e:
+            # Keep the users dirty so the next flush retries them
+            self._dirty |= user_ids
+            self.metrics['failed_flushes'] += 1
+            logger.error(f"❌ Failed to flush presence for {len(rows)} users: {e}")
+            return
+        self.metrics['flushes'] += 1
+        self.metrics['rows_written'] += len(rows)
+
+    async def _upsert(self, session, rows: list):
+        table = UserPresence.__table__
+        dialect = session.bind.dialect.name
+        if dialect in ('sqlite', 'postgresql'):
+            if dialect == 'sqlite':
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            statement = dialect_insert(table)
+            statement = statement.on_conflict_do_update(
+                index_elements=[table.c.user_id],
+                set_={'status': statement.excluded.status, 'last_seen': statement.excluded.last_seen}
+            )
+            await session.execute(statement, rows)
+            return
+
+        # No ON CONFLICT: update the users that have a row, insert the rest
+        result = await session.execute(
+            select(table.c.user_id).where(table.c.user_id.in_([row['user_id'] for row in rows]))
+        )
+        existing = set(result.scalars())
+        updates = [
+            {'b_user_id': row['user_id'], 'status': row['status'], 'last_seen': row['last_seen']}
+            for row in rows if row['user_id'] in existing
+        ]
+        inserts = [row for row in rows if row['user_id'] not in existing]
+        if updates:
+            await session.execute(
+                update(table).where(table.c.user_id == bindparam('b_user_id')),
+                updates
+            )
+        if inserts:
+            await session.execute(insert(table), inserts)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            await self.flush()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="presence-flush")
+
+    async def stop(self):
+        """Stop the periodic flush and write whatever is pending"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            **self.metrics,
+            'online': sum(1 for status in self._status.values() if status == 'online'),
+            'pending': len(self._dirty),
+        }
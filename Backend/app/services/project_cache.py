@@ -0,0 +1,203 @@
+"""
+Per-project cache of serialized epic trees.
+
+Entries are invalidated whenever an Epic, Story or Task belonging to the
+project is flushed and committed through any session. Once
+share_invalidations() is called, commits on one worker also invalidate the
+other workers' caches through the WebSocket backplane; as pub/sub may drop
+events while Redis reconnects, trees also expire after
+PROJECT_TREE_CACHE_TTL_SECONDS. At most PROJECT_TREE_CACHE_SIZE trees are
+kept, least recently read dropped first.
+"""
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+from starlette.config import Config
+from sqlalchemy import event
+import asyncio
+import logging
+import time
+import uuid
+from sqlalchemy.orm import Session
+from app.models.epic import Epic
+from app.models.story import Story
+from app.models.task import Task
+
+config = Config(".env")
+PROJECT_TREE_CACHE_SIZE = config("PROJECT_TREE_CACHE_SIZE", cast=int, default=256)
+PROJECT_TREE_CACHE_TTL_SECONDS = config("PROJECT_TREE_CACHE_TTL_SECONDS", cast=float, default=300)
+
+logger = logging.getLogger(__name__)
+
+DIRTY_PROJECTS_KEY = "atlas_dirty_projects"
+
+
+class ProjectTreeCache:
+    def __init__(self, max_size: int = PROJECT_TREE_CACHE_SIZE, ttl: float = PROJECT_TREE_CACHE_TTL_SECONDS):
+        self.max_size = max_size
+        self.ttl = ttl
+        # project_id -> (generation, serialized tree, expiry), least recently read first
+        self._entries = OrderedDict()
+        # project_id -> generation, bumped on every invalidation
+        self._generations: Dict[str, int] = {}
+        # Generation of projects missing from _generations. Generations come
+        # from one counter, so a reset never hands out a value seen before
+        # and trees loaded before the reset are never stored.
+        self._base_generation = 0
+        self._next_generation = 1
+        # project_id -> ids of its epics, for the max_size most recently stored trees
+        self._project_epics = OrderedDict()
+        # epic_id -> project_id, learned while building trees
+        self._epic_projects: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.remote_invalidations = 0
+        # Publishes invalidations to the other workers; set by share_invalidations
+        self._publish = None
+        # Tags this cache's events so it doesn't apply its own invalidations twice
+        self._source = uuid.uuid4().hex
+        self._publishing = set()
+
+    def generation(self, project_id: str) -> int:
+        """Current generation of a project, read before loading its tree"""
+        return self._generations.get(project_id, self._base_generation)
+
+    def _new_generation(self) -> int:
+        generation = self._next_generation
+        self._next_generation += 1
+        return generation
+
+    def get(self, project_id: str) -> Optional[bytes]:
+        entry = self._entries.get(project_id)
+        if entry and entry[0] == self.generation(project_id) and entry[2] > time.monotonic():
+            self._entries.move_to_end(project_id)
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def store(self, project_id: str, generation: int, payload: bytes, epic_list: list):
+        """
+        Store a serialized tree loaded at `generation`.
+        A tree loaded before a concurrent invalidation is dropped.
+        """
+        if generation != self.generation(project_id):
+            return
+        self._remember_epics(project_id, [epic["id"] for epic in epic_list])
+        self._entries[project_id] = (generation, payload, time.monotonic() + self.ttl)
+        self._entries.move_to_end(project_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _remember_epics(self, project_id: str, epic_ids: list):
+        for epic_id in self._project_epics.pop(project_id, ()):
+            self._epic_projects.pop(epic_id, None)
+        for epic_id in epic_ids:
+            self._epic_projects[epic_id] = project_id
+        self._project_epics[project_id] = epic_ids
+        while len(self._project_epics) > self.max_size:
+            _, forgotten = self._project_epics.popitem(last=False)
+            for epic_id in forgotten:
+                self._epic_projects.pop(epic_id, None)
+
+    def invalidate(self, project_ids: Iterable[str]):
+        for project_id in project_ids:
+            if project_id is None:
+                continue
+            project_id = str(project_id)
+            self._generations[project_id] = self._new_generation()
+            self._entries.pop(project_id, None)
+        if len(self._generations) > self.max_size * 8:
+            self._reset()
+
+    def share_invalidations(self, manager):
+        """Exchange invalidations with the other workers over the manager's backplane"""
+        manager.on_event('project_tree', self._apply_remote)
+        self._publish = manager.publish
+
+    def _apply_remote(self, event: dict):
+        if event.get('source') == self._source:
+            return
+        self.remote_invalidations += 1
+        self.invalidate(event['project_ids'])
+
+    def invalidate_committed(self, project_ids):
+        """Invalidate projects changed by a commit here, then on the other workers"""
+        self.invalidate(project_ids)
+        if self._publish is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Committed outside an event loop; the other workers fall back to the TTL
+        task = loop.create_task(self._broadcast(sorted(project_ids)))
+        self._publishing.add(task)
+        task.add_done_callback(self._publishing.discard)
+
+    async def _broadcast(self, project_ids: list):
+        try:
+            await self._publish({'target': 'project_tree', 'project_ids': project_ids, 'source': self._source})
+        except Exception as e:
+            logger.error(f"❌ Failed to publish project tree invalidation: {e}")
+
+    def _reset(self):
+        """Forget every generation (and so every tree) once too many projects have been invalidated"""
+        self._base_generation = self._new_generation()
+        self._generations.clear()
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'remote_invalidations': self.remote_invalidations,
+            'size': len(self._entries),
+            'max_size': self.max_size,
+        }
+
+    def mark_dirty(self, session, project_ids: Iterable[str]):
+        """
+        Queue invalidation for changes made with Core statements that bypass
+        the ORM flush hooks. Applied when the session commits.
+        """
+        if hasattr(session, "sync_session"):
+            session = session.sync_session
+        session.info.setdefault(DIRTY_PROJECTS_KEY, set()).update(
+            str(pid) for pid in project_ids if pid is not None
+        )
+
+    def _project_for(self, obj) -> Optional[str]:
+        if isinstance(obj, (Task, Epic)):
+            return obj.project_id
+        if isinstance(obj, Story):
+            return self._epic_projects.get(str(obj.epic_id))
+        return None
+
+    def _collect(self, session: Session):
+        dirty = session.info.setdefault(DIRTY_PROJECTS_KEY, set())
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+            project_id = self._project_for(obj)
+            if project_id is not None:
+                dirty.add(str(project_id))
+
+
+project_tree_cache = ProjectTreeCache()
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_dirty_projects(session, flush_context, instances):
+    project_tree_cache._collect(session)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_dirty_projects(session):
+    dirty = session.info.pop(DIRTY_PROJECTS_KEY, None)
+    if dirty:
+        project_tree_cache.invalidate_committed(dirty)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_dirty_projects(session):
+    session.info.pop(DIRTY_PROJECTS_KEY, None)
@@ -1,23 +1,29 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import insert
 from app.models.project import Project
-from app.models.epic import Epic
+from app.models.epic import Epic, generate_uuid
 from app.models.story import Story
 from app.models.task import Task
 from app.config.database import SessionLocal
+from app.services.project_cache import project_tree_cache
+import json
+import logging
 import uuid
 
+logger = logging.getLogger(__name__)
+
 class ProjectService:
     async def get_user_projects(self, user_id: int) -> list:
         """Get all projects for a user's organization"""
         from app.services.organization_service import organization_service
         
+        # Get user's organization (cached) before taking a connection
+        org = await organization_service.get_user_organization(user_id)
+        if not org:
+            return []
+
         async with SessionLocal() as session:
-            # Get user's organization
-            org = await organization_service.get_user_organization(user_id)
-            if not org:
-                return []
-            
             # Get all projects in the organization (org.id is now a string)
             result = await session.execute(
                 select(Project).where(Project.organization_id == str(org.id))
@@ -54,129 +60,166 @@ class ProjectService:
             ]
         }
         """
-        async with SessionLocal() as session:
+        project_id = generate_uuid()
+        epic_rows = []
+        story_rows = []
+        task_rows = []
+
+        # IDs are generated client-side so the whole plan can be inserted
+        # with one executemany per table instead of a flush per row
+        for epic_idx, epic_data in enumerate(plan.get('epics', [])):
+            epic_id = generate_uuid()
+            epic_rows.append({
+                "id": epic_id,
+                "project_id": project_id,
+                "name": epic_data.get('name', f'Epic {epic_idx + 1}'),
+                "description": epic_data.get('description', ''),
+                "order": epic_idx
+            })
+
+            for story_idx, story_data in enumerate(epic_data.get('stories', [])):
+                story_id = generate_uuid()
+                story_rows.append({
+                    "id": story_id,
+                    "epic_id": epic_id,
+                    "name": story_data.get('name', f'Story {story_idx + 1}'),
+                    "description": story_data.get('description', ''),
+                    "order": story_idx
+                })
+
+                for task_idx, task_data in enumerate(story_data.get('tasks', [])):
+                    # Handle both string and dict task formats
+                    if isinstance(task_data, str):
+                        task_title = task_data
+                        task_desc = ''
+                    else:
+                        task_title = task_data.get('title', f'Task {task_idx + 1}')
+                        task_desc = task_data.get('description', '')
+
+                    task_rows.append({
+                        "id": generate_uuid(),
+                        "project_id": project_id,
+                        "story_id": story_id,
+                        "title": task_title,
+                        "description": task_desc,
+                        "status": 'To Do',
+                        "order": task_idx
+                    })
+
+        async with SessionLocal(expire_on_commit=False) as session:
             async with session.begin():
                 # owner_id is an integer from the user table
-                # No conversion needed
-                
                 # Create project (organization_id is now a string)
                 project = Project(
+                    id=project_id,
                     name=plan.get('project_name', 'Untitled Project'),
                     description=plan.get('description', ''),
                     owner_id=owner_id,
                     organization_id=str(organization_id) if organization_id else None
                 )
                 session.add(project)
-                await session.flush()  # Get project ID
-                
-                print(f"Created project: {project.id} with {len(plan.get('epics', []))} epics")
-
-                # Create epics, stories, and tasks
-                epics_data = plan.get('epics', [])
-                print(f"Creating {len(epics_data)} epics...")
-                
-                for epic_idx, epic_data in enumerate(epics_data):
-                    epic = Epic(
-                        project_id=str(project.id),
-                        name=epic_data.get('name', f'Epic {epic_idx + 1}'),
-                        description=epic_data.get('description', ''),
-                        order=epic_idx
-                    )
-                    session.add(epic)
-                    await session.flush()  # Get epic ID
-                    print(f"  Created epic: {epic.name} (ID: {epic.id})")
-
-                    # Create stories
-                    stories_data = epic_data.get('stories', [])
-                    for story_idx, story_data in enumerate(stories_data):
-                        story = Story(
-                            epic_id=str(epic.id),
-                            name=story_data.get('name', f'Story {story_idx + 1}'),
-                            description=story_data.get('description', ''),
-                            order=story_idx
-                        )
-                        session.add(story)
-                        await session.flush()  # Get story ID
-                        print(f"    Created story: {story.name} (ID: {story.id})")
-
-                        # Create tasks
-                        tasks_data = story_data.get('tasks', [])
-                        for task_idx, task_data in enumerate(tasks_data):
-                            # Handle both string and dict task formats
-                            if isinstance(task_data, str):
-                                task_title = task_data
-                                task_desc = ''
-                            else:
-                                task_title = task_data.get('title', f'Task {task_idx + 1}')
-                                task_desc = task_data.get('description', '')
-                            
-                            task = Task(
-                                project_id=str(project.id),
-                                story_id=str(story.id),
-                                title=task_title,
-                                description=task_desc,
-                                status='To Do',
-                                order=task_idx
-                            )
-                            session.add(task)
-                            print(f"      Created task: {task_title}")
-
-                await session.commit()
-                return project
+                await session.flush()
+
+                for model, rows in ((Epic, epic_rows), (Story, story_rows), (Task, task_rows)):
+                    if rows:
+                        await session.execute(insert(model.__table__), rows)
+
+            logger.info(
+                f"Created project {project_id}: {len(epic_rows)} epics, "
+                f"{len(story_rows)} stories, {len(task_rows)} tasks"
+            )
+            return project
 
     async def get_project_epics(self, project_id: str) -> list:
         """Get all epics with their stories and tasks for a project"""
+        return json.loads(await self.get_project_epics_json(project_id))
+
+    async def get_project_epics_json(self, project_id: str) -> bytes:
+        """
+        Get the serialized epic tree for a project.
+        Served from the per-project cache when nothing in the project changed.
+        """
+        project_id_str = str(project_id)
+        cached = project_tree_cache.get(project_id_str)
+        if cached is not None:
+            return cached
+
+        generation = project_tree_cache.generation(project_id_str)
+        epic_list = await self._load_project_tree(project_id_str)
+        payload = json.dumps(epic_list).encode("utf-8")
+        project_tree_cache.store(project_id_str, generation, payload, epic_list)
+        return payload
+
+    async def _load_project_tree(self, project_id: str) -> list:
+        """Load epics, stories and tasks in three queries and nest them in memory"""
         async with SessionLocal() as session:
-            # project_id is now a string (String(36))
-            project_id_str = str(project_id)
-            
-            # Get all epics for the project
-            result = await session.execute(
-                select(Epic).where(Epic.project_id == project_id_str).order_by(Epic.order)
+            epic_rows = await session.execute(
+                select(Epic.id, Epic.name, Epic.description, Epic.order)
+                .where(Epic.project_id == project_id)
+                .order_by(Epic.order)
             )
-            epics = result.scalars().all()
-            
             epic_list = []
-            for epic in epics:
-                # Get stories for this epic
-                story_result = await session.execute(
-                    select(Story).where(Story.epic_id == epic.id).order_by(Story.order)
+            epics_by_id = {}
+            for row in epic_rows:
+                epic = {
+                    "id": str(row.id),
+                    "name": row.name,
+                    "description": row.description,
+                    "order": row.order,
+                    "stories": []
+                }
+                epic_list.append(epic)
+                epics_by_id[epic["id"]] = epic
+
+            if not epic_list:
+                return epic_list
+
+            project_story_ids = (
+                select(Story.id)
+                .join(Epic, Story.epic_id == Epic.id)
+                .where(Epic.project_id == project_id)
+            )
+            story_rows = await session.execute(
+                select(Story.id, Story.epic_id, Story.name, Story.description, Story.order)
+                .where(Story.id.in_(project_story_ids))
+                .order_by(Story.order)
+            )
+            stories_by_id = {}
+            for row in story_rows:
+                story = {
+                    "id": str(row.id),
+                    "name": row.name,
+                    "description": row.description,
+                    "order": row.order,
+                    "tasks": []
+                }
+                epics_by_id[str(row.epic_id)]["stories"].append(story)
+                stories_by_id[story["id"]] = story
+
+            if not stories_by_id:
+                return epic_list
+
+            task_rows = await session.execute(
+                select(
+                    Task.id,
+                    Task.story_id,
+                    Task.title,
+                    Task.status,
+                    Task.assignee_id,
+                    Task.progress_percentage
                 )
-                stories = story_result.scalars().all()
-                
-                story_list = []
-                for story in stories:
-                    # Get tasks for this story
-                    task_result = await session.execute(
-                        select(Task).where(Task.story_id == story.id).order_by(Task.order)
-                    )
-                    tasks = task_result.scalars().all()
-                    
-                    story_list.append({
-                        "id": str(story.id),
-                        "name": story.name,
-                        "description": story.description,
-                        "order": story.order,
-                        "tasks": [
-                            {
-                                "id": str(task.id),
-                                "title": task.title,
-                                "status": task.status,
-                                "assignee_id": task.assignee_id,
-                                "progress_percentage": task.progress_percentage or 0
-                            }
-                            for task in tasks
-                        ]
-                    })
-                
-                epic_list.append({
-                    "id": str(epic.id),
-                    "name": epic.name,
-                    "description": epic.description,
-                    "order": epic.order,
-                    "stories": story_list
+                .where(Task.story_id.in_(project_story_ids))
+                .order_by(Task.story_id, Task.order)
+            )
+            for row in task_rows:
+                stories_by_id[str(row.story_id)]["tasks"].append({
+                    "id": str(row.id),
+                    "title": row.title,
+                    "status": row.status,
+                    "assignee_id": row.assignee_id,
+                    "progress_percentage": row.progress_percentage or 0
                 })
-            
+
             return epic_list
 
 
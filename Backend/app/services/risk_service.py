@@ -1,10 +1,19 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import and_
+from sqlalchemy import and_, or_, update, case
 from app.models.task import Task
 from app.config.database import SessionLocal
 from datetime import datetime, timedelta
 from app.services.notification_service import notification_service
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ['To Do', 'In Progress']
+SCAN_CHUNK_SIZE = 2000
+# A due date moves into a riskier bucket as it passes now + n days for each n here
+RISK_THRESHOLD_DAYS = (0, 2, 4, 8)
 
 class RiskService:
     def calculate_task_risk(self, task: Task) -> str:
@@ -55,54 +64,205 @@ class RiskService:
         else:
             return 'low'
 
+    async def recompute_task_risks(self, session, task_ids: list) -> dict:
+        """
+        Recompute risk levels for the given tasks inside the caller's transaction.
+        Returns {task_id: new_risk} for the tasks whose level changed.
+        """
+        from app.services.task_service import BULK_CHUNK_SIZE
+
+        changed = {}
+        for start in range(0, len(task_ids), BULK_CHUNK_SIZE):
+            chunk = task_ids[start:start + BULK_CHUNK_SIZE]
+            result = await session.execute(
+                select(
+                    Task.id,
+                    Task.status,
+                    Task.due_date,
+                    Task.progress_percentage,
+                    Task.risk_level
+                ).where(Task.id.in_(chunk))
+            )
+            chunk_changes = {}
+            for row in result:
+                new_risk = self.calculate_task_risk(row)
+                if new_risk != row.risk_level:
+                    chunk_changes[row.id] = new_risk
+
+            await self.write_risk_levels(session, chunk_changes)
+            changed.update(chunk_changes)
+        return changed
+
+    async def write_risk_levels(self, session, risk_levels: dict):
+        """Write {task_id: risk_level} with a single UPDATE ... CASE statement"""
+        if not risk_levels:
+            return
+        # One WHEN per level rather than per task keeps the CASE short for large chunks
+        ids_by_level = {}
+        for task_id, level in risk_levels.items():
+            ids_by_level.setdefault(level, []).append(task_id)
+        tasks = Task.__table__
+        await session.execute(
+            update(tasks)
+            .where(tasks.c.id.in_(list(risk_levels)))
+            .values(risk_level=case(
+                *[(tasks.c.id.in_(ids), level) for level, ids in ids_by_level.items()]
+            ))
+        )
+
+    def score_risk_levels(self, statuses: list, due_dates: list, progress: list, now: datetime = None) -> list:
+        """
+        Score a chunk of tasks column by column with the rules of calculate_task_risk.
+        timedelta.days floors, so "days_until_due <= n" is "due < now + (n + 1) days".
+        """
+        now = now or datetime.utcnow()
+        overdue, within_1, within_3, within_7 = (now + timedelta(days=n) for n in RISK_THRESHOLD_DAYS)
+
+        due_points = []
+        for due in due_dates:
+            if due is None:
+                due_points.append(0)
+                continue
+            due = due.replace(tzinfo=None)
+            if due < overdue:
+                due_points.append(50)
+            elif due < within_1:
+                due_points.append(30)
+            elif due < within_3:
+                due_points.append(20)
+            elif due < within_7:
+                due_points.append(10)
+            else:
+                due_points.append(0)
+
+        progress_points = [
+            ((15 if pct < 25 else 10 if pct < 50 else 0) + (20 if pct == 0 else 0))
+            if status == 'In Progress' else 0
+            for status, pct in zip(statuses, progress)
+        ]
+
+        return [
+            'low' if status == 'Done'
+            else 'high' if score >= 40
+            else 'medium' if score >= 20
+            else 'low'
+            for status, score in zip(statuses, map(sum, zip(due_points, progress_points)))
+        ]
+
+    async def scan_task_risks(self, where=None, chunk_size: int = SCAN_CHUNK_SIZE, now: datetime = None) -> dict:
+        """
+        Rescore active tasks in id-ordered chunks, one transaction per chunk.
+
+        Only changed risk levels are written (one UPDATE per chunk) and tasks
+        newly escalated to high risk notify their assignee with one bulk insert.
+        `where` narrows the scan with an extra SQLAlchemy condition on Task.
+        """
+        started = time.perf_counter()
+        now = now or datetime.utcnow()
+        stats = {
+            'tasks_scanned': 0,
+            'high_risk': 0,
+            'medium_risk': 0,
+            'risk_changes': 0,
+            'notifications_sent': 0,
+        }
+        last_id = None
+
+        while True:
+            query = select(
+                Task.id,
+                Task.title,
+                Task.status,
+                Task.due_date,
+                Task.progress_percentage,
+                Task.risk_level,
+                Task.assignee_id
+            ).where(Task.status.in_(ACTIVE_STATUSES))
+            if where is not None:
+                query = query.where(where)
+            if last_id is not None:
+                query = query.where(Task.id > last_id)
+
+            async with SessionLocal() as session:
+                rows = (await session.execute(query.order_by(Task.id).limit(chunk_size))).all()
+                if not rows:
+                    break
+
+                levels = self.score_risk_levels(
+                    [row.status for row in rows],
+                    [row.due_date for row in rows],
+                    [row.progress_percentage or 0 for row in rows],
+                    now
+                )
+
+                changes = {}
+                escalations = []
+                for row, new_risk in zip(rows, levels):
+                    if new_risk == row.risk_level:
+                        continue
+                    changes[row.id] = new_risk
+                    if new_risk == 'high' and row.assignee_id:
+                        escalations.append({
+                            'user_id': row.assignee_id,
+                            'type': 'task_at_risk',
+                            'title': '⚠️ Task At Risk',
+                            'message': f'Task "{row.title}" is at high risk of delay',
+                            'link': '/task-board'
+                        })
+
+                await self.write_risk_levels(session, changes)
+                notified = await notification_service.create_notifications(session, escalations)
+                await session.commit()
+
+            await notification_service.push_notifications(notified)
+            stats['notifications_sent'] += len(notified)
+
+            stats['tasks_scanned'] += len(rows)
+            stats['risk_changes'] += len(changes)
+            stats['high_risk'] += levels.count('high')
+            stats['medium_risk'] += levels.count('medium')
+            last_id = rows[-1].id
+            if len(rows) < chunk_size:
+                break
+
+        elapsed = time.perf_counter() - started
+        stats['duration_seconds'] = round(elapsed, 3)
+        stats['tasks_per_second'] = round(stats['tasks_scanned'] / elapsed) if elapsed else 0
+        logger.info(
+            f"Risk scan: {stats['tasks_scanned']} tasks, {stats['risk_changes']} changed, "
+            f"{stats['notifications_sent']} notified in {elapsed:.2f}s ({stats['tasks_per_second']} tasks/s)"
+        )
+        return stats
+
+    async def scan_threshold_crossings(self, since: datetime, now: datetime) -> dict:
+        """
+        Rescore only the tasks whose due-date bucket changed between since and now.
+        Status and progress changes are rescored when they are written.
+        """
+        crossings = [
+            and_(
+                Task.due_date >= since + timedelta(days=days),
+                Task.due_date < now + timedelta(days=days)
+            )
+            for days in RISK_THRESHOLD_DAYS
+        ]
+        # As a subquery the windows are answered from ix_tasks_due_date instead of
+        # being checked row by row along the id-ordered chunks
+        crossed = select(Task.id).where(or_(*crossings))
+        return await self.scan_task_risks(where=Task.id.in_(crossed), now=now)
+
+    async def run_scheduled_scan(self, last_run: datetime, now: datetime) -> dict:
+        """Scheduler job: a full scan the first time, then threshold crossings since the last run"""
+        if last_run is None:
+            return await self.scan_task_risks(now=now)
+        return await self.scan_threshold_crossings(last_run, now)
+
     async def detect_delays_and_update_risks(self) -> dict:
         """
         Scan all active tasks and update risk levels.
         Send notifications for high-risk tasks.
         """
-        async with SessionLocal() as session:
-            # Get all non-completed tasks
-            result = await session.execute(
-                select(Task).where(Task.status.in_(['To Do', 'In Progress']))
-            )
-            tasks = result.scalars().all()
-            
-            high_risk_count = 0
-            medium_risk_count = 0
-            notifications_sent = 0
-            
-            for task in tasks:
-                old_risk = task.risk_level
-                new_risk = self.calculate_task_risk(task)
-                
-                # Update risk level if changed
-                if old_risk != new_risk:
-                    task.risk_level = new_risk
-                    
-                    # Send notification if risk increased to high
-                    if new_risk == 'high' and old_risk != 'high' and task.assignee_id:
-                        await notification_service.create_notification(
-                            user_id=task.assignee_id,
-                            notification_type='task_at_risk',
-                            title='⚠️ Task At Risk',
-                            message=f'Task "{task.title}" is at high risk of delay',
-                            link='/task-board'
-                        )
-                        notifications_sent += 1
-                
-                if new_risk == 'high':
-                    high_risk_count += 1
-                elif new_risk == 'medium':
-                    medium_risk_count += 1
-            
-            await session.commit()
-            
-            return {
-                'tasks_scanned': len(tasks),
-                'high_risk': high_risk_count,
-                'medium_risk': medium_risk_count,
-                'notifications_sent': notifications_sent
-            }
+        return await self.scan_task_risks()
 
     async def get_project_risks(self, project_id: str) -> dict:
         """Get risk summary for a project"""
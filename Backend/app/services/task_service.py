@@ -1,10 +1,13 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import and_
+from sqlalchemy import and_, update, func
 from app.models.task import Task
 from app.config.database import SessionLocal
 from datetime import datetime
 
+# Upper bound on ids per IN (...) list, well below SQLite's bound parameter limit
+BULK_CHUNK_SIZE = 500
+
 class TaskService:
     async def get_tasks_for_user_in_project(self, project_id: str, user_id: str) -> list:
         async with SessionLocal() as session:
@@ -94,12 +97,12 @@ class TaskService:
                 # Create notification for next task assignment
                 if next_task:
                     from app.services.notification_service import notification_service
-                    await notification_service.create_notification(
+                    await notification_service.queue_notification(
                         user_id=user_id_int,
                         notification_type="task_assigned",
                         title="New Task Assigned",
                         message=f"You've been assigned: {next_task.title}",
-                        link=f"/task-board"
+                        link=f"/task-board?task={next_task.id}"
                     )
                 
                 return {
@@ -163,38 +166,83 @@ class TaskService:
     
     async def bulk_assign_tasks(self, task_ids: list[str], assigned_to: int) -> dict:
         """Assign multiple tasks to a user at once"""
-        success_count = 0
-        failed_count = 0
+        return await self.bulk_update_tasks([
+            {"task_ids": task_ids, "assigned_to": assigned_to}
+        ])
+
+    async def bulk_update_tasks(self, groups: list[dict]) -> dict:
+        """
+        Apply change groups to many tasks at once.
+        Each group is {"task_ids": [...], <field>: <value>, ...} where the fields are
+        assigned_to, status, due_date, estimate_hours and progress_percentage.
+        Every group runs as one UPDATE ... WHERE id IN (...) per chunk of ids, and
+        risk levels of the touched tasks are recomputed in the same transaction.
+        """
+        from app.services.risk_service import risk_service
+        from app.services.project_cache import project_tree_cache
+
+        touched_ids = set()
+        touched_projects = set()
         failed_tasks = []
-        
+
         async with SessionLocal() as session:
-            for task_id in task_ids:
-                try:
-                    # task_id is now a string (String(36))
-                    task_id_str = str(task_id)
-                    
-                    result = await session.execute(
-                        select(Task).where(Task.id == task_id_str)
-                    )
-                    task = result.scalars().first()
-                    
-                    if task:
-                        task.assignee_id = assigned_to
-                        success_count += 1
-                    else:
-                        failed_count += 1
-                        failed_tasks.append({"task_id": str(task_id), "reason": "Task not found"})
-                
-                except Exception as e:
-                    failed_count += 1
-                    failed_tasks.append({"task_id": str(task_id), "reason": str(e)})
-            
-            await session.commit()
-        
+            async with session.begin():
+                for group in groups:
+                    task_ids = list(dict.fromkeys(str(task_id) for task_id in group.get('task_ids', [])))
+                    try:
+                        values = self._bulk_values(group)
+                    except ValueError as e:
+                        failed_tasks.extend({"task_id": task_id, "reason": str(e)} for task_id in task_ids)
+                        continue
+
+                    for start in range(0, len(task_ids), BULK_CHUNK_SIZE):
+                        chunk = task_ids[start:start + BULK_CHUNK_SIZE]
+                        result = await session.execute(
+                            update(Task.__table__)
+                            .where(Task.__table__.c.id.in_(chunk))
+                            .values(**values)
+                            .returning(Task.__table__.c.id, Task.__table__.c.project_id)
+                        )
+                        updated = set()
+                        for row in result:
+                            updated.add(row.id)
+                            touched_projects.add(row.project_id)
+
+                        touched_ids.update(updated)
+                        failed_tasks.extend(
+                            {"task_id": task_id, "reason": "Task not found"}
+                            for task_id in chunk if task_id not in updated
+                        )
+
+                await risk_service.recompute_task_risks(session, list(touched_ids))
+                project_tree_cache.mark_dirty(session, touched_projects)
+
         return {
-            "success_count": success_count,
-            "failed_count": failed_count,
+            "success_count": len(touched_ids),
+            "failed_count": len(failed_tasks),
             "failed_tasks": failed_tasks
         }
 
+    def _bulk_values(self, group: dict) -> dict:
+        """Map a bulk change group onto task column values"""
+        values = {}
+        if group.get('assigned_to') is not None:
+            values['assignee_id'] = group['assigned_to']
+        if group.get('status') is not None:
+            values['status'] = group['status']
+        if group.get('due_date') is not None:
+            try:
+                values['due_date'] = datetime.fromisoformat(group['due_date'].replace('Z', '+00:00'))
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid due_date: {group['due_date']}")
+        if group.get('estimate_hours') is not None:
+            values['estimate_hours'] = group['estimate_hours']
+        if group.get('progress_percentage') is not None:
+            values['progress_percentage'] = max(0, min(100, group['progress_percentage']))
+
+        if not values:
+            raise ValueError("No changes given")
+        values['updated_at'] = func.now()
+        return values
+
 task_service = TaskService()
@@ -0,0 +1,87 @@
+"""
+Typing indicator throttle.
+
+Clients send a typing event per keystroke; only transitions reach the
+channel. The first event for a (user, channel) emits a start, further events
+just push its expiry TYPING_TTL_SECONDS out, and a timer wheel advanced
+every TYPING_TICK_SECONDS emits the stop once the state expires. Explicit
+stops take effect on the next tick, so stop-then-type within a tick sends
+nothing.
+"""
+from starlette.config import Config
+import asyncio
+import logging
+import math
+
+logger = logging.getLogger(__name__)
+
+config = Config(".env")
+TYPING_TTL_SECONDS = config("TYPING_TTL_SECONDS", cast=float, default=5)
+TYPING_TICK_SECONDS = config("TYPING_TICK_SECONDS", cast=float, default=0.5)
+
+
+class TypingThrottle:
+    def __init__(self, emit, ttl: float = TYPING_TTL_SECONDS, tick: float = TYPING_TICK_SECONDS):
+        """emit(user_id, channel_id, is_typing) is awaited for every start and stop"""
+        self.emit = emit
+        self.tick = tick
+        self.ttl_ticks = max(1, math.ceil(ttl / tick))
+        # Deadlines are at most ttl_ticks ahead, so one extra slot keeps them from wrapping
+        self._slots = [set() for _ in range(self.ttl_ticks + 1)]
+        self._now = 0
+        # (user_id, channel_id) -> tick at which typing expires; slots may hold stale keys
+        self._deadlines = {}
+        self._task = None
+        self.metrics = {
+            'events': 0,
+            'starts': 0,
+            'stops': 0,
+            'suppressed': 0,
+        }
+
+    def _schedule(self, key: tuple, deadline: int):
+        if self._deadlines.get(key) == deadline:
+            return
+        self._deadlines[key] = deadline
+        self._slots[deadline % len(self._slots)].add(key)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="typing-wheel")
+
+    async def update(self, user_id: int, channel_id: int, is_typing: bool = True):
+        """Record a typing event; emits only when the user starts typing in the channel"""
+        self.metrics['events'] += 1
+        key = (user_id, channel_id)
+        active = key in self._deadlines
+        if is_typing:
+            self._schedule(key, self._now + self.ttl_ticks)
+            if not active:
+                self.metrics['starts'] += 1
+                await self.emit(user_id, channel_id, True)
+                return
+        elif active:
+            self._schedule(key, self._now + 1)
+        self.metrics['suppressed'] += 1
+
+    def drop_user(self, user_id: int):
+        """Stop the user's typing everywhere on the next tick (their last socket closed)"""
+        for key in [key for key in self._deadlines if key[0] == user_id]:
+            self._schedule(key, self._now + 1)
+
+    async def _run(self):
+        while self._deadlines:
+            await asyncio.sleep(self.tick)
+            self._now += 1
+            slot = self._slots[self._now % len(self._slots)]
+            expired = [key for key in slot if self._deadlines.get(key) == self._now]
+            slot.clear()
+            for key in expired:
+                del self._deadlines[key]
+                self.metrics['stops'] += 1
+                try:
+                    await self.emit(key[0], key[1], False)
+                except Exception as e:
+                    logger.error(f"❌ Failed to send typing stop for user {key[0]}: {e}")
+        self._task = None
+
+    def stats(self) -> dict:
+        return {**self.metrics, 'active': len(self._deadlines)}
@@ -1,30 +1,278 @@
 from fastapi import WebSocket
-from typing import Dict, List, Set
+from typing import Callable, Dict, List, Set
+from starlette.config import Config
+import asyncio
 import json
+import logging
+import time
 from datetime import datetime
+from app.services.presence_store import PresenceStore, PRESENCE_OFFLINE_GRACE_SECONDS, PRESENCE_BATCH_MS
+from app.services.backplane import InProcessBackplane, create_backplane
+from app.services.presence_registry import LocalPresenceRegistry, RedisPresenceRegistry
+from app.services.typing_throttle import TypingThrottle
+from app.config.database import SessionLocal
+from app.models.message import ChannelMember
+from app.models.organization import OrganizationMember
+from app.models.user import User
+from sqlalchemy import select
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+config = Config(".env")
+# Frames a connection may have waiting before it is treated as a slow consumer
+WS_SEND_QUEUE_SIZE = config("WS_SEND_QUEUE_SIZE", cast=int, default=256)
+# Close code for sockets disconnected for falling behind ("Try Again Later")
+SLOW_CONSUMER_CLOSE_CODE = 1013
+# Server pings every interval; a socket that sends nothing for the timeout is reaped
+WS_HEARTBEAT_INTERVAL_SECONDS = config("WS_HEARTBEAT_INTERVAL_SECONDS", cast=float, default=25)
+WS_HEARTBEAT_TIMEOUT_SECONDS = config("WS_HEARTBEAT_TIMEOUT_SECONDS", cast=float, default=60)
+# Application close code for sockets that missed their heartbeats
+HEARTBEAT_TIMEOUT_CLOSE_CODE = 4408
+
+
+def encode_frame(message: dict) -> str:
+    """Encode a frame once so it can be sent as-is to every recipient"""
+    if orjson is not None:
+        return orjson.dumps(message).decode()
+    # Same compact form Starlette's send_json produces
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+class ConnectionWriter:
+    """Bounded queue of encoded frames for one socket, drained by its own task"""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        user_id: int,
+        max_queue: int = WS_SEND_QUEUE_SIZE,
+        on_failed=None,
+        held: bool = False
+    ):
+        """
+        on_failed(writer) is called once when a send fails. A held writer queues
+        frames but sends nothing until release(), so a first frame can go out ahead of them.
+        """
+        self.websocket = websocket
+        self.user_id = user_id
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.sent = 0
+        self.on_failed = on_failed
+        # Monotonic time of the last frame received from the client
+        self.last_seen = time.monotonic()
+        self._first_frame = None
+        self._released = asyncio.Event()
+        self._first_sent = asyncio.Event()
+        if not held:
+            self._released.set()
+            self._first_sent.set()
+        self._task = asyncio.create_task(self._run())
+
+    def release(self, first_frame: str = None):
+        """Start sending a held writer's queue, preceded by first_frame"""
+        if self._released.is_set():
+            return
+        self._first_frame = first_frame
+        self._released.set()
+
+    def offer(self, frame: str) -> bool:
+        """Queue a frame without waiting; False when the queue is full"""
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    async def _send(self, frame: str) -> bool:
+        try:
+            await self.websocket.send_text(frame)
+            self.sent += 1
+            return True
+        except Exception:
+            # The socket is gone; don't wait for its receive loop to notice
+            if self.on_failed:
+                self.on_failed(self)
+            return False
+
+    async def _run(self):
+        await self._released.wait()
+        try:
+            if self._first_frame is not None and not await self._send(self._first_frame):
+                return
+        finally:
+            self._first_sent.set()
+        while True:
+            frame = await self.queue.get()
+            try:
+                if not await self._send(frame):
+                    return
+            finally:
+                self.queue.task_done()
+
+    async def drain(self):
+        if self._task.done() or not self._released.is_set():
+            return
+        await self._first_sent.wait()
+        if not self._task.done():
+            await self.queue.join()
+
+    def stop(self):
+        self._task.cancel()
+
 
 class ConnectionManager:
     def __init__(self):
         # user_id -> list of WebSocket connections
         self.active_connections: Dict[int, List[WebSocket]] = {}
-        # channel_id -> set of user_ids
+        # channel_id -> set of online user_ids; only users with an open socket are tracked
         self.channel_members: Dict[int, Set[int]] = {}
+        # user_id -> channel_ids, for dropping a user's memberships when they go away
+        self.user_channels: Dict[int, Set[int]] = {}
+        # organization_id -> set of online user_ids; presence is only shared within an organization
+        self.org_members: Dict[str, Set[int]] = {}
+        # user_id -> organization_ids; kept until the user goes offline so the offline change reaches them
+        self.user_orgs: Dict[int, Set[str]] = {}
+        # user_id -> username and avatar_url sent with their presence changes; kept as long as user_orgs
+        self.user_profiles: Dict[int, dict] = {}
+        # organization_id -> {user_id: change} accumulated until the next presence tick
+        self._presence_diff: Dict[str, Dict[int, dict]] = {}
+        self._presence_flush_task = None
+        self.presence_batch_seconds = PRESENCE_BATCH_MS / 1000
+        self.heartbeat_interval = WS_HEARTBEAT_INTERVAL_SECONDS
+        self.heartbeat_timeout = WS_HEARTBEAT_TIMEOUT_SECONDS
+        self._heartbeat_task = None
+        # Coalesces per-keystroke typing events into start/stop transitions
+        self.typing = TypingThrottle(self._send_typing)
+        # In-memory presence, flushed to user_presence in batches
+        self.presence = PresenceStore()
+        self.offline_grace_seconds = PRESENCE_OFFLINE_GRACE_SECONDS
+        # user_id -> task that marks the user offline once the grace period ends
+        self._pending_offline: Dict[int, asyncio.Task] = {}
+        # websocket -> its outbound queue and writer task
+        self._writers: Dict[WebSocket, ConnectionWriter] = {}
+        self.send_queue_size = WS_SEND_QUEUE_SIZE
+        self.send_metrics = {
+            'frames_queued': 0,
+            'frames_dropped': 0,
+            'slow_consumers_disconnected': 0,
+            'pings_sent': 0,
+            'reaped_send_failed': 0,
+            'reaped_heartbeat': 0,
+            'presence_changes': 0,
+            'presence_batches': 0,
+        }
+        # Fan-out goes through the backplane so every worker reaches its own sockets
+        self.backplane = InProcessBackplane(self.deliver)
+        # Who is online on any worker; decides the online and offline transitions
+        self.registry = LocalPresenceRegistry()
+        # Users this worker has registered: from their first socket until the offline grace ends
+        self._registered: Set[int] = set()
+        # target -> handler for events other services share through the backplane
+        self._event_handlers: Dict[str, Callable[[dict], None]] = {}
+
+    async def start_backplane(self, url: str = None):
+        """Switch to the configured backplane (Redis when WS_BACKPLANE_URL is set)"""
+        backplane = create_backplane(self.deliver) if url is None else create_backplane(self.deliver, url)
+        await self.use_backplane(backplane)
 
-    async def connect(self, websocket: WebSocket, user_id: int):
-        """Connect a user's websocket"""
+    async def use_backplane(self, backplane):
+        """Start a backplane; a Redis one also shares presence through the same Redis"""
+        self.backplane = backplane
+        if backplane.distributed:
+            self.registry = RedisPresenceRegistry(backplane.client, backplane.worker_id)
+        await self.registry.start()
+        await self.backplane.start()
+
+    async def stop_backplane(self):
+        await self.registry.stop()
+        await self.backplane.stop()
+        self.backplane = InProcessBackplane(self.deliver)
+        self.registry = LocalPresenceRegistry()
+
+    def deliver(self, event: dict):
+        """Apply a backplane event to the sockets held by this worker"""
+        target = event['target']
+        if target == 'user':
+            self.send_frame(event['frame'], event['user_id'])
+        elif target == 'channel':
+            exclude_user = event.get('exclude_user')
+            for user_id in list(self.channel_members.get(event['channel_id'], ())):
+                if user_id != exclude_user:
+                    self.send_frame(event['frame'], user_id)
+        elif target == 'organization':
+            for user_id in list(self.org_members.get(event['organization_id'], ())):
+                self.send_frame(event['frame'], user_id)
+        elif target == 'join':
+            self.join_channel(event['user_id'], event['channel_id'])
+        elif target == 'leave':
+            self.leave_channel(event['user_id'], event['channel_id'])
+        elif target in self._event_handlers:
+            self._event_handlers[target](event)
+        else:
+            logger.warning(f"⚠️  Unknown backplane target: {target}")
+
+    def on_event(self, target: str, handler: Callable[[dict], None]):
+        """Apply backplane events with this target, from every worker, with handler"""
+        self._event_handlers[target] = handler
+
+    async def publish(self, event: dict):
+        """Publish an event for on_event handlers on every worker, this one included"""
+        await self.backplane.publish(event)
+
+    async def connect(self, websocket: WebSocket, user_id: int, hold: bool = False):
+        """
+        Connect a user's websocket. With hold=True frames for it are queued but not
+        sent until start_sending(), which can put a first frame ahead of them.
+        """
         await websocket.accept()
+        self._writers[websocket] = ConnectionWriter(
+            websocket, user_id, self.send_queue_size, on_failed=self._reap_failed_send, held=hold
+        )
         if user_id not in self.active_connections:
             self.active_connections[user_id] = []
         self.active_connections[user_id].append(websocket)
-        
-        # Update user presence
+
+        # Memberships are loaded by the user's first socket and shared by the rest
+        if len(self.active_connections[user_id]) == 1:
+            await self.load_memberships(user_id)
+
+        # A reconnect within the grace period cancels the pending offline transition
+        pending = self._pending_offline.pop(user_id, None)
+        if pending:
+            pending.cancel()
+
+        if user_id in self._registered:
+            return  # Another socket, or a reconnect within the grace period
+        self._registered.add(user_id)
+        came_online = await self.registry.add(user_id)
         await self.update_presence(user_id, 'online')
-        
-        # Notify others that user is online
-        await self.broadcast_presence_update(user_id, 'online')
+        if came_online:
+            # Notify the user's organizations with the next presence batch
+            self.queue_presence_change(user_id, 'online', self.user_orgs.get(user_id, ()))
+
+    def start_sending(self, websocket: WebSocket, first_message: dict = None):
+        """Release a socket connected with hold=True, sending first_message before anything queued"""
+        writer = self._writers.get(websocket)
+        if writer is None:
+            return
+        if first_message is not None:
+            self.send_metrics['frames_queued'] += 1
+        writer.release(encode_frame(first_message) if first_message is not None else None)
 
     def disconnect(self, websocket: WebSocket, user_id: int):
-        """Disconnect a user's websocket"""
+        """
+        Disconnect a user's websocket. When it was the user's last one they are
+        marked offline after the grace period, unless they reconnect first.
+        """
+        writer = self._writers.pop(websocket, None)
+        if writer:
+            writer.stop()
+
         if user_id in self.active_connections:
             if websocket in self.active_connections[user_id]:
                 self.active_connections[user_id].remove(websocket)
@@ -32,76 +280,266 @@ class ConnectionManager:
             # If no more connections, mark as offline
             if not self.active_connections[user_id]:
                 del self.active_connections[user_id]
+                self._drop_channels(user_id)
+                self._drop_organizations(user_id)
+                self.typing.drop_user(user_id)
+                if user_id not in self._pending_offline:
+                    self._pending_offline[user_id] = asyncio.create_task(self._offline_after_grace(user_id))
 
-    async def send_personal_message(self, message: dict, user_id: int):
-        """Send message to a specific user"""
+    async def _offline_after_grace(self, user_id: int):
+        await asyncio.sleep(self.offline_grace_seconds)
+        self._pending_offline.pop(user_id, None)
         if user_id in self.active_connections:
-            for connection in self.active_connections[user_id]:
-                try:
-                    await connection.send_json(message)
-                except:
-                    pass  # Connection might be closed
+            return
+        self._registered.discard(user_id)
+        went_offline = await self.registry.remove(user_id)
+        if user_id in self.active_connections:
+            # Reconnected while the registry was updated; make sure it still lists this worker
+            await self.registry.add(user_id)
+            return
+        organization_ids = self.user_orgs.pop(user_id, ())
+        if not went_offline:
+            # Still connected to another worker, which owns their presence now
+            self.user_profiles.pop(user_id, None)
+            self.presence.forget(user_id)
+            return
+        if await self.update_presence(user_id, 'offline'):
+            self.queue_presence_change(user_id, 'offline', organization_ids)
+        self.user_profiles.pop(user_id, None)
+
+    async def send_personal_message(self, message: dict, user_id: int):
+        """Queue a message for each of a user's connections on every worker"""
+        await self.backplane.publish({'target': 'user', 'user_id': user_id, 'frame': encode_frame(message)})
+
+    def send_frame(self, frame: str, user_id: int):
+        """Queue an already encoded frame for each of this worker's connections of a user"""
+        for connection in list(self.active_connections.get(user_id, ())):
+            writer = self._writers.get(connection)
+            if writer is None:
+                continue
+            if writer.offer(frame):
+                self.send_metrics['frames_queued'] += 1
+            else:
+                self.send_metrics['frames_dropped'] += 1
+                self._disconnect_slow_consumer(connection, user_id)
+
+    def _disconnect_slow_consumer(self, websocket: WebSocket, user_id: int):
+        """Drop a connection whose outbound queue overflowed"""
+        self.send_metrics['slow_consumers_disconnected'] += 1
+        logger.warning(f"⚠️  Disconnecting slow WebSocket consumer for user {user_id}")
+        self.disconnect(websocket, user_id)
+        asyncio.create_task(self._close_quietly(websocket, SLOW_CONSUMER_CLOSE_CODE))
+
+    def _reap_failed_send(self, writer: ConnectionWriter):
+        if self._writers.get(writer.websocket) is not writer:
+            return  # Already disconnected
+        self.send_metrics['reaped_send_failed'] += 1
+        logger.info(f"Reaping WebSocket for user {writer.user_id} after a failed send")
+        self.disconnect(writer.websocket, writer.user_id)
+
+    def touch(self, websocket: WebSocket):
+        """Record that the client sent something; any frame counts as a heartbeat"""
+        writer = self._writers.get(websocket)
+        if writer:
+            writer.last_seen = time.monotonic()
+
+    async def heartbeat(self):
+        """Reap sockets silent for longer than the timeout, then ping the rest"""
+        cutoff = time.monotonic() - self.heartbeat_timeout
+        for writer in list(self._writers.values()):
+            if writer.last_seen < cutoff:
+                self.send_metrics['reaped_heartbeat'] += 1
+                logger.info(f"Reaping WebSocket for user {writer.user_id} after missed heartbeats")
+                self.disconnect(writer.websocket, writer.user_id)
+                asyncio.create_task(self._close_quietly(writer.websocket, HEARTBEAT_TIMEOUT_CLOSE_CODE))
+
+        frame = encode_frame({'type': 'ping', 'timestamp': datetime.utcnow().isoformat()})
+        for user_id in list(self.active_connections.keys()):
+            self.send_frame(frame, user_id)
+            self.send_metrics['pings_sent'] += len(self.active_connections.get(user_id, ()))
+
+    async def _heartbeat_loop(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await self.heartbeat()
+            except Exception as e:
+                logger.error(f"❌ WebSocket heartbeat failed: {e}")
+
+    def start_heartbeats(self):
+        if self._heartbeat_task is None:
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop(), name="ws-heartbeat")
+
+    async def stop_heartbeats(self):
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            await asyncio.gather(self._heartbeat_task, return_exceptions=True)
+            self._heartbeat_task = None
+
+    async def _close_quietly(self, websocket: WebSocket, code: int):
+        try:
+            await websocket.close(code=code)
+        except Exception:
+            pass  # Already closed
+
+    async def drain(self):
+        """Wait until every queued frame has been handed to its socket"""
+        await asyncio.gather(*(writer.drain() for writer in list(self._writers.values())))
+
+    def send_stats(self) -> dict:
+        depths = [writer.queue.qsize() for writer in self._writers.values()]
+        return {
+            **self.send_metrics,
+            'connections': len(depths),
+            'queued_frames': sum(depths),
+            'max_queue_depth': max(depths, default=0),
+        }
 
     async def broadcast_to_channel(self, message: dict, channel_id: int, exclude_user: int = None):
         """Broadcast message to all users in a channel"""
-        if channel_id in self.channel_members:
-            for user_id in self.channel_members[channel_id]:
-                if exclude_user and user_id == exclude_user:
-                    continue
-                await self.send_personal_message(message, user_id)
-
-    async def broadcast_presence_update(self, user_id: int, status: str):
-        """Broadcast user presence update to all connected users"""
-        message = {
-            'type': 'presence_update',
+        if not self.backplane.distributed and channel_id not in self.channel_members:
+            return
+        await self.backplane.publish({
+            'target': 'channel',
+            'channel_id': channel_id,
+            'exclude_user': exclude_user,
+            'frame': encode_frame(message)
+        })
+
+    async def _send_typing(self, user_id: int, channel_id: int, is_typing: bool):
+        typing_data = {
+            'type': 'typing',
+            'user_id': user_id,
+            'channel_id': channel_id,
+            'is_typing': is_typing
+        }
+        await self.broadcast_to_channel(typing_data, channel_id, exclude_user=user_id)
+
+    def queue_presence_change(self, user_id: int, status: str, organization_ids):
+        """Add a presence change to the pending diff of each organization; the last status per tick wins"""
+        profile = self.user_profiles.get(user_id, {})
+        # Carries what the online list shows so clients can apply it without refetching
+        change = {
             'user_id': user_id,
             'status': status,
-            'timestamp': datetime.utcnow().isoformat()
+            'username': profile.get('username'),
+            'avatar_url': profile.get('avatar_url'),
         }
-        
-        # Send to all connected users
-        for uid in list(self.active_connections.keys()):
-            if uid != user_id:
-                await self.send_personal_message(message, uid)
-
-    async def update_presence(self, user_id: int, status: str):
-        """Update user presence in database"""
-        from app.config.database import SessionLocal
-        from app.models.message import UserPresence
-        from sqlalchemy.future import select
-        
-        async with SessionLocal() as session:
-            result = await session.execute(
-                select(UserPresence).where(UserPresence.user_id == user_id)
-            )
-            presence = result.scalars().first()
-            
-            if presence:
-                presence.status = status
-                presence.last_seen = datetime.utcnow()
-            else:
-                presence = UserPresence(
-                    user_id=user_id,
-                    status=status,
-                    last_seen=datetime.utcnow()
+        for organization_id in organization_ids:
+            self._presence_diff.setdefault(organization_id, {})[user_id] = change
+            self.send_metrics['presence_changes'] += 1
+        if self._presence_diff and self._presence_flush_task is None:
+            self._presence_flush_task = asyncio.create_task(self._flush_presence_after_tick())
+
+    async def _flush_presence_after_tick(self):
+        await asyncio.sleep(self.presence_batch_seconds)
+        self._presence_flush_task = None
+        await self.flush_presence()
+
+    async def flush_presence(self):
+        """Send each organization its pending changes as one presence_batch frame"""
+        diff, self._presence_diff = self._presence_diff, {}
+        timestamp = datetime.utcnow().isoformat()
+        for organization_id, changes in diff.items():
+            if not self.backplane.distributed and organization_id not in self.org_members:
+                continue
+            message = {
+                'type': 'presence_batch',
+                'organization_id': organization_id,
+                'changes': list(changes.values()),
+                'timestamp': timestamp
+            }
+            self.send_metrics['presence_batches'] += 1
+            await self.backplane.publish({
+                'target': 'organization',
+                'organization_id': organization_id,
+                'frame': encode_frame(message)
+            })
+
+    async def update_presence(self, user_id: int, status: str) -> bool:
+        """Record user presence; written to the database by the next presence flush"""
+        return self.presence.set(user_id, status)
+
+    async def load_memberships(self, user_id: int):
+        """Load the user's channels, organizations and profile, one query each"""
+        try:
+            async with SessionLocal() as session:
+                result = await session.execute(
+                    select(ChannelMember.channel_id).where(ChannelMember.user_id == user_id)
                 )
-                session.add(presence)
-            
-            await session.commit()
+                channel_ids = list(result.scalars())
+                result = await session.execute(
+                    select(OrganizationMember.organization_id).where(OrganizationMember.user_id == user_id)
+                )
+                organization_ids = set(result.scalars())
+                result = await session.execute(
+                    select(User.username, User.avatar_url).where(User.id == user_id)
+                )
+                profile = result.first()
+        except Exception as e:
+            logger.error(f"❌ Failed to load memberships for user {user_id}: {e}")
+            return
+        if user_id not in self.active_connections:
+            return  # Disconnected while loading
+        for channel_id in channel_ids:
+            self.join_channel(user_id, channel_id)
+        self.user_orgs[user_id] = organization_ids
+        if profile is not None:
+            self.user_profiles[user_id] = {'username': profile.username, 'avatar_url': profile.avatar_url}
+        for organization_id in organization_ids:
+            self.org_members.setdefault(organization_id, set()).add(user_id)
+
+    def _drop_organizations(self, user_id: int):
+        for organization_id in self.user_orgs.get(user_id, ()):
+            members = self.org_members.get(organization_id)
+            if members is not None:
+                members.discard(user_id)
+                if not members:
+                    del self.org_members[organization_id]
+
+    def _drop_channels(self, user_id: int):
+        for channel_id in self.user_channels.pop(user_id, ()):
+            members = self.channel_members.get(channel_id)
+            if members is not None:
+                members.discard(user_id)
+                if not members:
+                    del self.channel_members[channel_id]
+
+    async def channel_joined(self, user_id: int, channel_id: int):
+        """Track a new membership on whichever workers hold the user's sockets"""
+        await self.backplane.publish({'target': 'join', 'user_id': user_id, 'channel_id': channel_id})
+
+    async def channel_left(self, user_id: int, channel_id: int):
+        await self.backplane.publish({'target': 'leave', 'user_id': user_id, 'channel_id': channel_id})
 
     def join_channel(self, user_id: int, channel_id: int):
-        """Add user to channel"""
+        """Add user to channel; ignored for users without an open socket"""
+        if user_id not in self.active_connections:
+            return
         if channel_id not in self.channel_members:
             self.channel_members[channel_id] = set()
         self.channel_members[channel_id].add(user_id)
+        self.user_channels.setdefault(user_id, set()).add(channel_id)
 
     def leave_channel(self, user_id: int, channel_id: int):
         """Remove user from channel"""
         if channel_id in self.channel_members:
             self.channel_members[channel_id].discard(user_id)
+            if not self.channel_members[channel_id]:
+                del self.channel_members[channel_id]
+        if user_id in self.user_channels:
+            self.user_channels[user_id].discard(channel_id)
+
+    def is_connected(self, user_id: int) -> bool:
+        """Whether the user may have a socket; with a distributed backplane it may be on another worker"""
+        return self.backplane.distributed or user_id in self.active_connections
 
     def get_online_users(self) -> List[int]:
-        """Get list of currently online user IDs"""
+        """Get list of user IDs connected to this worker"""
         return list(self.active_connections.keys())
 
+    async def online_users(self, user_ids) -> List[int]:
+        """The given users that are online on any worker"""
+        return await self.registry.online(user_ids)
+
 manager = ConnectionManager()
@@ -0,0 +1,104 @@
+"""
+Benchmark keyset paging of channel history against OFFSET paging.
+
+Seeds one channel with 1,000,000 messages (configurable) in a throwaway
+SQLite database, then times fetching a 50-message page at increasing
+depths with the before_id cursor and with an equivalent OFFSET query.
+Run with: python benchmarks/bench_chat_pagination.py [message_count]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "bench_chat.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+os.environ.setdefault("JWT_SECRET_KEY", "bench")
+
+from fastapi import Response
+from sqlalchemy import insert, select, desc
+
+from app.config.database import engine, SessionLocal
+from app.models.user import Base, User
+from app.models.message import Message, Channel
+from app.models.organization import Organization
+from app.api.v1.chat import get_channel_messages
+
+BATCH_SIZE = 50000
+PAGE_SIZE = 50
+CHANNEL_ID = 1
+
+
+async def seed(message_count: int):
+    async with SessionLocal() as session:
+        await session.execute(insert(User.__table__), [{"id": 1, "username": "bench", "email": "bench@example.com"}])
+        await session.execute(insert(Channel.__table__), [{"id": CHANNEL_ID, "name": "bench", "created_by": 1}])
+        for start in range(0, message_count, BATCH_SIZE):
+            rows = [
+                {"sender_id": 1, "channel_id": CHANNEL_ID, "content": f"message {i}"}
+                for i in range(start, min(message_count, start + BATCH_SIZE))
+            ]
+            await session.execute(insert(Message.__table__), rows)
+        await session.commit()
+
+
+async def keyset_page(before_id):
+    return await get_channel_messages(
+        channel_id=CHANNEL_ID,
+        response=Response(),
+        limit=PAGE_SIZE,
+        search=None,
+        before_id=before_id,
+        after_id=None,
+        cursor=None,
+        current_user={"id": 1}
+    )
+
+
+async def offset_page(offset: int):
+    async with SessionLocal() as session:
+        result = await session.execute(
+            select(Message)
+            .where(Message.channel_id == CHANNEL_ID)
+            .order_by(desc(Message.id))
+            .offset(offset)
+            .limit(PAGE_SIZE)
+        )
+        return result.scalars().all()
+
+
+async def timed(coro_factory, repeat: int = 5) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await coro_factory()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+async def main():
+    message_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all,
+            tables=[User.__table__, Channel.__table__, Message.__table__]
+        )
+
+    print(f"Seeding {message_count} messages...")
+    await seed(message_count)
+
+    print(f"{'depth':>10} {'keyset ms':>10} {'offset ms':>10}")
+    for depth in (0, message_count // 100, message_count // 10, message_count // 2, message_count - PAGE_SIZE):
+        before_id = message_count - depth + 1 if depth else None
+        keyset_ms = await timed(lambda: keyset_page(before_id))
+        offset_ms = await timed(lambda: offset_page(depth))
+        print(f"{depth:>10} {keyset_ms:>10.2f} {offset_ms:>10.2f}")
+
+    await engine.dispose()
+    os.remove(DB_PATH)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
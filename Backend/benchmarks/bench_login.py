@@ -0,0 +1,71 @@
+"""
+Benchmark password verification throughput and event-loop lag under concurrent logins.
+
+Runs N concurrent "logins" (a bcrypt check of a stored hash, the expensive
+part of /auth/login) while a ticker task measures how late the event loop
+wakes it up:
+
+  inline    verify_password called from the coroutine (blocks the loop)
+  executor  verify_password_async on the bcrypt thread pool
+
+Run with: python benchmarks/bench_login.py [concurrent logins] [rounds]
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.auth_service import AuthService, BCRYPT_MAX_WORKERS
+
+TICK_SECONDS = 0.005
+PASSWORD = "correct horse battery staple"
+
+
+async def measure_lag(stop: asyncio.Event, samples: list):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + TICK_SECONDS
+        await asyncio.sleep(TICK_SECONDS)
+        samples.append(max(0.0, loop.time() - expected))
+
+
+async def run(label: str, login, hashed: str, count: int):
+    stop = asyncio.Event()
+    samples = []
+    ticker = asyncio.create_task(measure_lag(stop, samples))
+    await asyncio.sleep(TICK_SECONDS * 2)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(login(PASSWORD, hashed) for _ in range(count)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+
+    assert all(results)
+    samples.sort()
+    p99 = samples[int(len(samples) * 0.99) - 1] if samples else 0.0
+    print(
+        f"{label:>9} {count / elapsed:>12.1f} {elapsed * 1000:>10.0f} "
+        f"{p99 * 1000:>12.1f} {max(samples, default=0.0) * 1000:>12.1f}"
+    )
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+    service = AuthService(rounds=rounds)
+    hashed = service.get_password_hash(PASSWORD)
+
+    async def inline(password, hashed_password):
+        return service.verify_password(password, hashed_password)
+
+    print(f"{count} concurrent logins, bcrypt cost {rounds}, {BCRYPT_MAX_WORKERS} hashing threads")
+    print(f"{'mode':>9} {'logins/s':>12} {'total ms':>10} {'p99 lag ms':>12} {'max lag ms':>12}")
+    await run("inline", inline, hashed, count)
+    await run("executor", service.verify_password_async, hashed, count)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
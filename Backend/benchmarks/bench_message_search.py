@@ -0,0 +1,103 @@
+"""
+Benchmark full-text message search against the old LIKE scan.
+
+Seeds 200,000 messages (configurable) across a joined channel and DMs in a
+throwaway SQLite database, builds the FTS5 index, then times a search
+through MessageSearchService and the equivalent LIKE '%q%' query.
+Run with: python benchmarks/bench_message_search.py [message_count]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "bench_search.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+
+from sqlalchemy import insert, select, desc, and_, or_
+
+from app.config.database import engine, SessionLocal
+from app.models.user import Base, User
+from app.models.message import Message, Channel, ChannelMember
+from app.models.organization import Organization
+from app.services.message_search import message_search_service, create_search_index
+
+BATCH_SIZE = 50000
+WORDS = ["deploy", "release", "review", "standup", "sprint", "bug", "design", "lunch", "merge", "ticket"]
+
+
+async def seed(message_count: int):
+    rng = random.Random(7)
+    async with SessionLocal() as session:
+        await session.execute(insert(User.__table__), [
+            {"id": 1, "username": "bench", "email": "bench@example.com"},
+            {"id": 2, "username": "peer", "email": "peer@example.com"},
+        ])
+        await session.execute(insert(Channel.__table__), [{"id": 1, "name": "bench", "created_by": 1}])
+        await session.execute(insert(ChannelMember.__table__), [{"channel_id": 1, "user_id": 1}])
+        for start in range(0, message_count, BATCH_SIZE):
+            rows = [
+                {
+                    "sender_id": 2,
+                    "channel_id": 1 if i % 4 else None,
+                    "recipient_id": None if i % 4 else 1,
+                    "content": " ".join(rng.choices(WORDS, k=8)) + f" #{i}",
+                }
+                for i in range(start, min(message_count, start + BATCH_SIZE))
+            ]
+            await session.execute(insert(Message.__table__), rows)
+        await session.commit()
+
+
+async def like_search(query: str):
+    async with SessionLocal() as session:
+        result = await session.execute(
+            select(Message).where(
+                and_(
+                    or_(Message.channel_id == 1, Message.recipient_id == 1),
+                    Message.content.contains(query)
+                )
+            ).order_by(desc(Message.created_at)).limit(20)
+        )
+        return result.scalars().all()
+
+
+async def timed(label: str, coro_factory, repeat: int = 5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await coro_factory()
+    elapsed_ms = (time.perf_counter() - start) * 1000 / repeat
+    print(f"{label:<32} {elapsed_ms:>10.2f} ms")
+
+
+async def main():
+    message_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all,
+            tables=[User.__table__, Channel.__table__, ChannelMember.__table__, Message.__table__]
+        )
+        await conn.run_sync(create_search_index)
+
+    print(f"Seeding {message_count} messages...")
+    await seed(message_count)
+
+    await timed("fts search 'review merge'", lambda: message_search_service.search(1, "review merge"))
+    await timed("fts search prefix 'stand'", lambda: message_search_service.search(1, "stand"))
+    await timed("like search 'review'", lambda: like_search("review"))
+    await timed("fts search rare '#12345'", lambda: message_search_service.search(1, "12345"))
+    await timed("like search rare '#12345'", lambda: like_search("#12345"))
+    await timed("fts search (no match)", lambda: message_search_service.search(1, "zzzz"))
+    await timed("like search (no match)", lambda: like_search("zzzz"))
+
+    await engine.dispose()
+    os.remove(DB_PATH)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
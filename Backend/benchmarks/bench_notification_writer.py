@@ -0,0 +1,57 @@
+"""
+Benchmark the batched notification writer against one session per notification.
+
+Writes 5,000 distinct notifications (configurable) to a throwaway SQLite
+database, first with create_notification (open session, commit, refresh
+per row), then through the started NotificationWriter.
+Run with: python benchmarks/bench_notification_writer.py [count]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "bench_notification_writer.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+
+from app.config.database import engine
+from app.models.user import Base, User
+from app.models.notification import Notification
+from app.models.organization import Organization
+from app.services.notification_service import notification_service
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all, tables=[User.__table__, Notification.__table__]
+        )
+
+    start = time.perf_counter()
+    for i in range(count):
+        await notification_service.create_notification(1, "task_assigned", "New Task", f"Task {i}", f"/tasks/{i}")
+    direct = time.perf_counter() - start
+    print(f"create_notification     {direct:>8.2f}s  {count / direct:>9.0f} notifications/s")
+
+    writer = notification_service.writer
+    writer.start()
+    start = time.perf_counter()
+    for i in range(count):
+        await notification_service.queue_notification(2, "task_assigned", "New Task", f"Task {i}", f"/tasks/{i}")
+    await writer.flush()
+    queued = time.perf_counter() - start
+    await writer.stop()
+    print(f"queue_notification      {queued:>8.2f}s  {count / queued:>9.0f} notifications/s")
+    print(f"writer stats            {writer.stats()}")
+
+    await engine.dispose()
+    os.remove(DB_PATH)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+"""
+Benchmark NotificationService unread counting and mark-all-read.
+
+Seeds 100,000 unread notifications for one user (plus a second user so the
+index has to discriminate), then times get_unread_count and
+mark_all_as_read against a throwaway SQLite database.
+Run with: python benchmarks/bench_notifications.py [notifications_per_user]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "bench_notifications.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+
+from sqlalchemy import insert
+
+from app.config.database import engine, SessionLocal
+from app.models.user import Base, User
+from app.models.notification import Notification
+from app.services.notification_service import notification_service
+
+BATCH_SIZE = 10000
+
+
+async def seed(user_ids: list, per_user: int):
+    async with SessionLocal() as session:
+        for user_id in user_ids:
+            for start in range(0, per_user, BATCH_SIZE):
+                rows = [
+                    {
+                        "user_id": user_id,
+                        "type": "task_assigned",
+                        "title": "New Task Assigned",
+                        "message": f"Task {i}",
+                        "link": "/task-board",
+                        "read": False,
+                    }
+                    for i in range(start, min(per_user, start + BATCH_SIZE))
+                ]
+                await session.execute(insert(Notification.__table__), rows)
+        await session.commit()
+
+
+async def timed(label: str, coro_factory, repeat: int = 1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = await coro_factory()
+    elapsed_ms = (time.perf_counter() - start) * 1000 / repeat
+    print(f"{label:<32} {elapsed_ms:>10.2f} ms   -> {result}")
+    return result
+
+
+async def main():
+    per_user = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all, tables=[User.__table__, Notification.__table__]
+        )
+
+    print(f"Seeding {per_user} notifications for 2 users...")
+    await seed([1, 2], per_user)
+
+    await timed("get_unread_count (avg of 20)", lambda: notification_service.get_unread_count(1), repeat=20)
+    await timed("mark_all_as_read", lambda: notification_service.mark_all_as_read(1))
+    await timed("get_unread_count after mark", lambda: notification_service.get_unread_count(1))
+    await timed("get_unread_count other user", lambda: notification_service.get_unread_count(2))
+
+    await engine.dispose()
+    os.remove(DB_PATH)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
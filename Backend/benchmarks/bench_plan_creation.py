@@ -0,0 +1,84 @@
+"""
+Benchmark ProjectService.create_project_from_plan for growing plan sizes.
+
+Creates plans with 10, 100 and 1,000 tasks against a throwaway SQLite
+database and reports wall time and the number of database round trips.
+Run with: python benchmarks/bench_plan_creation.py
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "bench_plan.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+
+from sqlalchemy import event
+
+from app.config.database import engine
+from app.models.user import Base, User
+from app.models.organization import Organization
+from app.services.project_service import project_service
+from app.config.database import SessionLocal
+
+TASKS_PER_STORY = 5
+STORIES_PER_EPIC = 4
+
+
+def build_plan(task_count: int) -> dict:
+    """Build a plan with exactly `task_count` tasks"""
+    stories = []
+    for story_idx in range(max(1, task_count // TASKS_PER_STORY)):
+        tasks = [
+            f"Task {story_idx}.{task_idx}"
+            for task_idx in range(min(TASKS_PER_STORY, task_count - story_idx * TASKS_PER_STORY))
+        ]
+        stories.append({"name": f"Story {story_idx}", "tasks": tasks})
+
+    epics = [
+        {"name": f"Epic {i}", "stories": stories[i:i + STORIES_PER_EPIC]}
+        for i in range(0, len(stories), STORIES_PER_EPIC)
+    ]
+    return {"project_name": f"Bench {task_count}", "description": "", "epics": epics}
+
+
+async def main():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with SessionLocal() as session:
+        owner = User(username="bench_owner", email="bench_owner@example.com")
+        session.add(owner)
+        await session.flush()
+        owner_id = owner.id
+        await session.commit()
+
+    round_trips = 0
+
+    def count_round_trip(*args, **kwargs):
+        nonlocal round_trips
+        round_trips += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_round_trip)
+
+    print(f"{'tasks':>8} {'rows':>8} {'round trips':>12} {'ms':>10}")
+    for task_count in (10, 100, 1000):
+        plan = build_plan(task_count)
+        rows = 1 + len(plan["epics"]) + sum(len(e["stories"]) for e in plan["epics"]) + task_count
+
+        round_trips = 0
+        start = time.perf_counter()
+        await project_service.create_project_from_plan(plan, owner_id)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        print(f"{task_count:>8} {rows:>8} {round_trips:>12} {elapsed_ms:>10.1f}")
+
+    await engine.dispose()
+    os.remove(DB_PATH)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
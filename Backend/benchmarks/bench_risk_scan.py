@@ -0,0 +1,87 @@
+"""
+Benchmark the chunked risk scan engine.
+
+Seeds 200,000 active tasks (configurable) with spread-out due dates and
+progress in a throwaway SQLite database, then runs
+RiskService.scan_task_risks twice: a cold scan where most levels change
+and a steady-state rescan where nothing does.
+Run with: python benchmarks/bench_risk_scan.py [task_count]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "bench_risk.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+
+from sqlalchemy import insert
+
+from app.config.database import engine, SessionLocal
+from app.models.user import Base, User
+from app.models.organization import Organization
+from app.models.project import Project
+from app.models.task import Task, generate_uuid
+from app.models.notification import Notification
+from app.services.risk_service import risk_service
+
+BATCH_SIZE = 20000
+
+
+async def seed(task_count: int):
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    async with SessionLocal() as session:
+        await session.execute(insert(User.__table__), [{"id": 1, "username": "bench", "email": "bench@example.com"}])
+        await session.execute(insert(Project.__table__), [{"id": "bench", "name": "bench", "owner_id": 1}])
+        for start in range(0, task_count, BATCH_SIZE):
+            rows = [
+                {
+                    "id": generate_uuid(),
+                    "project_id": "bench",
+                    "title": f"Task {i}",
+                    "status": rng.choice(["To Do", "In Progress"]),
+                    "assignee_id": 1 if i % 3 else None,
+                    "due_date": now + timedelta(hours=rng.randint(-72, 24 * 14)),
+                    "progress_percentage": rng.choice([0, 10, 30, 60, 90]),
+                    "risk_level": "low",
+                }
+                for i in range(start, min(task_count, start + BATCH_SIZE))
+            ]
+            await session.execute(insert(Task.__table__), rows)
+        await session.commit()
+
+
+def report(label: str, stats: dict):
+    print(
+        f"{label:<12} scanned={stats['tasks_scanned']:>8} changed={stats['risk_changes']:>8} "
+        f"notified={stats['notifications_sent']:>7} {stats['duration_seconds']:>8.2f}s "
+        f"{stats['tasks_per_second']:>9} tasks/s"
+    )
+
+
+async def main():
+    task_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all,
+            tables=[User.__table__, Project.__table__, Task.__table__, Notification.__table__]
+        )
+
+    print(f"Seeding {task_count} tasks...")
+    await seed(task_count)
+
+    report("cold scan", await risk_service.scan_task_risks())
+    report("rescan", await risk_service.scan_task_risks())
+
+    await engine.dispose()
+    os.remove(DB_PATH)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
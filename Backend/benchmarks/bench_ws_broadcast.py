@@ -0,0 +1,109 @@
+"""
+Microbenchmark channel broadcast cost against channel size.
+
+Connects N in-memory sockets (no network) to a ConnectionManager and times
+one broadcast until every frame has been handed to its socket, through the
+same per-connection send queues in each mode:
+
+  per-socket     the dict is queued and encoded by send_json for every socket
+  once (json)    encoded once with the stdlib encoder, text sent as-is
+  once (orjson)  encoded once with orjson (when installed)
+
+Run with: python benchmarks/bench_ws_broadcast.py
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Connecting loads channel memberships, so give it an empty throwaway database
+DB_PATH = os.path.join(tempfile.mkdtemp(), "bench_ws_broadcast.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+
+from app.config.database import engine
+from app.models.user import Base
+from app.models.message import ChannelMember
+from app.models.organization import Organization
+from app.services import websocket_manager
+from app.services.websocket_manager import ConnectionManager
+
+CHANNEL_ID = 1
+ROUNDS = 50
+MESSAGE = {
+    'type': 'message',
+    'id': 123456,
+    'sender_id': 42,
+    'content': 'Deploying the release branch now, please hold merges for ten minutes. ' * 3,
+    'created_at': '2026-10-17T12:00:00.000000+00:00',
+    'channel_id': CHANNEL_ID,
+    'recipient_id': None,
+}
+
+
+class NullSocket:
+    async def accept(self):
+        pass
+
+    async def send_text(self, frame):
+        if not isinstance(frame, str):
+            # Per-socket mode: what Starlette's send_json does on every call
+            json.dumps(frame, separators=(",", ":"), ensure_ascii=False)
+
+
+async def build_manager(size: int) -> ConnectionManager:
+    manager = ConnectionManager()
+    manager.send_queue_size = ROUNDS + 1
+    for user_id in range(1, size + 1):
+        # Already online, so connecting doesn't broadcast presence to everyone
+        manager.presence.set(user_id, 'online')
+        await manager.connect(NullSocket(), user_id)
+        manager.join_channel(user_id, CHANNEL_ID)
+    return manager
+
+
+async def per_socket(manager: ConnectionManager):
+    for user_id in manager.channel_members[CHANNEL_ID]:
+        manager.send_frame(MESSAGE, user_id)
+
+
+async def encode_once(manager: ConnectionManager):
+    await manager.broadcast_to_channel(MESSAGE, CHANNEL_ID)
+
+
+async def timed(manager: ConnectionManager, broadcast) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        await broadcast(manager)
+        await manager.drain()
+    return (time.perf_counter() - start) * 1e6 / ROUNDS
+
+
+async def main():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    orjson_module = websocket_manager.orjson
+    columns = ["per-socket", "once (json)"] + (["once (orjson)"] if orjson_module else [])
+    print(f"{'members':>8} " + " ".join(f"{c + ' us':>18}" for c in columns))
+
+    for size in (10, 100, 500, 2000):
+        manager = await build_manager(size)
+        row = [await timed(manager, per_socket)]
+
+        websocket_manager.orjson = None
+        row.append(await timed(manager, encode_once))
+        websocket_manager.orjson = orjson_module
+        if orjson_module:
+            row.append(await timed(manager, encode_once))
+
+        print(f"{size:>8} " + " ".join(f"{value:>18.1f}" for value in row))
+        for writer in manager._writers.values():
+            writer.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
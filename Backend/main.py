@@ -14,11 +14,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+from app.core.middleware import MembershipScopeMiddleware
+app.add_middleware(MembershipScopeMiddleware)
+
 from app.models import Base
 from app.config.database import engine
 from app.core.startup import startup_checks
+from app.core.scheduler import (
+    scheduler, SCHEDULER_ENABLED, RISK_SCAN_INTERVAL_SECONDS, RISK_SCAN_JITTER_SECONDS,
+    REFRESH_TOKEN_PURGE_INTERVAL_SECONDS
+)
+from app.services.risk_service import risk_service
+from app.services.notification_service import notification_service
+from app.services.auth_service import auth_service
+from app.services.websocket_manager import manager
+from app.core.security import token_cache
+from app.services.organization_service import membership_cache
+from app.services.plan_cache import plan_cache
+from app.services.project_cache import project_tree_cache
 import logging
 
 # Configure logging
@@ -37,6 +53,37 @@ async def startup():
         logging.error(f"❌ Startup failed: {e}")
         raise
 
+    notification_service.writer.start()
+    manager.presence.start()
+    await manager.start_backplane()
+    # Commits on any worker invalidate every worker's cached project trees
+    project_tree_cache.share_invalidations(manager)
+    manager.start_heartbeats()
+
+    if SCHEDULER_ENABLED:
+        scheduler.add_job(
+            "risk_scan",
+            risk_service.run_scheduled_scan,
+            interval=RISK_SCAN_INTERVAL_SECONDS,
+            jitter=RISK_SCAN_JITTER_SECONDS
+        )
+        scheduler.add_job(
+            "refresh_token_purge",
+            auth_service.purge_expired_refresh_tokens,
+            interval=REFRESH_TOKEN_PURGE_INTERVAL_SECONDS,
+            jitter=RISK_SCAN_JITTER_SECONDS
+        )
+        scheduler.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop background jobs and flush queued notifications and presence"""
+    await scheduler.stop()
+    await notification_service.writer.stop()
+    await manager.presence.stop()
+    await manager.stop_heartbeats()
+    await manager.stop_backplane()
+
 @app.get("/health")
 async def health_check():
     """Comprehensive health check"""
@@ -74,6 +121,17 @@ async def health_check():
     except Exception as e:
         health_status["checks"]["tables"] = f"❌ Error: {str(e)}"
     
+    health_status["notification_writer"] = notification_service.writer.stats()
+    health_status["presence"] = manager.presence.stats()
+    health_status["websocket"] = manager.send_stats()
+    health_status["backplane"] = manager.backplane.stats()
+    health_status["presence_registry"] = manager.registry.stats()
+    health_status["typing"] = manager.typing.stats()
+    health_status["token_cache"] = token_cache.stats()
+    health_status["membership_cache"] = membership_cache.stats()
+    health_status["plan_cache"] = plan_cache.stats()
+    health_status["project_tree_cache"] = project_tree_cache.stats()
+
     return health_status
 
 from app.api.v1 import projects as projects_router
@@ -1,5 +1,6 @@
 import sys
 import os
+import json
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
@@ -11,6 +12,9 @@ from app.models.user import Base
 os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///./test.db"
 os.environ["OPENAI_API_KEY"] = "dummy_key"
 
+# Register every table with Base.metadata so each test module can run on its own
+from app.models import organization, notification, message, issue, refresh_token
+
 SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
 engine = create_async_engine(SQLALCHEMY_DATABASE_URL)
 TestingSessionLocal = sessionmaker(
@@ -18,6 +22,11 @@ TestingSessionLocal = sessionmaker(
 )
 
 
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
 @pytest.fixture(scope="module")
 async def setup_database():
     async with engine.begin() as conn:
@@ -25,3 +34,23 @@ async def setup_database():
     yield
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
+
+
+class RecordingSocket:
+    """Stands in for a WebSocket; keeps every frame sent to it, decoded"""
+
+    def __init__(self):
+        self.frames = []
+        self.close_code = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        self.frames.append(json.loads(text))
+
+    async def close(self, code=1000):
+        self.close_code = code
+
+    def of_type(self, frame_type):
+        return [frame for frame in self.frames if frame['type'] == frame_type]
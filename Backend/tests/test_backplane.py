@@ -0,0 +1,130 @@
+import asyncio
+import pytest
+
+from sqlalchemy import insert
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from tests.conftest import RecordingSocket, TestingSessionLocal
+from app.models.organization import OrganizationMember
+from app.services.backplane import RedisBackplane
+from app.services.websocket_manager import ConnectionManager
+
+CHANNEL_ID = 7
+
+
+async def eventually(condition, timeout=2.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, "condition not met before timeout"
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture(scope="module")
+async def organization(setup_database):
+    async with TestingSessionLocal() as session:
+        await session.execute(insert(OrganizationMember.__table__), [
+            {"id": f"m{user_id}", "organization_id": "org", "user_id": user_id,
+             "role": "developer", "invited_by": 1}
+            for user_id in (1, 2)
+        ])
+        await session.commit()
+
+
+@pytest.fixture
+async def workers():
+    """Two managers standing in for two worker processes sharing one Redis"""
+    server = fakeredis.FakeServer()
+    managers = []
+    for _ in range(2):
+        manager = ConnectionManager()
+        manager.presence_batch_seconds = 0.01
+        manager.offline_grace_seconds = 0.01
+        await manager.use_backplane(
+            RedisBackplane(manager.deliver, client=fakeredis.aioredis.FakeRedis(server=server))
+        )
+        managers.append(manager)
+    yield managers
+    for manager in managers:
+        await manager.stop_backplane()
+
+
+@pytest.mark.anyio
+async def test_channel_dm_and_presence_reach_sockets_on_other_workers(organization, workers):
+    worker_a, worker_b = workers
+    alice, bob = RecordingSocket(), RecordingSocket()
+    await worker_a.connect(alice, 1)
+    await worker_b.connect(bob, 2)
+
+    # Alice's online transition reached Bob through the backplane
+    await eventually(lambda: any(
+        change['user_id'] == 1 for frame in bob.of_type('presence_batch') for change in frame['changes']
+    ))
+
+    # A membership change made on worker A applies where Bob's socket lives
+    await worker_a.channel_joined(1, CHANNEL_ID)
+    await worker_a.channel_joined(2, CHANNEL_ID)
+    await eventually(lambda: 2 in worker_b.channel_members.get(CHANNEL_ID, ()))
+    assert worker_a.channel_members[CHANNEL_ID] == {1}
+
+    await worker_a.broadcast_to_channel({'type': 'new_message', 'content': 'hi'}, CHANNEL_ID)
+    await worker_b.send_personal_message({'type': 'new_message', 'content': 'dm'}, 1)
+    await eventually(lambda: bob.of_type('new_message') and len(alice.of_type('new_message')) == 2)
+    await worker_a.drain()
+    await worker_b.drain()
+
+    assert [frame['content'] for frame in bob.of_type('new_message')] == ['hi']
+    # Each worker applies its own events locally and skips their echo
+    assert sorted(frame['content'] for frame in alice.of_type('new_message')) == ['dm', 'hi']
+    assert worker_a.backplane.stats()['published'] >= 3
+    assert worker_b.backplane.stats()['received'] >= 3
+
+
+@pytest.mark.anyio
+async def test_distributed_backplane_treats_users_as_reachable(workers):
+    worker_a, _ = workers
+    # With a distributed backplane the recipient may be connected elsewhere
+    assert worker_a.is_connected(42)
+    assert 42 not in worker_a.active_connections
+
+
+@pytest.mark.anyio
+async def test_presence_is_shared_across_workers(organization, workers):
+    worker_a, worker_b = workers
+    bob, alice_a, alice_b = RecordingSocket(), RecordingSocket(), RecordingSocket()
+    await worker_a.connect(bob, 2)
+    await worker_a.connect(alice_a, 1)
+    await worker_b.connect(alice_b, 1)
+
+    # Either worker sees users held by the other
+    assert await worker_b.online_users([1, 2, 3]) == [1, 2]
+
+    # Alice leaving worker B is not an offline transition while worker A holds her
+    worker_b.disconnect(alice_b, 1)
+    await asyncio.sleep(0.05)
+    assert await worker_b.online_users([1]) == [1]
+
+    worker_a.disconnect(alice_a, 1)
+    await eventually(lambda: (1, 'offline') in [
+        (change['user_id'], change['status']) for frame in bob.of_type('presence_batch') for change in frame['changes']
+    ])
+    await worker_a.drain()
+    statuses = [
+        change['status'] for frame in bob.of_type('presence_batch') for change in frame['changes']
+        if change['user_id'] == 1
+    ]
+    assert statuses == ['online', 'offline']
+    assert await worker_b.online_users([1, 2]) == [2]
+
+
+@pytest.mark.anyio
+async def test_users_of_a_dead_worker_stop_counting_as_online(organization, workers):
+    worker_a, worker_b = workers
+    await worker_a.connect(RecordingSocket(), 1)
+    assert await worker_b.online_users([1]) == [1]
+
+    # Worker A stops refreshing its liveness key, e.g. after a crash
+    await worker_a.registry.client.delete(worker_a.registry._worker_key(worker_a.registry.worker_id))
+    assert await worker_b.online_users([1]) == []
+    assert worker_b.registry.stats()['dead_workers_pruned'] == 1
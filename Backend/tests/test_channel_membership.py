@@ -0,0 +1,68 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import insert
+
+from tests.conftest import RecordingSocket, TestingSessionLocal
+from app.api.v1 import chat
+from app.models.message import Channel, ChannelMember
+from app.services.websocket_manager import manager
+
+USER = 901
+OTHER = 902
+
+
+@pytest.fixture(scope="module")
+async def channels(setup_database):
+    async with TestingSessionLocal() as session:
+        await session.execute(insert(Channel.__table__), [
+            {"id": 1001, "name": "general", "created_by": OTHER, "channel_type": "public"},
+            {"id": 1002, "name": "random", "created_by": OTHER, "channel_type": "public"},
+            {"id": 1003, "name": "open", "created_by": OTHER, "channel_type": "public"},
+        ])
+        await session.execute(insert(ChannelMember.__table__), [
+            {"channel_id": 1001, "user_id": USER},
+            {"channel_id": 1002, "user_id": USER},
+            {"channel_id": 1001, "user_id": OTHER},
+        ])
+        await session.commit()
+
+
+@pytest.mark.anyio
+async def test_memberships_follow_the_users_sockets(channels):
+    first, second = RecordingSocket(), RecordingSocket()
+    await manager.connect(first, USER)
+    await manager.connect(second, USER)
+
+    assert manager.user_channels[USER] == {1001, 1002}
+    assert USER in manager.channel_members[1001]
+    assert OTHER not in manager.channel_members[1001]
+
+    manager.disconnect(first, USER)
+    assert manager.user_channels[USER] == {1001, 1002}
+
+    manager.disconnect(second, USER)
+    assert USER not in manager.user_channels
+    assert 1001 not in manager.channel_members and 1002 not in manager.channel_members
+
+
+@pytest.mark.anyio
+async def test_rest_join_leave_and_create_update_online_members(channels):
+    socket = RecordingSocket()
+    await manager.connect(socket, USER)
+    current_user = {"id": USER}
+    try:
+        await chat.join_channel(1003, current_user=current_user)
+        assert USER in manager.channel_members[1003]
+
+        await chat.leave_channel(1002, current_user=current_user)
+        assert 1002 not in manager.user_channels[USER]
+        with pytest.raises(HTTPException):
+            await chat.leave_channel(1002, current_user=current_user)
+
+        created = await chat.create_channel(chat.CreateChannelRequest(name="new"), current_user=current_user)
+        assert manager.channel_members[created["id"]] == {USER}
+    finally:
+        manager.disconnect(socket, USER)
+
+    await chat.join_channel(1002, current_user=current_user)
+    assert 1002 not in manager.channel_members
@@ -0,0 +1,103 @@
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy import insert
+
+from tests.conftest import TestingSessionLocal
+from app.models.message import Message, Channel
+from app.api.v1 import chat
+
+
+CHANNEL_ID = 501
+USER_A = 601
+USER_B = 602
+
+
+@pytest.fixture(scope="module")
+async def chat_history(setup_database):
+    async with TestingSessionLocal() as session:
+        await session.execute(
+            insert(Channel.__table__),
+            [{"id": CHANNEL_ID, "name": "paging", "created_by": USER_A}]
+        )
+        await session.execute(
+            insert(Message.__table__),
+            [
+                {"sender_id": USER_A, "channel_id": CHANNEL_ID, "content": f"channel {i}"}
+                for i in range(120)
+            ]
+        )
+        await session.execute(
+            insert(Message.__table__),
+            [
+                {
+                    "sender_id": USER_A if i % 2 else USER_B,
+                    "recipient_id": USER_B if i % 2 else USER_A,
+                    "content": f"dm {i}"
+                }
+                for i in range(30)
+            ]
+        )
+        await session.commit()
+
+
+async def fetch_channel_page(**params):
+    response = Response()
+    page = await chat.get_channel_messages(
+        channel_id=CHANNEL_ID,
+        response=response,
+        limit=params.get("limit", 50),
+        search=None,
+        before_id=params.get("before_id"),
+        after_id=params.get("after_id"),
+        cursor=params.get("cursor"),
+        current_user={"id": USER_A}
+    )
+    return page, response.headers.get("X-Next-Cursor")
+
+
+@pytest.mark.anyio
+async def test_channel_history_pages_backwards_with_cursor(chat_history):
+    pages = []
+    page, cursor = await fetch_channel_page()
+    pages.append(page)
+    while cursor:
+        page, cursor = await fetch_channel_page(cursor=cursor)
+        pages.append(page)
+
+    assert [len(page) for page in pages] == [50, 50, 20]
+    contents = [msg["content"] for page in reversed(pages) for msg in page]
+    assert contents == [f"channel {i}" for i in range(120)]
+
+
+@pytest.mark.anyio
+async def test_channel_history_pages_forwards_after_id(chat_history):
+    first_page, _ = await fetch_channel_page(limit=10, after_id=0)
+    assert [msg["content"] for msg in first_page] == [f"channel {i}" for i in range(10)]
+
+    newer, cursor = await fetch_channel_page(limit=10, after_id=first_page[-1]["id"])
+    assert [msg["content"] for msg in newer] == [f"channel {i}" for i in range(10, 20)]
+    assert cursor
+
+
+@pytest.mark.anyio
+async def test_direct_messages_merge_both_directions(chat_history):
+    response = Response()
+    page = await chat.get_direct_messages(
+        user_id=USER_B,
+        response=response,
+        limit=20,
+        before_id=None,
+        after_id=None,
+        cursor=None,
+        current_user={"id": USER_A}
+    )
+
+    assert [msg["content"] for msg in page] == [f"dm {i}" for i in range(10, 30)]
+    assert response.headers["X-Next-Cursor"]
+
+
+@pytest.mark.anyio
+async def test_invalid_cursor_is_rejected(chat_history):
+    with pytest.raises(HTTPException) as exc_info:
+        await fetch_channel_page(cursor="not-a-cursor")
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,110 @@
+import pytest
+from types import SimpleNamespace
+
+from app.api.v1 import ai as ai_api
+from app.services import ai_service as ai_module
+from app.services.organization_service import organization_service
+from app.services.project_service import project_service
+
+USER = {'id': 1, 'username': 'streamer'}
+PLAN = {'project_name': 'Streamed', 'description': 'A streamed plan', 'epics': [{'name': 'One'}, {'name': 'Two'}]}
+
+
+class FakeStream:
+    def __init__(self, pieces):
+        self.pieces = pieces
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for piece in self.pieces:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+
+
+class FakeCompletions:
+    def __init__(self, pieces):
+        self.pieces = pieces
+        self.calls = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        return FakeStream(self.pieces)
+
+
+def service_with(pieces):
+    service = ai_module.AIService()
+    completions = FakeCompletions(pieces)
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return service, completions
+
+
+async def collect(stream):
+    return [event async for event in stream]
+
+
+@pytest.mark.anyio
+async def test_question_answers_stream_token_by_token():
+    service, completions = service_with(["Sprints ", None, "are short ", "cycles."])
+
+    events = await collect(service.stream_discover_response("What is a sprint?", USER))
+
+    assert events == [
+        ("token", {"text": "Sprints "}),
+        ("token", {"text": "are short "}),
+        ("token", {"text": "cycles."}),
+        ("done", {"text": "Sprints are short cycles."}),
+    ]
+    assert completions.calls[0]['stream'] is True
+    assert await service.get_discover_response("What is a sprint?", USER) == "Sprints are short cycles."
+
+
+@pytest.mark.anyio
+async def test_project_creation_reports_progress(monkeypatch):
+    service, _ = service_with([])
+    created = []
+
+    async def get_org(user_id):
+        return SimpleNamespace(id='org')
+
+    async def get_members(org_id):
+        return ['owner', 'member']
+
+    async def create_project(plan, owner_id, org_id):
+        created.append((plan['project_name'], owner_id, org_id))
+
+    async def generate(description):
+        return PLAN
+
+    async def formatted_users(user_id, members=None):
+        return "- streamer (Role: owner)"
+
+    monkeypatch.setattr(organization_service, "get_user_organization", get_org)
+    monkeypatch.setattr(organization_service, "get_organization_members", get_members)
+    monkeypatch.setattr(project_service, "create_project_from_plan", create_project)
+    monkeypatch.setattr(service, "_generate_project_plan", generate)
+    monkeypatch.setattr(service, "_get_formatted_users", formatted_users)
+
+    events = await collect(service.stream_discover_response("Build a CRM for dentists", USER))
+
+    assert [event for event, _ in events] == ["progress", "progress", "progress", "done"]
+    assert [data.get('stage') for _, data in events[:3]] == ["generating_plan", "plan_generated", "epics_persisted"]
+    assert events[1][1] == {'stage': 'plan_generated', 'project_name': 'Streamed', 'epics': 2}
+    assert "Project Created: Streamed" in events[-1][1]['text']
+    assert created == [('Streamed', 1, 'org')]
+
+
+@pytest.mark.anyio
+async def test_endpoint_emits_server_sent_events(monkeypatch):
+    async def stream(message, current_user):
+        yield "token", {"text": "Hi"}
+        yield "done", {"text": "Hi"}
+
+    monkeypatch.setattr(ai_api.ai_service, "stream_discover_response", stream)
+
+    response = await ai_api.discover_stream(ai_api.DiscoverMessage(message="What now?"), USER)
+    body = "".join([chunk async for chunk in response.body_iterator])
+
+    assert response.media_type == "text/event-stream"
+    assert response.headers["cache-control"] == "no-cache"
+    assert body == 'event: token\ndata: {"text": "Hi"}\n\nevent: done\ndata: {"text": "Hi"}\n\n'
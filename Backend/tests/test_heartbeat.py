@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+
+from app.services.websocket_manager import ConnectionManager, HEARTBEAT_TIMEOUT_CLOSE_CODE
+from tests.conftest import RecordingSocket
+
+
+class DeadSocket(RecordingSocket):
+    async def send_text(self, text):
+        raise RuntimeError("connection reset")
+
+
+@pytest.mark.anyio
+async def test_failed_send_reaps_the_socket_and_goes_offline(setup_database):
+    manager = ConnectionManager()
+    manager.offline_grace_seconds = 0.01
+    dead = DeadSocket()
+    await manager.connect(dead, 1)
+
+    await manager.send_personal_message({'type': 'message', 'content': 'hi'}, 1)
+    await asyncio.sleep(0.05)
+
+    assert 1 not in manager.active_connections
+    assert dead not in manager._writers
+    assert manager.presence.get(1) == 'offline'
+    assert manager.send_stats()['reaped_send_failed'] == 1
+
+
+@pytest.mark.anyio
+async def test_heartbeat_pings_live_sockets_and_reaps_silent_ones(setup_database):
+    manager = ConnectionManager()
+    manager.heartbeat_timeout = 0.05
+    live, silent = RecordingSocket(), RecordingSocket()
+    await manager.connect(live, 1)
+    await manager.connect(silent, 2)
+
+    await manager.heartbeat()
+    await manager.drain()
+    assert [frame['type'] for frame in live.frames] == ['ping']
+    assert [frame['type'] for frame in silent.frames] == ['ping']
+
+    await asyncio.sleep(0.06)
+    manager.touch(live)
+    await manager.heartbeat()
+    await manager.drain()
+    await asyncio.sleep(0)
+
+    assert manager.get_online_users() == [1]
+    assert silent.close_code == HEARTBEAT_TIMEOUT_CLOSE_CODE
+    assert [frame['type'] for frame in live.frames] == ['ping', 'ping']
+    stats = manager.send_stats()
+    assert stats['reaped_heartbeat'] == 1
+    assert stats['pings_sent'] == 3
+    assert stats['connections'] == 1
@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy import insert
+
+from tests.conftest import TestingSessionLocal
+from app.models.user import User
+from app.services.organization_service import organization_service, membership_cache, membership_scope
+
+OWNER = 801
+MEMBER = 802
+
+
+@pytest.fixture(scope="module")
+async def users(setup_database):
+    async with TestingSessionLocal() as session:
+        await session.execute(insert(User.__table__), [
+            {"id": OWNER, "username": "owner801", "email": "owner801@example.com", "role": "manager"},
+            {"id": MEMBER, "username": "member802", "email": "member802@example.com", "role": "developer"},
+        ])
+        await session.commit()
+
+
+@pytest.fixture
+def cache():
+    membership_cache.clear()
+    membership_cache.metrics.update(hits=0, misses=0, memo_hits=0, invalidations=0)
+    return membership_cache
+
+
+@pytest.mark.anyio
+async def test_lookups_are_cached_and_invalidated_by_membership_changes(users, cache):
+    assert await organization_service.get_user_organization(OWNER) is None
+    org = await organization_service.create_organization("Acme", "", OWNER)
+
+    # create_organization dropped the cached "no organization" answer
+    assert (await organization_service.get_user_organization(OWNER)).id == org.id
+    assert (await organization_service.get_user_organization(OWNER)).id == org.id
+    assert cache.stats()["hits"] == 1
+
+    members = await organization_service.get_organization_members(org.id)
+    assert [m.user_id for m in members] == [OWNER]
+    assert await organization_service.get_user_organization(MEMBER) is None
+
+    await organization_service.add_team_member(
+        org.id, "member802@example.com", "unused", "member802", "developer", "", OWNER
+    )
+    assert (await organization_service.get_user_organization(MEMBER)).id == org.id
+    members = await organization_service.get_organization_members(org.id)
+    assert sorted(m.user_id for m in members) == [OWNER, MEMBER]
+
+    await organization_service.remove_team_member(org.id, MEMBER)
+    assert await organization_service.get_user_organization(MEMBER) is None
+    assert [m.user_id for m in await organization_service.get_organization_members(org.id)] == [OWNER]
+
+
+@pytest.mark.anyio
+async def test_request_scope_resolves_each_lookup_once(users, cache):
+    ttl, cache.ttl = cache.ttl, 0  # every lookup outside the memo goes to the database
+    try:
+        with membership_scope():
+            first = await organization_service.get_user_organization(OWNER)
+            second = await organization_service.get_user_organization(OWNER)
+            await organization_service.get_organization_members(first.id)
+            await organization_service.get_organization_members(str(first.id))
+        assert first is second
+        assert cache.stats()["misses"] == 2
+        assert cache.stats()["memo_hits"] == 2
+
+        await organization_service.get_user_organization(OWNER)
+        assert cache.stats()["misses"] == 3
+    finally:
+        cache.ttl = ttl
@@ -0,0 +1,94 @@
+import pytest
+from sqlalchemy import insert, update, delete, text
+
+from tests.conftest import TestingSessionLocal, engine
+from app.models.message import Message, Channel, ChannelMember
+from app.services.message_search import (
+    message_search_service, create_search_index, InvalidSearchCursor
+)
+
+
+MEMBER = 701
+OUTSIDER = 702
+JOINED_CHANNEL = 801
+OTHER_CHANNEL = 802
+
+
+@pytest.fixture(scope="module")
+async def searchable_messages(setup_database):
+    async with engine.begin() as conn:
+        await conn.run_sync(create_search_index)
+
+    async with TestingSessionLocal() as session:
+        await session.execute(
+            insert(Channel.__table__),
+            [
+                {"id": JOINED_CHANNEL, "name": "joined", "created_by": MEMBER},
+                {"id": OTHER_CHANNEL, "name": "other", "created_by": OUTSIDER},
+            ]
+        )
+        await session.execute(
+            insert(ChannelMember.__table__),
+            [{"channel_id": JOINED_CHANNEL, "user_id": MEMBER}]
+        )
+        await session.execute(
+            insert(Message.__table__),
+            [
+                {"sender_id": OUTSIDER, "channel_id": JOINED_CHANNEL, "recipient_id": None, "content": "deploy the release tonight"},
+                {"sender_id": OUTSIDER, "channel_id": JOINED_CHANNEL, "recipient_id": None, "content": "release release release notes"},
+                {"sender_id": OUTSIDER, "channel_id": OTHER_CHANNEL, "recipient_id": None, "content": "secret release plan"},
+                {"sender_id": OUTSIDER, "channel_id": None, "recipient_id": MEMBER, "content": "can you review the release?"},
+                {"sender_id": OUTSIDER, "channel_id": None, "recipient_id": 703, "content": "private release chatter"},
+            ]
+        )
+        await session.commit()
+
+    yield
+
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP TABLE IF EXISTS messages_fts"))
+
+
+@pytest.mark.anyio
+async def test_search_ranks_visible_messages_by_prefix(searchable_messages):
+    messages, cursor = await message_search_service.search(MEMBER, "rel", limit=10)
+
+    contents = [msg.content for msg in messages]
+    assert contents[0] == "release release release notes"
+    assert sorted(contents) == sorted([
+        "deploy the release tonight",
+        "release release release notes",
+        "can you review the release?",
+    ])
+    assert cursor is None
+
+
+@pytest.mark.anyio
+async def test_search_pages_with_cursor(searchable_messages):
+    first, cursor = await message_search_service.search(MEMBER, "release", limit=2)
+    assert len(first) == 2 and cursor
+
+    rest, cursor = await message_search_service.search(MEMBER, "release", limit=2, cursor=cursor)
+    assert len(rest) == 1 and cursor is None
+    assert not {msg.id for msg in first} & {msg.id for msg in rest}
+
+    with pytest.raises(InvalidSearchCursor):
+        await message_search_service.search(MEMBER, "release", cursor="garbage")
+
+
+@pytest.mark.anyio
+async def test_search_index_follows_edits_and_deletes(searchable_messages):
+    async with TestingSessionLocal() as session:
+        await session.execute(
+            update(Message)
+            .where(Message.content == "deploy the release tonight")
+            .values(content="deploy the hotfix tonight")
+        )
+        await session.execute(delete(Message).where(Message.content == "can you review the release?"))
+        await session.commit()
+
+    hotfix, _ = await message_search_service.search(MEMBER, "hotfix")
+    assert [msg.content for msg in hotfix] == ["deploy the hotfix tonight"]
+
+    release, _ = await message_search_service.search(MEMBER, "release")
+    assert [msg.content for msg in release] == ["release release release notes"]
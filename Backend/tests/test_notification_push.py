@@ -0,0 +1,91 @@
+import pytest
+
+from app.services.notification_service import notification_service
+from app.services.websocket_manager import manager
+from tests.conftest import RecordingSocket
+
+
+@pytest.fixture
+async def connected_user():
+    user_id = 301
+    socket = RecordingSocket()
+    await manager.connect(socket, user_id)
+    yield user_id, socket
+    manager.disconnect(socket, user_id)
+
+
+@pytest.mark.anyio
+async def test_created_and_queued_notifications_are_pushed(setup_database, connected_user):
+    user_id, socket = connected_user
+
+    created = await notification_service.create_notification(
+        user_id, "task_assigned", "New Task Assigned", "Task A", "/task-board"
+    )
+    await notification_service.queue_notification(
+        user_id, "issue_assigned", "Issue Assigned", "Issue B", "/issues/1"
+    )
+    await notification_service.create_notification(
+        302, "task_assigned", "Offline user", "Not pushed", "/task-board"
+    )
+    await manager.drain()
+
+    socket.frames = [frame for frame in socket.frames if frame["type"] != "presence_batch"]
+    assert [frame["type"] for frame in socket.frames] == ["notification", "notification"]
+    assert socket.frames[0]["notification"]["id"] == created.id
+    assert socket.frames[1]["notification"]["title"] == "Issue Assigned"
+    assert [frame["unread_count"] for frame in socket.frames] == [1, 2]
+
+
+@pytest.mark.anyio
+async def test_resume_frame_returns_missed_notifications(setup_database):
+    user_id = 303
+    first = await notification_service.create_notification(user_id, "a", "First", "1", "/a")
+    second = await notification_service.create_notification(user_id, "b", "Second", "2", "/b")
+
+    fresh = await notification_service.resume_frame(user_id)
+    assert fresh == {"type": "notification_sync", "notifications": [], "unread_count": 2}
+
+    resumed = await notification_service.resume_frame(user_id, last_notification_id=first.id)
+    assert [n["id"] for n in resumed["notifications"]] == [second.id]
+
+
+@pytest.mark.anyio
+async def test_sync_frame_goes_out_before_notifications_queued_during_connect(setup_database):
+    user_id = 304
+    socket = RecordingSocket()
+    await manager.connect(socket, user_id, hold=True)
+    try:
+        await notification_service.create_notification(user_id, "a", "During connect", "1", "/a")
+        await manager.drain()
+        assert socket.frames == []
+
+        manager.start_sending(socket, await notification_service.resume_frame(user_id))
+        await manager.drain()
+
+        frames = [frame for frame in socket.frames if frame["type"] != "presence_batch"]
+        assert [frame["type"] for frame in frames] == ["notification_sync", "notification"]
+    finally:
+        manager.disconnect(socket, user_id)
+
+
+@pytest.mark.anyio
+async def test_reading_and_deleting_push_the_unread_count(setup_database):
+    user_id = 305
+    socket = RecordingSocket()
+    await manager.connect(socket, user_id)
+    try:
+        first = await notification_service.create_notification(user_id, "a", "First", "1", "/a")
+        second = await notification_service.create_notification(user_id, "b", "Second", "2", "/b")
+        await notification_service.create_notification(user_id, "c", "Third", "3", "/c")
+
+        assert await notification_service.mark_as_read(first.id, user_id)
+        assert not await notification_service.mark_as_read(first.id + 1000, user_id)
+        assert await notification_service.delete_notification(second.id, user_id)
+        assert await notification_service.mark_all_as_read(user_id) == 1
+        assert await notification_service.mark_all_as_read(user_id) == 0
+        await manager.drain()
+    finally:
+        manager.disconnect(socket, user_id)
+
+    counts = [frame["unread_count"] for frame in socket.of_type("unread_count")]
+    assert counts == [2, 1, 0]
@@ -0,0 +1,41 @@
+import pytest
+
+from app.services.notification_service import notification_service
+
+
+async def create_notifications(user_id: int, count: int) -> list:
+    return [
+        await notification_service.create_notification(
+            user_id=user_id,
+            notification_type="task_assigned",
+            title="New Task Assigned",
+            message=f"Task {i}",
+            link="/task-board"
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.anyio
+async def test_unread_count_and_mark_all_as_read(setup_database):
+    notifications = await create_notifications(user_id=101, count=5)
+    await create_notifications(user_id=102, count=2)
+
+    assert await notification_service.get_unread_count(101) == 5
+
+    assert await notification_service.mark_as_read(notifications[0].id, 101)
+    assert not await notification_service.mark_as_read(notifications[1].id, 102)
+    assert await notification_service.get_unread_count(101) == 4
+
+    assert await notification_service.mark_all_as_read(101) == 4
+    assert await notification_service.get_unread_count(101) == 0
+    assert await notification_service.get_unread_count(102) == 2
+
+
+@pytest.mark.anyio
+async def test_delete_notification_checks_owner(setup_database):
+    notification = (await create_notifications(user_id=103, count=1))[0]
+
+    assert not await notification_service.delete_notification(notification.id, 104)
+    assert await notification_service.delete_notification(notification.id, 103)
+    assert await notification_service.get_unread_count(103) == 0
@@ -0,0 +1,61 @@
+import asyncio
+import pytest
+
+from app.services.notification_service import notification_service
+from app.services.notification_writer import NotificationWriter
+
+
+@pytest.mark.anyio
+async def test_writer_batches_queued_notifications(setup_database):
+    writer = NotificationWriter(
+        notification_service.create_notifications, batch_size=20, flush_ms=20, queue_size=5
+    )
+    writer.start()
+    try:
+        for i in range(50):
+            await writer.enqueue(201, "task_assigned", "New Task Assigned", f"Task {i}", f"/tasks/{i}")
+        await writer.flush()
+    finally:
+        await writer.stop()
+
+    stats = writer.stats()
+    assert stats["written"] == 50
+    assert stats["flushes"] < 50
+    assert stats["backpressure_waits"] > 0
+    assert stats["queue_depth"] == 0
+    assert await notification_service.get_unread_count(201) == 50
+
+
+@pytest.mark.anyio
+async def test_writer_coalesces_duplicates_within_window(setup_database):
+    writer = NotificationWriter(notification_service.create_notifications, dedupe_seconds=60)
+
+    assert await writer.enqueue(202, "issue_assigned", "Assigned", "first", "/issues/1")
+    assert not await writer.enqueue(202, "issue_assigned", "Assigned", "again", "/issues/1")
+    assert await writer.enqueue(202, "issue_assigned", "Assigned", "other issue", "/issues/2")
+
+    assert writer.stats()["deduplicated"] == 1
+    assert await notification_service.get_unread_count(202) == 2
+
+
+@pytest.mark.anyio
+async def test_different_task_assignments_are_both_written(setup_database):
+    writer = NotificationWriter(notification_service.create_notifications, dedupe_seconds=60)
+
+    assert await writer.enqueue(203, "task_assigned", "New Task Assigned", "You've been assigned: A", "/task-board?task=1")
+    assert await writer.enqueue(203, "task_assigned", "New Task Assigned", "You've been assigned: B", "/task-board?task=2")
+
+    assert writer.stats()["deduplicated"] == 0
+    assert await notification_service.get_unread_count(203) == 2
+
+
+@pytest.mark.anyio
+async def test_write_through_mode_forgets_expired_keys(setup_database):
+    writer = NotificationWriter(notification_service.create_notifications, dedupe_seconds=0.01)
+
+    for i in range(5):
+        await writer.enqueue(204, "issue_assigned", "Assigned", "first", f"/issues/{i}")
+    await asyncio.sleep(0.02)
+    await writer.enqueue(204, "issue_assigned", "Assigned", "first", "/issues/5")
+
+    assert len(writer._recent) == 1
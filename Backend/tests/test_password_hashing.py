@@ -0,0 +1,35 @@
+import asyncio
+import pytest
+
+from app.services.auth_service import AuthService
+
+
+@pytest.mark.anyio
+async def test_async_hashing_uses_the_configured_cost_and_round_trips():
+    service = AuthService(rounds=4, max_workers=2)
+    hashed = await service.get_password_hash_async("s3cret")
+
+    assert hashed.startswith("$2b$04$")
+    assert await service.verify_password_async("s3cret", hashed)
+    assert not await service.verify_password_async("wrong", hashed)
+    # Hashes made with another cost still verify
+    assert service.verify_password("s3cret", AuthService(rounds=5).get_password_hash("s3cret"))
+
+
+@pytest.mark.anyio
+async def test_hashing_does_not_block_the_event_loop():
+    service = AuthService(rounds=10, max_workers=1)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.001)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    await asyncio.gather(*(service.get_password_hash_async("s3cret") for _ in range(3)))
+    task.cancel()
+
+    # Each cost-10 hash takes tens of milliseconds; the loop kept ticking throughout
+    assert ticks >= 10
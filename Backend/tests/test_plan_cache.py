@@ -0,0 +1,117 @@
+import asyncio
+import pytest
+
+from app.services.plan_cache import PlanCache, normalize_description, plan_cache_key
+
+
+def plan(name="Atlas"):
+    return {'project_name': name, 'description': 'desc', 'epics': []}
+
+
+def test_equivalent_descriptions_share_a_key():
+    assert normalize_description("  Build a CRM!\n for dentists ") == "build a crm for dentists"
+    assert plan_cache_key("Build a CRM for dentists", "1") == plan_cache_key("build a crm,  for DENTISTS.", "1")
+    assert plan_cache_key("Build a CRM for dentists", "1") != plan_cache_key("Build a CRM for dentists", "2")
+
+
+@pytest.mark.anyio
+async def test_second_request_is_served_from_memory_then_disk(tmp_path):
+    path = str(tmp_path / "plans.sqlite3")
+    calls = []
+
+    async def create():
+        calls.append(1)
+        return plan(), True
+
+    cache = PlanCache(path=path)
+    assert await cache.get_or_create("Build a CRM", "1", create) == plan()
+    assert await cache.get_or_create("build a crm.", "1", create) == plan()
+    assert cache.metrics['memory_hits'] == 1
+
+    # A fresh worker sharing the file skips the model call too
+    other = PlanCache(path=path)
+    assert await other.get_or_create("Build a CRM", "1", create) == plan()
+    assert other.metrics['disk_hits'] == 1
+    assert len(calls) == 1
+    assert cache.stats()['hit_rate'] == 0.5
+
+
+@pytest.mark.anyio
+async def test_fallback_plans_are_not_cached(tmp_path):
+    cache = PlanCache(path=str(tmp_path / "plans.sqlite3"))
+    calls = []
+
+    async def create():
+        calls.append(1)
+        return plan("mock"), False
+
+    await cache.get_or_create("Build a CRM", "1", create)
+    await cache.get_or_create("Build a CRM", "1", create)
+    assert len(calls) == 2
+    assert cache.metrics['stores'] == 0
+
+
+@pytest.mark.anyio
+async def test_entries_expire_and_old_ones_are_evicted(tmp_path):
+    path = str(tmp_path / "plans.sqlite3")
+    cache = PlanCache(path=path, ttl=0.05, max_entries=2, memory_entries=1)
+    keys = [plan_cache_key(f"project {i}", "1") for i in range(3)]
+    for i, key in enumerate(keys):
+        await cache.put(key, plan(str(i)))
+
+    assert cache.metrics['evictions'] == 1
+    assert await PlanCache(path=path).get(keys[0]) is None
+    assert await cache.get(keys[2]) == plan("2")
+
+    await asyncio.sleep(0.06)
+    assert await cache.get(keys[2]) is None
+    assert await cache.get(keys[1]) is None
+
+
+@pytest.mark.anyio
+async def test_concurrent_identical_requests_share_one_generation(tmp_path):
+    cache = PlanCache(path=str(tmp_path / "plans.sqlite3"))
+    calls = []
+
+    async def create():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return plan(), True
+
+    results = await asyncio.gather(*(cache.get_or_create("Build a CRM", "1", create) for _ in range(5)))
+    assert results == [plan()] * 5
+    assert len(calls) == 1
+    assert cache.metrics['shared_misses'] == 4
+
+
+@pytest.mark.anyio
+async def test_followers_take_over_when_the_generating_request_is_cancelled(tmp_path):
+    cache = PlanCache(path=str(tmp_path / "plans.sqlite3"))
+    started = asyncio.Event()
+    calls = []
+
+    async def create():
+        calls.append(1)
+        started.set()
+        await asyncio.sleep(0.02)
+        return plan(), True
+
+    leader = asyncio.create_task(cache.get_or_create("Build a CRM", "1", create))
+    await started.wait()
+    followers = [asyncio.create_task(cache.get_or_create("Build a CRM", "1", create)) for _ in range(3)]
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await asyncio.gather(*followers) == [plan()] * 3
+    assert leader.cancelled()
+    assert len(calls) == 2
+    assert cache.metrics['shared_misses'] == 2
+
+
+@pytest.mark.anyio
+async def test_unwritable_path_falls_back_to_memory(tmp_path):
+    cache = PlanCache(path=str(tmp_path / "missing" / "plans.sqlite3"))
+    key = plan_cache_key("Build a CRM", "1")
+    await cache.put(key, plan())
+    assert await cache.get(key) == plan()
+    assert cache.stats()['disk_enabled'] is False
@@ -0,0 +1,131 @@
+import asyncio
+import pytest
+from sqlalchemy import select, insert
+
+from tests.conftest import RecordingSocket, TestingSessionLocal
+from app.models.message import UserPresence
+from app.models.organization import OrganizationMember
+from app.models.user import User
+from app.services.presence_store import PresenceStore
+from app.services.websocket_manager import ConnectionManager
+
+
+def presence_changes(socket, user_id):
+    return [
+        (change["user_id"], change["status"])
+        for frame in socket.of_type("presence_batch")
+        for change in frame["changes"] if change["user_id"] == user_id
+    ]
+
+
+@pytest.fixture(scope="module")
+async def organizations(setup_database):
+    """Users 1-3 share org-a, user 4 is alone in org-b"""
+    async with TestingSessionLocal() as session:
+        await session.execute(insert(User.__table__), [
+            {"id": user_id, "username": f"user{user_id}", "email": f"user{user_id}@example.com",
+             "avatar_url": f"/avatars/{user_id}.png", "role": "developer"}
+            for user_id in (1, 2, 3, 4)
+        ])
+        await session.execute(insert(OrganizationMember.__table__), [
+            {"id": f"m{user_id}", "organization_id": organization_id, "user_id": user_id,
+             "role": "developer", "invited_by": 1}
+            for user_id, organization_id in [(1, "org-a"), (2, "org-a"), (3, "org-a"), (4, "org-b")]
+        ])
+        await session.commit()
+
+
+@pytest.mark.anyio
+async def test_multi_tab_churn_collapses_into_one_transition(organizations):
+    manager = ConnectionManager()
+    manager.offline_grace_seconds = 0.05
+    manager.presence_batch_seconds = 0.01
+    watcher = RecordingSocket()
+    await manager.connect(watcher, 2)
+
+    tab_one, tab_two, reloaded = RecordingSocket(), RecordingSocket(), RecordingSocket()
+    await manager.connect(tab_one, 1)
+    await manager.connect(tab_two, 1)
+    manager.disconnect(tab_one, 1)
+    manager.disconnect(tab_two, 1)
+    await manager.connect(reloaded, 1)
+    await asyncio.sleep(0.1)
+
+    await manager.drain()
+    assert presence_changes(watcher, 1) == [(1, "online")]
+    assert manager.presence.get(1) == "online"
+
+    manager.disconnect(reloaded, 1)
+    await asyncio.sleep(0.1)
+    await manager.drain()
+
+    assert presence_changes(watcher, 1) == [(1, "online"), (1, "offline")]
+    assert manager.presence.get(1) == "offline"
+
+
+@pytest.mark.anyio
+async def test_reconnect_storm_is_one_batch_per_organization(organizations):
+    manager = ConnectionManager()
+    manager.presence_batch_seconds = 60  # flushed by hand below
+    sockets = {user_id: RecordingSocket() for user_id in (1, 2, 3, 4)}
+    for user_id, socket in sockets.items():
+        await manager.connect(socket, user_id)
+
+    await manager.flush_presence()
+    await manager.drain()
+
+    for user_id in (1, 2, 3):
+        batches = sockets[user_id].of_type("presence_batch")
+        assert len(batches) == 1
+        assert batches[0]["organization_id"] == "org-a"
+        assert {change["user_id"] for change in batches[0]["changes"]} == {1, 2, 3}
+    # Presence never crosses organizations
+    assert [change["user_id"] for frame in sockets[4].frames for change in frame["changes"]] == [4]
+    assert manager.send_stats()["presence_batches"] == 2
+    manager._presence_flush_task.cancel()
+
+
+@pytest.mark.anyio
+async def test_flush_upserts_latest_state_per_user(setup_database):
+    store = PresenceStore()
+    store.set(401, "online")
+    store.set(402, "online")
+    await store.flush()
+
+    store.set(401, "offline")
+    store.set(401, "online")
+    store.set(402, "offline")
+    await store.flush()
+
+    async with TestingSessionLocal() as session:
+        rows = (await session.execute(
+            select(UserPresence.user_id, UserPresence.status).where(UserPresence.user_id.in_([401, 402]))
+        )).all()
+
+    assert sorted(rows) == [(401, "online"), (402, "offline")]
+    assert store.stats()["rows_written"] == 4
+    assert store.stats()["pending"] == 0
+
+
+@pytest.mark.anyio
+async def test_changes_carry_what_the_online_list_shows(organizations):
+    manager = ConnectionManager()
+    manager.offline_grace_seconds = 0.01
+    manager.presence_batch_seconds = 0.01
+    watcher, socket = RecordingSocket(), RecordingSocket()
+    await manager.connect(watcher, 2)
+    await manager.connect(socket, 3)
+    await asyncio.sleep(0.05)
+    manager.disconnect(socket, 3)
+    await asyncio.sleep(0.1)
+    await manager.drain()
+
+    changes = [
+        change for frame in watcher.of_type("presence_batch")
+        for change in frame["changes"] if change["user_id"] == 3
+    ]
+    assert changes == [
+        {"user_id": 3, "status": "online", "username": "user3", "avatar_url": "/avatars/3.png"},
+        {"user_id": 3, "status": "offline", "username": "user3", "avatar_url": "/avatars/3.png"},
+    ]
+    assert 3 not in manager.user_profiles
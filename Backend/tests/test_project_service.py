@@ -0,0 +1,161 @@
+import asyncio
+import pytest
+from sqlalchemy import event, select
+
+from tests.conftest import TestingSessionLocal
+from app.config.database import engine as app_engine
+from app.models.organization import Organization
+from app.models.project import Project
+from app.models.user import User
+from app.services.project_service import project_service
+from app.services.task_service import task_service
+from app.services.project_cache import ProjectTreeCache, project_tree_cache
+from app.services.backplane import RedisBackplane
+from app.services.websocket_manager import ConnectionManager
+
+
+PLAN = {
+    "project_name": "Tree Project",
+    "description": "Project used by the tree loader tests",
+    "epics": [
+        {
+            "name": f"Epic {e}",
+            "stories": [
+                {
+                    "name": f"Story {e}.{s}",
+                    "tasks": [f"Task {e}.{s}.{t}" for t in range(3)]
+                }
+                for s in range(4)
+            ]
+        }
+        for e in range(5)
+    ]
+}
+
+
+class StatementCounter:
+    def __init__(self, sync_engine):
+        self.count = 0
+        self.sync_engine = sync_engine
+
+    def __enter__(self):
+        event.listen(self.sync_engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+
+@pytest.fixture(scope="module")
+async def owner(setup_database):
+    async with TestingSessionLocal() as session:
+        user = User(username="tree_owner", email="tree_owner@test.com")
+        session.add(user)
+        await session.commit()
+        await session.refresh(user)
+        return user.id
+
+
+async def create_project(owner_id, name):
+    await project_service.create_project_from_plan(dict(PLAN, project_name=name), owner_id)
+    async with TestingSessionLocal() as session:
+        result = await session.execute(select(Project.id).where(Project.name == name))
+        return result.scalar_one()
+
+
+@pytest.mark.anyio
+async def test_project_tree_loads_in_constant_queries(owner):
+    project_id = await create_project(owner, "Tree Project A")
+
+    with StatementCounter(app_engine.sync_engine) as counter:
+        epics = await project_service.get_project_epics(project_id)
+
+    assert counter.count == 3
+    assert [epic["name"] for epic in epics] == [f"Epic {e}" for e in range(5)]
+    assert [story["name"] for story in epics[2]["stories"]] == [f"Story 2.{s}" for s in range(4)]
+    assert [task["title"] for task in epics[2]["stories"][1]["tasks"]] == [
+        f"Task 2.1.{t}" for t in range(3)
+    ]
+
+
+@pytest.mark.anyio
+async def test_project_tree_cache_invalidated_on_task_change(owner):
+    project_id = await create_project(owner, "Tree Project B")
+
+    first = await project_service.get_project_epics_json(project_id)
+    with StatementCounter(app_engine.sync_engine) as counter:
+        assert await project_service.get_project_epics_json(project_id) is first
+    assert counter.count == 0
+
+    task_id = (await project_service.get_project_epics(project_id))[0]["stories"][0]["tasks"][0]["id"]
+    await task_service.update_task_details(task_id, {"progress_percentage": 40})
+
+    epics = await project_service.get_project_epics(project_id)
+    assert epics[0]["stories"][0]["tasks"][0]["progress_percentage"] == 40
+    assert project_tree_cache.generation(str(project_id)) > 0
+
+
+def test_project_tree_cache_is_bounded():
+    cache = ProjectTreeCache(max_size=2)
+    for n in range(3):
+        project_id = f"p{n}"
+        cache.store(project_id, cache.generation(project_id), b"tree", [{"id": f"e{n}"}])
+
+    assert cache.get("p0") is None
+    assert cache.get("p2") == b"tree"
+    assert cache.stats()['evictions'] == 1
+    assert sorted(cache._epic_projects) == ["e1", "e2"]
+
+    # A tree loaded before a reset is not stored afterwards
+    stale = cache.generation("p1")
+    cache.invalidate(f"q{n}" for n in range(17))
+    assert cache.stats()['size'] == 0
+    cache.store("p1", stale, b"old tree", [])
+    assert cache.get("p1") is None
+
+
+@pytest.mark.anyio
+async def test_a_commit_on_one_worker_invalidates_the_others(owner, monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    # This process's cache stands in for worker A's, a second cache for worker B's
+    monkeypatch.setattr(project_tree_cache, "_publish", None)
+    other_cache = ProjectTreeCache()
+    managers = []
+    for cache in (project_tree_cache, other_cache):
+        manager = ConnectionManager()
+        await manager.use_backplane(
+            RedisBackplane(manager.deliver, client=fakeredis.aioredis.FakeRedis(server=server))
+        )
+        cache.share_invalidations(manager)
+        managers.append(manager)
+
+    try:
+        project_id = await create_project(owner, "Tree Project C")
+        key = str(project_id)
+        epics = await project_service.get_project_epics(project_id)
+        other_cache.store(key, other_cache.generation(key), b"tree", epics)
+        assert other_cache.get(key) == b"tree"
+
+        task_id = epics[0]["stories"][0]["tasks"][0]["id"]
+        await task_service.update_task_details(task_id, {"progress_percentage": 70})
+
+        for _ in range(200):
+            if other_cache.get(key) is None:
+                break
+            await asyncio.sleep(0.01)
+        assert other_cache.get(key) is None
+        assert other_cache.stats()["remote_invalidations"] >= 1
+        assert project_tree_cache.stats()["remote_invalidations"] == 0
+    finally:
+        for manager in managers:
+            await manager.stop_backplane()
+
+
+def test_project_trees_expire():
+    cache = ProjectTreeCache(ttl=0)
+    cache.store("p", cache.generation("p"), b"tree", [])
+    assert cache.get("p") is None
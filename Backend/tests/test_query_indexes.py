@@ -0,0 +1,100 @@
+import pytest
+from sqlalchemy import create_engine, text, select, desc, and_
+
+from app.models.user import Base
+from app.models.organization import Organization
+from app.models.epic import Epic
+from app.models.story import Story
+from app.models.task import Task
+from app.models.notification import Notification
+from app.models.message import Message
+from app.models.issue import Issue
+
+
+PROJECT_ID = "00000000-0000-0000-0000-000000000001"
+
+project_story_ids = (
+    select(Story.id)
+    .join(Epic, Story.epic_id == Epic.id)
+    .where(Epic.project_id == PROJECT_ID)
+)
+
+# (hot statement, index or indexes expected to serve it)
+HOT_STATEMENTS = {
+    "complete_task_next_task": (
+        select(Task).where(
+            and_(
+                Task.project_id == PROJECT_ID,
+                Task.status == "To Do",
+                Task.assignee_id.is_(None)
+            )
+        ).order_by(Task.order).limit(1),
+        "ix_tasks_project_status_assignee_order",
+    ),
+    "project_tree_epics": (
+        select(Epic.id, Epic.name).where(Epic.project_id == PROJECT_ID).order_by(Epic.order),
+        "ix_epics_project_order",
+    ),
+    "project_tree_tasks": (
+        select(Task.id, Task.story_id, Task.title)
+        .where(Task.story_id.in_(project_story_ids))
+        .order_by(Task.story_id, Task.order),
+        "ix_tasks_story_order",
+    ),
+    "user_notifications": (
+        select(Notification)
+        .where(and_(Notification.user_id == 1, Notification.read == False))
+        .order_by(desc(Notification.created_at))
+        .limit(50),
+        "ix_notifications_user_read_created",
+    ),
+    "channel_history_page": (
+        select(Message)
+        .where(and_(Message.channel_id == 1, Message.id < 1000))
+        .order_by(desc(Message.id))
+        .limit(50),
+        # On SQLite the single-column index carries the rowid and is equivalent
+        ("ix_messages_channel_id_id", "ix_messages_channel_id"),
+    ),
+    "direct_message_history_page": (
+        select(Message)
+        .where(and_(Message.sender_id == 1, Message.recipient_id == 2, Message.id < 1000))
+        .order_by(desc(Message.id))
+        .limit(50),
+        "ix_messages_dm_id",
+    ),
+    "project_issues": (
+        select(Issue)
+        .where(and_(Issue.project_id == PROJECT_ID, Issue.status == "open"))
+        .order_by(desc(Issue.created_at)),
+        "ix_issues_project_status_created",
+    ),
+}
+
+
+@pytest.fixture(scope="module")
+def sqlite_engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def explain(engine, statement) -> list[str]:
+    sql = str(statement.compile(engine, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        return [row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+
+@pytest.mark.parametrize("name", sorted(HOT_STATEMENTS))
+def test_hot_statement_uses_index(sqlite_engine, name):
+    statement, index_names = HOT_STATEMENTS[name]
+    if isinstance(index_names, str):
+        index_names = (index_names,)
+
+    plan = explain(sqlite_engine, statement)
+
+    table_scans = [step for step in plan if step.startswith("SCAN") and "USING" not in step]
+    assert not table_scans, f"{name} scans a table: {plan}"
+    used = {word for step in plan for word in step.split()}
+    assert used & set(index_names), f"{name} does not use {index_names}: {plan}"
@@ -0,0 +1,105 @@
+import jwt
+import pytest
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from sqlalchemy import insert, select, func
+
+from tests.conftest import TestingSessionLocal
+from app.api.v1 import auth
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+from app.services import auth_service as auth_module
+from app.services.auth_service import auth_service, hash_refresh_token
+
+SECRET = "test-secret-for-the-refresh-token-tests"
+EMAIL = "refresh@example.com"
+
+
+@pytest.fixture(autouse=True)
+def secret(monkeypatch):
+    monkeypatch.setenv("JWT_SECRET_KEY", SECRET)
+
+
+@pytest.fixture(scope="module")
+async def user(setup_database):
+    hashed = auth_module.AuthService(rounds=4).get_password_hash("s3cret")
+    async with TestingSessionLocal() as session:
+        await session.execute(insert(User.__table__), [
+            {"id": 701, "username": "refresher", "email": EMAIL, "password_hash": hashed, "role": "developer"}
+        ])
+        await session.commit()
+
+
+@pytest.fixture
+def no_bcrypt(monkeypatch):
+    def fail(*args):
+        raise AssertionError("bcrypt must not run on refresh")
+    monkeypatch.setattr(auth_module.bcrypt, "checkpw", fail)
+    monkeypatch.setattr(auth_module.bcrypt, "hashpw", fail)
+
+
+async def refresh(token):
+    return await auth.refresh(auth.RefreshRequest(refresh_token=token))
+
+
+@pytest.mark.anyio
+async def test_login_issues_short_access_token_and_hashed_refresh_token(user):
+    session = await auth.login(auth.UserLogin(email=EMAIL, password="s3cret"))
+
+    claims = jwt.decode(session["access_token"], SECRET, algorithms=["HS256"])
+    lifetime = datetime.utcfromtimestamp(claims["exp"]) - datetime.utcnow()
+    assert timedelta(minutes=14) < lifetime <= timedelta(minutes=15)
+    assert session["expires_in"] == 15 * 60
+
+    async with TestingSessionLocal() as db:
+        stored = (await db.execute(select(RefreshToken.token_hash).where(RefreshToken.user_id == 701))).scalars().all()
+    assert hash_refresh_token(session["refresh_token"]) in stored
+    assert session["refresh_token"] not in stored
+
+
+@pytest.mark.anyio
+async def test_refresh_rotates_without_bcrypt(user, no_bcrypt):
+    first = await auth_service.issue_session(await _user())
+    second = await refresh(first["refresh_token"])
+
+    assert second["refresh_token"] != first["refresh_token"]
+    assert second["user"]["id"] == 701
+    third = await refresh(second["refresh_token"])
+    assert third["user"]["email"] == EMAIL
+
+
+@pytest.mark.anyio
+async def test_rotated_token_is_rejected_and_late_reuse_revokes_the_session(user, monkeypatch):
+    first = await auth_service.issue_session(await _user())
+    second = await refresh(first["refresh_token"])
+
+    # Within the grace window (another tab refreshing at the same time) only the old token fails
+    with pytest.raises(HTTPException) as error:
+        await refresh(first["refresh_token"])
+    assert error.value.status_code == 401
+    third = await refresh(second["refresh_token"])
+
+    monkeypatch.setattr(auth_module, "REFRESH_REUSE_GRACE_SECONDS", -1)
+    with pytest.raises(HTTPException):
+        await refresh(first["refresh_token"])
+    # Reuse ended the whole session, including the newest token
+    with pytest.raises(HTTPException):
+        await refresh(third["refresh_token"])
+
+
+@pytest.mark.anyio
+async def test_logout_revokes_and_purge_deletes_expired(user):
+    session = await auth_service.issue_session(await _user())
+    assert (await auth.logout(auth.RefreshRequest(refresh_token=session["refresh_token"])))["message"]
+    with pytest.raises(HTTPException):
+        await refresh(session["refresh_token"])
+
+    async with TestingSessionLocal() as db:
+        total = (await db.execute(select(func.count(RefreshToken.id)))).scalar()
+    purged = await auth_service.purge_expired_refresh_tokens(now=datetime.utcnow() + timedelta(days=31))
+    assert purged == total
+
+
+async def _user():
+    async with TestingSessionLocal() as db:
+        return await db.get(User, 701)
@@ -0,0 +1,84 @@
+import pytest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from sqlalchemy import select, insert
+
+from tests.conftest import TestingSessionLocal
+from app.models.notification import Notification
+from app.models.organization import Organization
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+from app.services.risk_service import risk_service
+
+
+def test_column_scoring_matches_calculate_task_risk():
+    now = datetime.utcnow()
+    # Offset by half an hour so calculate_task_risk reading its own clock stays in the same bucket
+    offsets = [None] + [timedelta(hours=h, minutes=30) for h in range(-50, 24 * 10, 5)]
+    tasks = [
+        SimpleNamespace(
+            status=status,
+            due_date=now + offset if offset is not None else None,
+            progress_percentage=progress
+        )
+        for status in ('To Do', 'In Progress', 'Done')
+        for progress in (0, 10, 30, 60)
+        for offset in offsets
+    ]
+
+    levels = risk_service.score_risk_levels(
+        [t.status for t in tasks],
+        [t.due_date for t in tasks],
+        [t.progress_percentage for t in tasks],
+        now
+    )
+
+    assert levels == [risk_service.calculate_task_risk(t) for t in tasks]
+
+
+@pytest.mark.anyio
+async def test_scan_updates_changed_levels_and_notifies_once(setup_database):
+    now = datetime.utcnow()
+    async with TestingSessionLocal() as session:
+        user = User(username="risk_owner", email="risk_owner@test.com")
+        session.add(user)
+        await session.flush()
+        project = Project(name="Risky", owner_id=user.id)
+        session.add(project)
+        await session.flush()
+        owner_id, project_id = user.id, project.id
+        await session.execute(insert(Task.__table__), [
+            {"id": f"risk-{i:02d}", "project_id": project_id, "title": f"Task {i}",
+             "status": "In Progress", "progress_percentage": 0, "risk_level": "low",
+             "assignee_id": owner_id, "due_date": now - timedelta(days=1)}
+            for i in range(5)
+        ] + [
+            {"id": "risk-calm", "project_id": project_id, "title": "Calm",
+             "status": "To Do", "progress_percentage": 0, "risk_level": "low",
+             "assignee_id": owner_id, "due_date": now + timedelta(days=30)},
+        ])
+        await session.commit()
+
+    stats = await risk_service.scan_task_risks(where=Task.project_id == project_id, chunk_size=2)
+    assert stats["tasks_scanned"] == 6
+    assert stats["risk_changes"] == 5
+    assert stats["high_risk"] == 5
+    assert stats["notifications_sent"] == 5
+    assert stats["tasks_per_second"] > 0
+
+    again = await risk_service.scan_task_risks(where=Task.project_id == project_id, chunk_size=2)
+    assert again["risk_changes"] == 0
+    assert again["notifications_sent"] == 0
+
+    async with TestingSessionLocal() as session:
+        levels = dict((await session.execute(
+            select(Task.id, Task.risk_level).where(Task.project_id == project_id)
+        )).all())
+        notified = (await session.execute(
+            select(Notification).where(Notification.user_id == owner_id)
+        )).scalars().all()
+
+    assert levels["risk-calm"] == "low"
+    assert all(levels[f"risk-{i:02d}"] == "high" for i in range(5))
+    assert len(notified) == 5
@@ -0,0 +1,97 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+
+from tests.conftest import TestingSessionLocal
+from app.core.scheduler import Scheduler
+from app.models.organization import Organization
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+from app.services.risk_service import risk_service
+
+
+@pytest.mark.anyio
+async def test_job_runs_on_one_worker_and_resumes_from_last_run(tmp_path):
+    started = asyncio.Event()
+    release = asyncio.Event()
+    calls = []
+
+    async def job(last_run, now):
+        calls.append((last_run, now))
+        started.set()
+        await release.wait()
+
+    worker_a, worker_b = Scheduler(lock_dir=str(tmp_path)), Scheduler(lock_dir=str(tmp_path))
+    worker_a.add_job("scan", job, interval=60)
+    worker_b.add_job("scan", job, interval=60)
+
+    running = asyncio.create_task(worker_a.run_job("scan"))
+    await started.wait()
+    assert await worker_b.run_job("scan") is False
+    release.set()
+    assert await running is True
+
+    # Worker A already ran this interval
+    assert await worker_b.run_job("scan") is False
+    assert len(calls) == 1
+    assert worker_b.jobs["scan"].skipped == 2
+
+    # Once the interval has passed, whichever worker ticks next resumes from A's run
+    worker_b.jobs["scan"].interval = 0
+    assert await worker_b.run_job("scan") is True
+    assert calls[0][0] is None
+    assert calls[1][0] == calls[0][1]
+
+
+
+@pytest.mark.anyio
+async def test_unusable_lock_dir_counts_a_failure_and_keeps_the_loop_alive(tmp_path):
+    calls = []
+
+    async def job(last_run, now):
+        calls.append(now)
+
+    worker = Scheduler(lock_dir=str(tmp_path / "missing"))
+    worker.add_job("scan", job, interval=0.01)
+    worker.start()
+    await asyncio.sleep(0.05)
+    try:
+        assert all(not task.done() for task in worker._tasks)
+        assert worker.jobs["scan"].failures >= 2
+        assert calls == []
+    finally:
+        await worker.stop()
+
+@pytest.mark.anyio
+async def test_threshold_scan_only_touches_crossed_buckets(setup_database):
+    now = datetime.utcnow()
+    since = now - timedelta(hours=1)
+    due_dates = {
+        "cross-overdue": now - timedelta(minutes=30),
+        "cross-1-day": now + timedelta(days=2, minutes=-30),
+        "cross-week": now + timedelta(days=8, minutes=-10),
+        "steady": now + timedelta(days=5),
+        "far": now + timedelta(days=30),
+    }
+
+    async with TestingSessionLocal() as session:
+        user = User(username="sched_owner", email="sched_owner@test.com")
+        session.add(user)
+        await session.flush()
+        project = Project(name="Scheduled", owner_id=user.id)
+        session.add(project)
+        await session.flush()
+        await session.execute(insert(Task.__table__), [
+            {"id": task_id, "project_id": project.id, "title": task_id, "status": "To Do",
+             "progress_percentage": 0, "risk_level": "low", "due_date": due}
+            for task_id, due in due_dates.items()
+        ])
+        await session.commit()
+
+    stats = await risk_service.scan_threshold_crossings(since, now)
+
+    assert stats["tasks_scanned"] == 3
+    assert stats["high_risk"] == 1
+    assert stats["medium_risk"] == 1
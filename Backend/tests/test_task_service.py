@@ -0,0 +1,67 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import select
+
+from tests.conftest import TestingSessionLocal
+from app.models.organization import Organization
+from app.models.task import Task
+from app.models.user import User
+from app.services.project_service import project_service
+from app.services.task_service import task_service
+
+
+PLAN = {
+    "project_name": "Bulk Project",
+    "epics": [{"name": "Epic", "stories": [{"name": "Story", "tasks": [f"Task {i}" for i in range(6)]}]}]
+}
+
+
+@pytest.fixture(scope="module")
+async def project_tasks(setup_database):
+    async with TestingSessionLocal() as session:
+        user = User(username="bulk_owner", email="bulk_owner@test.com")
+        session.add(user)
+        await session.flush()
+        owner_id = user.id
+        await session.commit()
+
+    project = await project_service.create_project_from_plan(PLAN, owner_id)
+    async with TestingSessionLocal() as session:
+        result = await session.execute(
+            select(Task.id).where(Task.project_id == project.id).order_by(Task.order)
+        )
+        return owner_id, [row.id for row in result]
+
+
+@pytest.mark.anyio
+async def test_bulk_update_tasks_reports_missing_ids_and_recomputes_risk(project_tasks):
+    owner_id, task_ids = project_tasks
+    due_soon = (datetime.utcnow() + timedelta(hours=12)).isoformat()
+
+    results = await task_service.bulk_update_tasks([
+        {"task_ids": task_ids[:3] + ["missing-task"], "assigned_to": owner_id, "status": "In Progress"},
+        {"task_ids": task_ids[:2], "due_date": due_soon, "progress_percentage": 150},
+        {"task_ids": task_ids[3:]},
+    ])
+
+    assert results["success_count"] == 3
+    assert {f["task_id"] for f in results["failed_tasks"]} == {"missing-task", *task_ids[3:]}
+
+    async with TestingSessionLocal() as session:
+        result = await session.execute(select(Task).where(Task.id.in_(task_ids)))
+        tasks = {task.id: task for task in result.scalars()}
+
+    assert all(tasks[task_id].assignee_id == owner_id for task_id in task_ids[:3])
+    assert tasks[task_ids[0]].progress_percentage == 100
+    assert tasks[task_ids[2]].risk_level == "medium"
+    assert tasks[task_ids[3]].status == "To Do"
+
+
+@pytest.mark.anyio
+async def test_bulk_assign_tasks_uses_bulk_path(project_tasks):
+    owner_id, task_ids = project_tasks
+
+    results = await task_service.bulk_assign_tasks(task_ids[3:] + ["missing-task"], owner_id)
+
+    assert results["success_count"] == 3
+    assert results["failed_tasks"] == [{"task_id": "missing-task", "reason": "Task not found"}]
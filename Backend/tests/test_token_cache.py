@@ -0,0 +1,76 @@
+import time
+import jwt
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core.security import TokenCache, get_current_user, token_cache
+
+SECRET = "test-secret-for-the-token-cache-tests"
+
+
+@pytest.fixture(autouse=True)
+def secret(monkeypatch):
+    monkeypatch.setenv("JWT_SECRET_KEY", SECRET)
+
+
+def make_token(user_id: int, expires_in: float = 3600) -> str:
+    return jwt.encode({"id": user_id, "exp": int(time.time() + expires_in)}, SECRET, algorithm="HS256")
+
+
+def test_repeated_tokens_are_verified_once():
+    cache = TokenCache(max_size=8)
+    token = make_token(1)
+
+    for _ in range(5):
+        assert cache.decode(token)["id"] == 1
+
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hits"] == 4
+
+
+def test_cached_claims_stop_at_exp(monkeypatch):
+    cache = TokenCache(max_size=8)
+    token = make_token(1, expires_in=60)
+    cache.decode(token)
+
+    later = time.time() + 61
+    monkeypatch.setattr(time, "time", lambda: later)
+    with pytest.raises(jwt.ExpiredSignatureError):
+        cache.decode(token)
+    assert cache.stats()["expired"] == 1
+    assert cache.stats()["size"] == 0
+
+
+def test_lru_eviction_and_invalid_tokens_are_not_cached():
+    cache = TokenCache(max_size=2)
+    first, second, third = make_token(1), make_token(2), make_token(3)
+    cache.decode(first)
+    cache.decode(second)
+    cache.decode(first)
+    cache.decode(third)
+
+    assert cache.stats()["evictions"] == 1
+    cache.decode(first)
+    assert cache.stats()["hits"] == 2
+
+    forged = jwt.encode({"id": 1}, "wrong-secret-for-the-token-cache-tests", algorithm="HS256")
+    for _ in range(2):
+        with pytest.raises(jwt.InvalidTokenError):
+            cache.decode(forged)
+    assert cache.stats()["size"] == 2
+
+
+def test_get_current_user_shares_the_cache():
+    token_cache.clear()
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=make_token(7))
+    hits = token_cache.stats()["hits"]
+
+    assert get_current_user(credentials)["id"] == 7
+    assert get_current_user(credentials)["id"] == 7
+    assert token_cache.stats()["hits"] == hits + 1
+
+    expired = HTTPAuthorizationCredentials(scheme="Bearer", credentials=make_token(7, expires_in=-10))
+    with pytest.raises(HTTPException) as error:
+        get_current_user(expired)
+    assert error.value.detail == "Token expired"
@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+
+from app.services.typing_throttle import TypingThrottle
+
+TICK = 0.01
+
+
+def recorder():
+    emitted = []
+
+    async def emit(user_id, channel_id, is_typing):
+        emitted.append((user_id, channel_id, is_typing))
+
+    return emitted, emit
+
+
+@pytest.mark.anyio
+async def test_keystrokes_collapse_into_one_start_and_one_stop():
+    emitted, emit = recorder()
+    throttle = TypingThrottle(emit, ttl=5 * TICK, tick=TICK)
+
+    for _ in range(50):
+        await throttle.update(1, 10)
+    assert emitted == [(1, 10, True)]
+
+    await asyncio.sleep(10 * TICK)
+    assert emitted == [(1, 10, True), (1, 10, False)]
+    assert throttle.stats() == {'events': 50, 'starts': 1, 'stops': 1, 'suppressed': 49, 'active': 0}
+
+
+@pytest.mark.anyio
+async def test_keystrokes_keep_the_state_alive_past_the_ttl():
+    emitted, emit = recorder()
+    throttle = TypingThrottle(emit, ttl=5 * TICK, tick=TICK)
+
+    for _ in range(10):
+        await throttle.update(1, 10)
+        await asyncio.sleep(2 * TICK)
+    assert emitted == [(1, 10, True)]
+
+    await asyncio.sleep(10 * TICK)
+    assert emitted[-1] == (1, 10, False)
+
+
+@pytest.mark.anyio
+async def test_explicit_stop_lands_on_the_next_tick_unless_typing_resumes():
+    emitted, emit = recorder()
+    throttle = TypingThrottle(emit, ttl=50 * TICK, tick=TICK)
+
+    await throttle.update(1, 10)
+    await throttle.update(1, 10, is_typing=False)
+    await throttle.update(1, 10)
+    await throttle.update(2, 10)
+    await throttle.update(2, 10, is_typing=False)
+    await asyncio.sleep(5 * TICK)
+
+    assert emitted == [(1, 10, True), (2, 10, True), (2, 10, False)]
+
+    throttle.drop_user(1)
+    await asyncio.sleep(5 * TICK)
+    assert emitted[-1] == (1, 10, False)
+    assert throttle.stats()['active'] == 0
@@ -0,0 +1,66 @@
+import asyncio
+import json
+import pytest
+
+from app.services.websocket_manager import ConnectionManager, SLOW_CONSUMER_CLOSE_CODE
+from tests.conftest import RecordingSocket
+
+CHANNEL_ID = 1
+
+
+class StalledSocket(RecordingSocket):
+    async def send_text(self, text):
+        await asyncio.Event().wait()
+
+
+@pytest.mark.anyio
+async def test_slow_consumer_is_dropped_without_stalling_the_channel(setup_database):
+    manager = ConnectionManager()
+    manager.send_queue_size = 4
+    fast, stalled = RecordingSocket(), StalledSocket()
+    await manager.connect(fast, 1)
+    await manager.connect(stalled, 2)
+    manager.join_channel(1, CHANNEL_ID)
+    manager.join_channel(2, CHANNEL_ID)
+
+    for i in range(10):
+        await asyncio.wait_for(
+            manager.broadcast_to_channel({"type": "message", "content": f"m{i}"}, CHANNEL_ID),
+            timeout=1
+        )
+    await asyncio.wait_for(manager.drain(), timeout=1)
+    await asyncio.sleep(0)
+
+    assert [f["content"] for f in fast.frames if f["type"] == "message"] == [f"m{i}" for i in range(10)]
+    assert stalled.close_code == SLOW_CONSUMER_CLOSE_CODE
+    assert 2 not in manager.active_connections
+
+    stats = manager.send_stats()
+    assert stats["slow_consumers_disconnected"] == 1
+    assert stats["frames_dropped"] == 1
+    assert stats["connections"] == 1
+    assert stats["queued_frames"] == 0
+
+
+class RawSocket(RecordingSocket):
+    async def send_text(self, text):
+        self.frames.append(text)
+
+
+@pytest.mark.anyio
+async def test_broadcast_encodes_the_frame_once(setup_database):
+    manager = ConnectionManager()
+    sockets = [RawSocket() for _ in range(3)]
+    for user_id, socket in enumerate(sockets, start=1):
+        await manager.connect(socket, user_id)
+        manager.join_channel(user_id, CHANNEL_ID)
+    await manager.drain()
+    for socket in sockets:
+        socket.frames.clear()
+
+    await manager.broadcast_to_channel({"type": "message", "content": "héllo"}, CHANNEL_ID)
+    await manager.drain()
+
+    first, second, third = (socket.frames[0] for socket in sockets)
+    assert first is second is third
+    assert json.loads(first) == {"type": "message", "content": "héllo"}
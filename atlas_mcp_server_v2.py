@@ -20,7 +20,78 @@ except ImportError:
 
 # Configuration
 ATLAS_API_URL = os.getenv("ATLAS_API_URL", "http://localhost:8000")
+# Access tokens expire after 15 minutes, so give the server a way to renew them:
+# the refresh_token returned by POST /api/v1/auth/login, or the account's email
+# and password. ATLAS_TOKEN alone stops working once it expires.
 ATLAS_TOKEN = os.getenv("ATLAS_TOKEN", "")
+ATLAS_REFRESH_TOKEN = os.getenv("ATLAS_REFRESH_TOKEN", "")
+ATLAS_EMAIL = os.getenv("ATLAS_EMAIL", "")
+ATLAS_PASSWORD = os.getenv("ATLAS_PASSWORD", "")
+# Refresh tokens rotate on every use; the latest one is kept here across restarts
+ATLAS_SESSION_FILE = os.path.expanduser(os.getenv("ATLAS_SESSION_FILE", "~/.atlas_mcp_session.json"))
+
+
+class AtlasAuth(httpx.Auth):
+    """Bearer auth that renews the access token and retries once on a 401"""
+
+    def __init__(self):
+        self.access_token = ATLAS_TOKEN
+        self.refresh_token = ATLAS_REFRESH_TOKEN
+        self._lock = asyncio.Lock()
+        try:
+            with open(ATLAS_SESSION_FILE) as f:
+                saved = json.load(f)
+            # Only trust the saved token if it was rotated from the configured one
+            if saved.get("configured") == ATLAS_REFRESH_TOKEN:
+                self.refresh_token = saved["refresh_token"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def can_renew(self) -> bool:
+        return bool(self.refresh_token or (ATLAS_EMAIL and ATLAS_PASSWORD))
+
+    async def async_auth_flow(self, request):
+        if not self.access_token and self.can_renew():
+            await self.renew("")
+        sent_with = self.access_token
+        request.headers["Authorization"] = f"Bearer {sent_with}"
+        response = yield request
+
+        if response.status_code == 401 and self.can_renew():
+            await self.renew(sent_with)
+            if self.access_token == sent_with:
+                return
+            request.headers["Authorization"] = f"Bearer {self.access_token}"
+            yield request
+
+    async def renew(self, expired: str):
+        """Swap the refresh token (or log in again) for a new token pair"""
+        async with self._lock:
+            if self.access_token != expired:
+                # Another request renewed it while this one waited
+                return
+            async with httpx.AsyncClient(base_url=ATLAS_API_URL, timeout=30.0) as auth_client:
+                response = None
+                if self.refresh_token:
+                    response = await auth_client.post(
+                        "/api/v1/auth/refresh", json={"refresh_token": self.refresh_token}
+                    )
+                if (response is None or response.status_code != 200) and ATLAS_EMAIL and ATLAS_PASSWORD:
+                    response = await auth_client.post(
+                        "/api/v1/auth/login", json={"email": ATLAS_EMAIL, "password": ATLAS_PASSWORD}
+                    )
+            if response is None or response.status_code != 200:
+                return
+            tokens = response.json()
+            self.access_token = tokens["access_token"]
+            self.refresh_token = tokens["refresh_token"]
+            try:
+                with open(ATLAS_SESSION_FILE, "w") as f:
+                    json.dump({"configured": ATLAS_REFRESH_TOKEN, "refresh_token": self.refresh_token}, f)
+                os.chmod(ATLAS_SESSION_FILE, 0o600)
+            except OSError:
+                pass
+
 
 # Initialize server
 app = Server("atlas-scrum-master")
@@ -28,7 +99,7 @@ app = Server("atlas-scrum-master")
 # HTTP client with error handling
 client = httpx.AsyncClient(
     base_url=ATLAS_API_URL,
-    headers={"Authorization": f"Bearer {ATLAS_TOKEN}"},
+    auth=AtlasAuth(),
     timeout=30.0
 )
 
@@ -42,7 +113,7 @@ def format_error(error: Exception, context: str = "") -> str:
     if isinstance(error, httpx.HTTPStatusError):
         status = error.response.status_code
         if status == 401:
-            return "🔒 Authentication failed. Your token may have expired. Please get a new token."
+            return "🔒 Authentication failed. Set ATLAS_REFRESH_TOKEN or ATLAS_EMAIL/ATLAS_PASSWORD so the server can renew its token."
         elif status == 403:
             return "⛔ Permission denied. You don't have access to perform this action."
         elif status == 404:
@@ -1,4 +1,5 @@
 import React, { useState } from "react";
+import { authFetch } from "../services/api";
 
 interface BulkTaskAssignProps {
   selectedTasks: string[];
@@ -22,7 +23,7 @@ const BulkTaskAssign: React.FC<BulkTaskAssignProps> = ({
     setLoading(true);
     try {
       const token = localStorage.getItem("jwt");
-      const response = await fetch(
+      const response = await authFetch(
         "http://localhost:8000/api/v1/projects/tasks/bulk-assign",
         {
           method: "POST",
@@ -1,4 +1,6 @@
 import React, { useState, useEffect, useRef } from "react";
+import { applyPresenceChanges, send, subscribe, type OnlineUser } from "../services/chatSocket";
+import { authFetch } from "../services/api";
 
 interface Message {
   id: number;
@@ -7,58 +9,29 @@ interface Message {
   created_at: string;
 }
 
-interface OnlineUser {
-  id: number;
-  username: string;
-  avatar_url: string;
-}
-
 const ChatPanel: React.FC = () => {
   const [messages, setMessages] = useState<Message[]>([]);
   const [inputValue, setInputValue] = useState("");
   const [onlineUsers, setOnlineUsers] = useState<OnlineUser[]>([]);
   const [isConnected, setIsConnected] = useState(false);
-  const wsRef = useRef<WebSocket | null>(null);
   const messagesEndRef = useRef<HTMLDivElement>(null);
 
   useEffect(() => {
-    // Connect to WebSocket
-    const token = localStorage.getItem("jwt");
-    if (!token) return;
-
-    const ws = new WebSocket(
-      `ws://localhost:8000/api/v1/chat/ws?token=${token}`
-    );
-    wsRef.current = ws;
-
-    ws.onopen = () => {
-      console.log("WebSocket connected");
-      setIsConnected(true);
-      fetchOnlineUsers();
-    };
-
-    ws.onmessage = (event) => {
-      const data = JSON.parse(event.data);
-
-      if (data.type === "message") {
-        setMessages((prev) => [...prev, data]);
-      } else if (data.type === "presence_update") {
-        fetchOnlineUsers();
+    // The tab's shared chat WebSocket
+    return subscribe(
+      (data) => {
+        if (data.type === "message") {
+          setMessages((prev) => [...prev, data]);
+        } else if (data.type === "presence_batch") {
+          // One diff per organization per tick; the full list is only fetched on (re)connect
+          setOnlineUsers((prev) => applyPresenceChanges(prev, data.changes));
+        }
+      },
+      (connected) => {
+        setIsConnected(connected);
+        if (connected) fetchOnlineUsers();
       }
-    };
-
-    ws.onclose = () => {
-      console.log("WebSocket disconnected");
-      setIsConnected(false);
-    };
-
-    ws.onerror = (error) => {
-      console.error("WebSocket error:", error);
-    };
-
-    return () => {
-      ws.close();
-    };
+    );
   }, []);
 
   useEffect(() => {
@@ -68,7 +41,7 @@ const ChatPanel: React.FC = () => {
   const fetchOnlineUsers = async () => {
     try {
       const token = localStorage.getItem("jwt");
-      const response = await fetch(
+      const response = await authFetch(
         "http://localhost:8000/api/v1/chat/online-users",
         {
           headers: {
@@ -84,7 +57,7 @@ const ChatPanel: React.FC = () => {
   };
 
   const sendMessage = () => {
-    if (!inputValue.trim() || !wsRef.current || !isConnected) return;
+    if (!inputValue.trim() || !isConnected) return;
 
     const messageData = {
       type: "message",
@@ -92,8 +65,7 @@ const ChatPanel: React.FC = () => {
       channel_id: 1, // Default channel for now
     };
 
-    wsRef.current.send(JSON.stringify(messageData));
-    setInputValue("");
+    if (send(messageData)) setInputValue("");
   };
 
   return (
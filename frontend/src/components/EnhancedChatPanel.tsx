@@ -1,4 +1,6 @@
 import React, { useState, useEffect, useRef } from "react";
+import { applyPresenceChanges, send, subscribe, type OnlineUser } from "../services/chatSocket";
+import { authFetch } from "../services/api";
 
 interface Message {
   id: number;
@@ -7,12 +9,6 @@ interface Message {
   created_at: string;
 }
 
-interface OnlineUser {
-  id: number;
-  username: string;
-  avatar_url: string;
-}
-
 interface Channel {
   id: number;
   name: string;
@@ -38,16 +34,33 @@ const EnhancedChatPanel: React.FC = () => {
   const [selectedChannel, setSelectedChannel] = useState<number | null>(null);
   const [selectedUser, setSelectedUser] = useState<number | null>(null);
   const [showCreateChannel, setShowCreateChannel] = useState(false);
-  const wsRef = useRef<WebSocket | null>(null);
   const messagesEndRef = useRef<HTMLDivElement>(null);
 
   useEffect(() => {
-    connectWebSocket();
     fetchChannels();
     fetchConversations();
-    return () => {
-      wsRef.current?.close();
-    };
+    // The tab's shared chat WebSocket
+    return subscribe(
+      (data) => {
+        if (data.type === "message") {
+          if (
+            (selectedChannel && data.channel_id === selectedChannel) ||
+            (selectedUser &&
+              (data.sender_id === selectedUser ||
+                data.recipient_id === selectedUser))
+          ) {
+            setMessages((prev) => [...prev, data]);
+          }
+        } else if (data.type === "presence_batch") {
+          // One diff per organization per tick; the full list is only fetched on (re)connect
+          setOnlineUsers((prev) => applyPresenceChanges(prev, data.changes));
+        }
+      },
+      (connected) => {
+        setIsConnected(connected);
+        if (connected) fetchOnlineUsers();
+      }
+    );
   }, []);
 
   useEffect(() => {
@@ -62,44 +75,10 @@ const EnhancedChatPanel: React.FC = () => {
     messagesEndRef.current?.scrollIntoView({ behavior: "smooth" });
   }, [messages]);
 
-  const connectWebSocket = () => {
-    const token = localStorage.getItem("jwt");
-    if (!token) return;
-
-    const ws = new WebSocket(
-      `ws://localhost:8000/api/v1/chat/ws?token=${token}`
-    );
-    wsRef.current = ws;
-
-    ws.onopen = () => {
-      setIsConnected(true);
-      fetchOnlineUsers();
-    };
-
-    ws.onmessage = (event) => {
-      const data = JSON.parse(event.data);
-      if (data.type === "message") {
-        if (
-          (selectedChannel && data.channel_id === selectedChannel) ||
-          (selectedUser &&
-            (data.sender_id === selectedUser ||
-              data.recipient_id === selectedUser))
-        ) {
-          setMessages((prev) => [...prev, data]);
-        }
-      } else if (data.type === "presence_update") {
-        fetchOnlineUsers();
-      }
-    };
-
-    ws.onclose = () => setIsConnected(false);
-    ws.onerror = (error) => console.error("WebSocket error:", error);
-  };
-
   const fetchOnlineUsers = async () => {
     try {
       const token = localStorage.getItem("jwt");
-      const response = await fetch(
+      const response = await authFetch(
         "http://localhost:8000/api/v1/chat/online-users",
         {
           headers: { Authorization: `Bearer ${token}` },
@@ -115,7 +94,7 @@ const EnhancedChatPanel: React.FC = () => {
   const fetchChannels = async () => {
     try {
       const token = localStorage.getItem("jwt");
-      const response = await fetch(
+      const response = await authFetch(
         "http://localhost:8000/api/v1/chat/channels",
         {
           headers: { Authorization: `Bearer ${token}` },
@@ -131,7 +110,7 @@ const EnhancedChatPanel: React.FC = () => {
   const fetchConversations = async () => {
     try {
       const token = localStorage.getItem("jwt");
-      const response = await fetch(
+      const response = await authFetch(
         "http://localhost:8000/api/v1/chat/conversations",
         {
           headers: { Authorization: `Bearer ${token}` },
@@ -147,7 +126,7 @@ const EnhancedChatPanel: React.FC = () => {
   const fetchChannelMessages = async (channelId: number) => {
     try {
       const token = localStorage.getItem("jwt");
-      const response = await fetch(
+      const response = await authFetch(
         `http://localhost:8000/api/v1/chat/channels/${channelId}/messages`,
         {
           headers: { Authorization: `Bearer ${token}` },
@@ -163,7 +142,7 @@ const EnhancedChatPanel: React.FC = () => {
   const fetchDirectMessages = async (userId: number) => {
     try {
       const token = localStorage.getItem("jwt");
-      const response = await fetch(
+      const response = await authFetch(
         `http://localhost:8000/api/v1/chat/direct-messages/${userId}`,
         {
           headers: { Authorization: `Bearer ${token}` },
@@ -181,7 +160,7 @@ const EnhancedChatPanel: React.FC = () => {
 
     try {
       const token = localStorage.getItem("jwt");
-      const response = await fetch(
+      const response = await authFetch(
         `http://localhost:8000/api/v1/chat/search?query=${encodeURIComponent(
           searchQuery
         )}`,
@@ -197,7 +176,7 @@ const EnhancedChatPanel: React.FC = () => {
   };
 
   const sendMessage = () => {
-    if (!inputValue.trim() || !wsRef.current || !isConnected) return;
+    if (!inputValue.trim() || !isConnected) return;
 
     const token = localStorage.getItem("jwt");
     let currentUserId = 0;
@@ -230,15 +209,15 @@ const EnhancedChatPanel: React.FC = () => {
       created_at: new Date().toISOString(),
     };
 
+    if (!send(messageData)) return;
     setMessages((prev) => [...prev, optimisticMessage]);
-    wsRef.current.send(JSON.stringify(messageData));
     setInputValue("");
   };
 
   const createChannel = async (name: string, description: string) => {
     try {
       const token = localStorage.getItem("jwt");
-      const response = await fetch(
+      const response = await authFetch(
         "http://localhost:8000/api/v1/chat/channels",
         {
           method: "POST",
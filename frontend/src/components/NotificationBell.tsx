@@ -3,6 +3,7 @@ import {
   notificationService,
   type Notification,
 } from "../services/notificationService";
+import { isConnected, noteNotificationId, subscribe } from "../services/chatSocket";
 
 const NotificationBell: React.FC = () => {
   const [notifications, setNotifications] = useState<Notification[]>([]);
@@ -10,20 +11,20 @@ const NotificationBell: React.FC = () => {
   const [isOpen, setIsOpen] = useState<boolean>(false);
   const [loading, setLoading] = useState<boolean>(false);
   const [showUnreadOnly, setShowUnreadOnly] = useState<boolean>(false);
-
-  const fetchUnreadCount = async () => {
-    try {
-      const count = await notificationService.getUnreadCount();
-      setUnreadCount(count);
-    } catch (error) {
-      console.error("Error fetching unread count:", error);
-    }
+  const addPushedNotifications = (notifs: Notification[]) => {
+    setNotifications((prev) => {
+      const known = new Set(prev.map((n) => n.id));
+      const fresh = notifs.filter((n) => !known.has(n.id)).reverse();
+      return [...fresh, ...prev];
+    });
   };
 
   const fetchNotifications = async () => {
     try {
       setLoading(true);
       const notifs = await notificationService.getNotifications(showUnreadOnly);
+      // The shared socket resumes from the newest notification we have seen
+      notifs.forEach((notif) => noteNotificationId(notif.id));
       setNotifications(notifs);
     } catch (error) {
       console.error("Error fetching notifications:", error);
@@ -33,10 +34,27 @@ const NotificationBell: React.FC = () => {
   };
 
   useEffect(() => {
-    fetchUnreadCount();
-    // Poll for new notifications every 30 seconds
-    const interval = setInterval(fetchUnreadCount, 30000);
-    return () => clearInterval(interval);
+    // Notifications and unread counts are pushed over the tab's shared chat WebSocket
+    const unsubscribe = subscribe((data) => {
+      if (data.type === "notification_sync") {
+        setUnreadCount(data.unread_count);
+        addPushedNotifications(data.notifications);
+      } else if (data.type === "notification") {
+        setUnreadCount(data.unread_count);
+        addPushedNotifications([data.notification]);
+      } else if (data.type === "unread_count") {
+        // Sent after a read or delete, including from this user's other tabs
+        setUnreadCount(data.unread_count);
+      }
+    });
+    if (isConnected()) {
+      // Another component opened the socket and its sync frame has already gone out
+      notificationService
+        .getUnreadCount()
+        .then(setUnreadCount)
+        .catch((error) => console.error("Error fetching unread count:", error));
+    }
+    return unsubscribe;
   }, []);
 
   useEffect(() => {
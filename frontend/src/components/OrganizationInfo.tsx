@@ -1,4 +1,5 @@
 import React, { useState, useEffect } from "react";
+import { authFetch } from "../services/api";
 
 interface Organization {
   id: string;
@@ -20,7 +21,7 @@ const OrganizationInfo: React.FC = () => {
   const fetchOrganization = async () => {
     try {
       const token = localStorage.getItem("jwt");
-      const response = await fetch(
+      const response = await authFetch(
         "http://localhost:8000/api/v1/organizations/my-organization",
         {
           headers: {
@@ -1,4 +1,5 @@
 import React, { useState, useEffect } from "react";
+import { authFetch } from "../services/api";
 
 interface TaskUpdateModalProps {
   task: any;
@@ -28,7 +29,7 @@ const TaskUpdateModal: React.FC<TaskUpdateModalProps> = ({
 
     try {
       const token = localStorage.getItem("jwt");
-      const response = await fetch(
+      const response = await authFetch(
         `http://localhost:8000/api/v1/projects/tasks/${task.id}`,
         {
           method: "PATCH",
@@ -2,6 +2,7 @@ import React, { useState, useEffect } from "react";
 import { useNavigate } from "react-router-dom";
 import logo from "../assets/logo.png";
 import OrganizationInfo from "./OrganizationInfo";
+import { authFetch } from "../services/api";
 
 interface User {
   id: number;
@@ -50,7 +51,7 @@ const UserProfile: React.FC<UserProfileProps> = ({ user, onSignOut }) => {
   const fetchProjects = async () => {
     try {
       const token = localStorage.getItem("jwt");
-      const response = await fetch("http://localhost:8000/api/v1/projects/", {
+      const response = await authFetch("http://localhost:8000/api/v1/projects/", {
         headers: {
           Authorization: `Bearer ${token}`,
         },
@@ -70,7 +71,7 @@ const UserProfile: React.FC<UserProfileProps> = ({ user, onSignOut }) => {
   const fetchTaskStats = async () => {
     try {
       const token = localStorage.getItem("jwt");
-      const response = await fetch("http://localhost:8000/api/v1/projects/", {
+      const response = await authFetch("http://localhost:8000/api/v1/projects/", {
         headers: {
           Authorization: `Bearer ${token}`,
         },
@@ -84,7 +85,7 @@ const UserProfile: React.FC<UserProfileProps> = ({ user, onSignOut }) => {
         // Fetch tasks for each project
         for (const project of projectsData) {
           try {
-            const tasksResponse = await fetch(
+            const tasksResponse = await authFetch(
               `http://localhost:8000/api/v1/projects/${project.id}/tasks`,
               {
                 headers: {
@@ -38,7 +38,11 @@ describe('ChatInterface', () => {
   });
 
   test('sends a message and displays AI response', async () => {
-    mockedAiService.discover.mockResolvedValue({ sender: 'ai', text: 'Mocked AI response' });
+    mockedAiService.discoverStream.mockImplementation(async (_message, _token, onEvent) => {
+      onEvent({ event: 'token', data: { text: 'Mocked AI ' } });
+      onEvent({ event: 'done', data: { text: 'Mocked AI response' } });
+      return { sender: 'ai', text: 'Mocked AI response' };
+    });
 
     render(<ChatInterface />);
 
@@ -56,7 +60,7 @@ describe('ChatInterface', () => {
       expect(screen.getByText(/Mocked AI response/i)).toBeInTheDocument();
     });
 
-    // Check if aiService.discover was called correctly
-    expect(mockedAiService.discover).toHaveBeenCalledWith('Hello AI', 'dummy_token');
+    // Check if aiService.discoverStream was called correctly
+    expect(mockedAiService.discoverStream).toHaveBeenCalledWith('Hello AI', 'dummy_token', expect.any(Function));
   });
 });
@@ -7,6 +7,12 @@ interface Message {
   text: string;
 }
 
+const PROGRESS_TEXT: Record<string, string> = {
+  generating_plan: "🧠 Generating your project plan...",
+  plan_generated: "📋 Plan ready, creating epics, stories and tasks...",
+  epics_persisted: "👥 Project saved, picking your team...",
+};
+
 const ChatInterface: React.FC = () => {
   const [messages, setMessages] = useState<Message[]>([
     {
@@ -16,6 +22,7 @@ const ChatInterface: React.FC = () => {
   ]);
   const [inputValue, setInputValue] = useState("");
   const [isLoading, setIsLoading] = useState(false);
+  const [isStreaming, setIsStreaming] = useState(false);
   const [projectCreated, setProjectCreated] = useState(false);
   const messagesEndRef = useRef<HTMLDivElement>(null);
 
@@ -40,11 +47,29 @@ const ChatInterface: React.FC = () => {
       if (!token) {
         throw new Error("Authentication token not found.");
       }
-      const aiResponse = await aiService.discover(inputValue, token);
-      setMessages((prevMessages) => [
-        ...prevMessages,
-        { sender: "ai", text: aiResponse.text },
-      ]);
+      // Stream the reply into a single AI message as events arrive
+      let started = false;
+      const showReply = (text: string) => {
+        const replace = started;
+        started = true;
+        setIsStreaming(true);
+        setMessages((prevMessages) => [
+          ...(replace ? prevMessages.slice(0, -1) : prevMessages),
+          { sender: "ai", text },
+        ]);
+      };
+      let streamed = "";
+      const aiResponse = await aiService.discoverStream(inputValue, token, (event) => {
+        if (event.event === "token") {
+          streamed += event.data.text;
+          showReply(streamed);
+        } else if (event.event === "progress") {
+          showReply(PROGRESS_TEXT[event.data.stage] ?? "⏳ Working on it...");
+        } else {
+          showReply(event.data.text);
+        }
+      });
+      if (!started) showReply(aiResponse.text);
       if (aiResponse.text === "Project created successfully!") {
         setProjectCreated(true);
       }
@@ -59,6 +84,7 @@ const ChatInterface: React.FC = () => {
       ]);
     } finally {
       setIsLoading(false);
+      setIsStreaming(false);
     }
   };
 
@@ -131,7 +157,7 @@ const ChatInterface: React.FC = () => {
           </div>
         ))}
 
-        {isLoading && (
+        {isLoading && !isStreaming && (
           <div
             style={{
               display: "flex",
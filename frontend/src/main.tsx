@@ -2,6 +2,13 @@ import { StrictMode } from 'react'
 import { createRoot } from 'react-dom/client'
 import './index.css'
 import App from './App.tsx'
+import { scheduleRefresh } from './services/session'
+import { installAxiosAuthRetry } from './services/api'
+
+// Resume refreshing the access token of a stored session
+scheduleRefresh()
+// Replay API calls that fail with an expired access token
+installAxiosAuthRetry()
 
 createRoot(document.getElementById('root')!).render(
   <StrictMode>
@@ -1,6 +1,7 @@
 import React, { useState, useEffect, useRef } from "react";
 import { useNavigate } from "react-router-dom";
 import NotificationBell from "../components/NotificationBell";
+import { accessTokenExpired, refreshSession } from "../services/session";
 
 interface LogEntry {
   message: string;
@@ -29,7 +30,11 @@ const AIAssistant: React.FC = () => {
     };
   }, []);
 
-  const startAutomation = () => {
+  const startAutomation = async () => {
+    // The token is only checked at the handshake, so make sure it is still valid
+    if (accessTokenExpired()) {
+      await refreshSession().catch((error) => console.error("Token refresh failed:", error));
+    }
     const token = localStorage.getItem("jwt");
     if (!token) {
       alert("Please login first");
@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from "react";
 import { useNavigate, useParams } from "react-router-dom";
+import { authFetch } from "../services/api";
 
 interface Task {
   id: string;
@@ -51,7 +52,7 @@ const EpicView: React.FC = () => {
   const fetchEpics = async () => {
     try {
       const token = localStorage.getItem("jwt");
-      const response = await fetch(
+      const response = await authFetch(
         `http://localhost:8000/api/v1/projects/${projectId}/epics`,
         {
           headers: {
@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from "react";
 import { useNavigate, useParams } from "react-router-dom";
 import { useToast } from "../components/Toast";
+import { authFetch } from "../services/api";
 
 interface Issue {
   id: number;
@@ -66,7 +67,7 @@ const IssuesPage: React.FC = () => {
       const token = localStorage.getItem("jwt");
       const statusParam =
         filterStatus !== "all" ? `?status=${filterStatus}` : "";
-      const response = await fetch(
+      const response = await authFetch(
         `http://localhost:8000/api/v1/issues/project/${projectId}${statusParam}`,
         {
           headers: {
@@ -89,7 +90,7 @@ const IssuesPage: React.FC = () => {
   const fetchTeamMembers = async () => {
     try {
       const token = localStorage.getItem("jwt");
-      const response = await fetch(
+      const response = await authFetch(
         "http://localhost:8000/api/v1/organizations/members",
         {
           headers: {
@@ -128,7 +129,7 @@ const IssuesPage: React.FC = () => {
         requestBody.task_id = issueForm.task_id;
       }
 
-      const response = await fetch("http://localhost:8000/api/v1/issues", {
+      const response = await authFetch("http://localhost:8000/api/v1/issues", {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -168,7 +169,7 @@ const IssuesPage: React.FC = () => {
   const handleAssignIssue = async (issueId: number, assigneeId: number) => {
     try {
       const token = localStorage.getItem("jwt");
-      const response = await fetch(
+      const response = await authFetch(
         `http://localhost:8000/api/v1/issues/${issueId}/assign`,
         {
           method: "POST",
@@ -196,7 +197,7 @@ const IssuesPage: React.FC = () => {
 
     try {
       const token = localStorage.getItem("jwt");
-      const response = await fetch(
+      const response = await authFetch(
         `http://localhost:8000/api/v1/issues/${issueId}/resolve`,
         {
           method: "POST",
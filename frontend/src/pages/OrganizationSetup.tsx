@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from "react";
 import { useNavigate } from "react-router-dom";
 import logo from "../assets/logo.png";
+import { authFetch } from "../services/api";
 
 const OrganizationSetup: React.FC = () => {
   const navigate = useNavigate();
@@ -30,7 +31,7 @@ const OrganizationSetup: React.FC = () => {
   const checkOrganization = async () => {
     try {
       const token = localStorage.getItem("jwt");
-      const response = await fetch(
+      const response = await authFetch(
         "http://localhost:8000/api/v1/organizations/my-organization",
         {
           headers: {
@@ -58,7 +59,7 @@ const OrganizationSetup: React.FC = () => {
   const fetchTeamMembers = async () => {
     try {
       const token = localStorage.getItem("jwt");
-      const response = await fetch(
+      const response = await authFetch(
         "http://localhost:8000/api/v1/organizations/members",
         {
           headers: {
@@ -82,7 +83,7 @@ const OrganizationSetup: React.FC = () => {
 
     try {
       const token = localStorage.getItem("jwt");
-      const response = await fetch(
+      const response = await authFetch(
         "http://localhost:8000/api/v1/organizations/create",
         {
           method: "POST",
@@ -114,7 +115,7 @@ const OrganizationSetup: React.FC = () => {
 
     try {
       const token = localStorage.getItem("jwt");
-      const response = await fetch(
+      const response = await authFetch(
         "http://localhost:8000/api/v1/organizations/add-member",
         {
           method: "POST",
@@ -153,7 +154,7 @@ const OrganizationSetup: React.FC = () => {
 
     try {
       const token = localStorage.getItem("jwt");
-      const response = await fetch(
+      const response = await authFetch(
         `http://localhost:8000/api/v1/organizations/remove-member/${userId}`,
         {
           method: "DELETE",
@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from "react";
 import { useNavigate, useParams } from "react-router-dom";
+import { authFetch } from "../services/api";
 
 interface Risk {
   task_id: string;
@@ -45,7 +46,7 @@ const ProjectRisks: React.FC = () => {
     try {
       setLoading(true);
       const token = localStorage.getItem("jwt");
-      const response = await fetch(
+      const response = await authFetch(
         `http://localhost:8000/api/v1/projects/${projectId}/risks`,
         {
           headers: {
@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from "react";
 import { useNavigate, useParams } from "react-router-dom";
+import { authFetch } from "../services/api";
 
 interface RiskTask {
   id: string;
@@ -39,7 +40,7 @@ const RiskDashboard: React.FC = () => {
   const fetchRisks = async () => {
     try {
       const token = localStorage.getItem("jwt");
-      const response = await fetch(
+      const response = await authFetch(
         `http://localhost:8000/api/v1/projects/${projectId}/risks`,
         {
           headers: {
@@ -63,7 +64,7 @@ const RiskDashboard: React.FC = () => {
     setDetecting(true);
     try {
       const token = localStorage.getItem("jwt");
-      const response = await fetch(
+      const response = await authFetch(
         "http://localhost:8000/api/v1/projects/detect-delays",
         {
           method: "POST",
@@ -2,6 +2,7 @@ import React, { useState } from "react";
 import { useNavigate } from "react-router-dom";
 import logo from "../assets/logo.png";
 import { authService } from "../services/auth";
+import { storeSession } from "../services/session";
 import "./SimpleLogin.css";
 
 const SimpleLogin: React.FC = () => {
@@ -38,8 +39,7 @@ const SimpleLogin: React.FC = () => {
         throw new Error(data.detail || "Authentication failed");
       }
 
-      localStorage.setItem("jwt", data.access_token);
-      localStorage.setItem("user", JSON.stringify(data.user));
+      storeSession(data);
       window.location.href = "/";
     } catch (err: any) {
       setError(err.message);
@@ -66,8 +66,7 @@ const SimpleLogin: React.FC = () => {
         throw new Error(data.detail || "Demo login failed");
       }
 
-      localStorage.setItem("jwt", data.access_token);
-      localStorage.setItem("user", JSON.stringify(data.user));
+      storeSession(data);
       window.location.href = "/";
     } catch (err: any) {
       setError(err.message);
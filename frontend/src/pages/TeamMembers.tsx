@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from "react";
 import { useNavigate } from "react-router-dom";
+import { authFetch } from "../services/api";
 
 interface TeamMember {
   id: number;
@@ -49,7 +50,7 @@ const TeamMembers: React.FC = () => {
   const fetchMembers = async () => {
     try {
       const token = localStorage.getItem("jwt");
-      const response = await fetch(
+      const response = await authFetch(
         "http://localhost:8000/api/v1/organizations/members",
         {
           headers: {
@@ -74,7 +75,7 @@ const TeamMembers: React.FC = () => {
 
     try {
       const token = localStorage.getItem("jwt");
-      const response = await fetch(
+      const response = await authFetch(
         `http://localhost:8000/api/v1/organizations/remove-member/${userId}`,
         {
           method: "DELETE",
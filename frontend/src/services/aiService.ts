@@ -1,4 +1,5 @@
 import axios from 'axios';
+import { authFetch } from './api';
 
 const API_URL = 'http://localhost:8000/api/v1/ai';
 
@@ -7,6 +8,11 @@ export interface DiscoverResponse {
   text: string;
 }
 
+export type DiscoverEvent =
+  | { event: 'token'; data: { text: string } }
+  | { event: 'progress'; data: { stage: string; project_name?: string; epics?: number } }
+  | { event: 'done'; data: { text: string } };
+
 class AIService {
   async discover(message: string, token: string): Promise<DiscoverResponse> {
     const response = await axios.post(
@@ -20,6 +26,48 @@ class AIService {
     );
     return response.data;
   }
+
+  // POST /discover/stream and hand each Server-Sent Event to onEvent;
+  // resolves with the final reply text
+  async discoverStream(
+    message: string,
+    token: string,
+    onEvent: (event: DiscoverEvent) => void
+  ): Promise<DiscoverResponse> {
+    const response = await authFetch(`${API_URL}/discover/stream`, {
+      method: 'POST',
+      headers: {
+        Authorization: `Bearer ${token}`,
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({ message }),
+    });
+    if (!response.ok || !response.body) {
+      throw new Error(`Discover stream failed: ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let text = '';
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      let boundary;
+      while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+        const frame = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        const event = frame.match(/^event: (.*)$/m)?.[1];
+        const data = frame.match(/^data: (.*)$/m)?.[1];
+        if (!event || !data) continue;
+        const parsed = { event, data: JSON.parse(data) } as DiscoverEvent;
+        if (parsed.event === 'done') text = parsed.data.text;
+        onEvent(parsed);
+      }
+    }
+    return { sender: 'ai', text };
+  }
 }
 
 export const aiService = new AIService();
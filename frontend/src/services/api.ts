@@ -0,0 +1,43 @@
+// Shared 401 handling for API calls. Access tokens only live for minutes, so a
+// request that comes back 401 rotates the token once with refreshSession() and
+// is replayed with the new one; the session is cleared if the refresh fails.
+import axios, { type AxiosError, type InternalAxiosRequestConfig } from "axios";
+import { refreshSession } from "./session";
+
+async function tryRefresh(): Promise<boolean> {
+  try {
+    return await refreshSession();
+  } catch (error) {
+    console.error("Token refresh failed:", error);
+    return false;
+  }
+}
+
+function bearer(): string {
+  return `Bearer ${localStorage.getItem("jwt")}`;
+}
+
+// Drop-in replacement for fetch() on authenticated endpoints
+export async function authFetch(input: RequestInfo | URL, init: RequestInit = {}): Promise<Response> {
+  const response = await fetch(input, init);
+  if (response.status !== 401 || !(await tryRefresh())) return response;
+
+  const headers = new Headers(init.headers);
+  headers.set("Authorization", bearer());
+  return fetch(input, { ...init, headers });
+}
+
+type RetriableConfig = InternalAxiosRequestConfig & { _authRetried?: boolean };
+
+// Same retry for every axios request; call once at startup
+export function installAxiosAuthRetry() {
+  axios.interceptors.response.use(undefined, async (error: AxiosError) => {
+    const config = error.config as RetriableConfig | undefined;
+    if (error.response?.status !== 401 || !config || config._authRetried) throw error;
+    if (!(await tryRefresh())) throw error;
+
+    config._authRetried = true;
+    config.headers.set("Authorization", bearer());
+    return axios.request(config);
+  });
+}
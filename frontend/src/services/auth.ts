@@ -1,3 +1,5 @@
+import { endSession } from "./session";
+
 // GitHub OAuth Configuration
 export const GITHUB_CLIENT_ID = import.meta.env.VITE_GITHUB_CLIENT_ID || "";
 
@@ -28,8 +30,7 @@ class ApiAuthService implements AuthService {
 
   async signOut(): Promise<void> {
     this.currentUser = null;
-    localStorage.removeItem("user");
-    localStorage.removeItem("jwt");
+    await endSession();
   }
 
   getCurrentUser(): User | null {
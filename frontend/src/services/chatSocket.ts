@@ -0,0 +1,171 @@
+// One /api/v1/chat/ws connection per tab, shared by the chat panels and the
+// notification bell so the server registers (and fans out to) the tab once.
+import { accessTokenExpired, refreshSession } from "./session";
+
+const WS_URL = "ws://localhost:8000/api/v1/chat/ws";
+const RECONNECT_DELAY_MS = 5000;
+
+export type ChatSocketListener = (data: any) => void;
+export type ChatSocketStatusListener = (connected: boolean) => void;
+
+export interface OnlineUser {
+  id: number;
+  username: string;
+  avatar_url: string;
+}
+
+// One entry of a presence_batch frame
+export interface PresenceChange {
+  user_id: number;
+  status: "online" | "offline";
+  username: string;
+  avatar_url: string;
+}
+
+const listeners = new Set<ChatSocketListener>();
+const statusListeners = new Set<ChatSocketStatusListener>();
+let socket: WebSocket | null = null;
+let connected = false;
+let reconnectTimer: ReturnType<typeof setTimeout> | null = null;
+// A refresh is pending before the next connect
+let connecting = false;
+// Set once a refused handshake has been answered with a token refresh, until a socket opens
+let refreshedForRetry = false;
+// Highest notification id seen, sent on reconnect so the server replays what we missed
+let lastNotificationId: number | null = null;
+
+function setConnected(value: boolean) {
+  connected = value;
+  statusListeners.forEach((listener) => listener(value));
+}
+
+export function noteNotificationId(id: number) {
+  if (lastNotificationId === null || id > lastNotificationId) {
+    lastNotificationId = id;
+  }
+}
+
+function scheduleReconnect(delay: number) {
+  if (listeners.size > 0 && !reconnectTimer) {
+    reconnectTimer = setTimeout(connect, delay);
+  }
+}
+
+async function connect() {
+  reconnectTimer = null;
+  if (socket || connecting || listeners.size === 0) return;
+
+  if (accessTokenExpired()) {
+    // e.g. the app reopened after idling past the access token's lifetime
+    connecting = true;
+    try {
+      await refreshSession();
+    } catch (error) {
+      console.error("Token refresh failed:", error);
+    } finally {
+      connecting = false;
+    }
+    if (socket || listeners.size === 0) return;
+  }
+
+  // Read the token on every connect; access tokens only live for minutes
+  const token = localStorage.getItem("jwt");
+  if (!token) return;
+
+  const resume = lastNotificationId !== null ? `&last_notification_id=${lastNotificationId}` : "";
+  const ws = new WebSocket(`${WS_URL}?token=${token}${resume}`);
+  socket = ws;
+
+  let opened = false;
+  ws.onopen = () => {
+    opened = true;
+    refreshedForRetry = false;
+    setConnected(true);
+  };
+
+  ws.onmessage = (event) => {
+    const data = JSON.parse(event.data);
+    if (data.type === "ping") {
+      // Heartbeat: sockets that stop answering are dropped by the server
+      ws.send(JSON.stringify({ type: "pong" }));
+      return;
+    }
+    if (data.type === "notification") {
+      noteNotificationId(data.notification.id);
+    } else if (data.type === "notification_sync") {
+      data.notifications.forEach((n: { id: number }) => noteNotificationId(n.id));
+    }
+    listeners.forEach((listener) => listener(data));
+  };
+
+  ws.onclose = () => {
+    if (socket !== ws) return;
+    socket = null;
+    setConnected(false);
+    if (listeners.size === 0) return;
+    if (opened || refreshedForRetry) {
+      scheduleReconnect(RECONNECT_DELAY_MS);
+      return;
+    }
+    // The handshake was refused, most likely for an expired token: refresh it first
+    connecting = true;
+    refreshSession()
+      .then((refreshed) => {
+        refreshedForRetry = refreshed;
+        connecting = false;
+        scheduleReconnect(refreshed ? 0 : RECONNECT_DELAY_MS);
+      })
+      .catch((error) => {
+        console.error("Token refresh failed:", error);
+        connecting = false;
+        scheduleReconnect(RECONNECT_DELAY_MS);
+      });
+  };
+
+  ws.onerror = (error) => console.error("WebSocket error:", error);
+}
+
+// Receive every frame from the shared socket; returns the unsubscribe function
+export function subscribe(
+  onMessage: ChatSocketListener,
+  onStatus?: ChatSocketStatusListener
+): () => void {
+  listeners.add(onMessage);
+  if (onStatus) {
+    statusListeners.add(onStatus);
+    onStatus(connected);
+  }
+  if (!socket && !reconnectTimer) void connect();
+
+  return () => {
+    listeners.delete(onMessage);
+    if (onStatus) statusListeners.delete(onStatus);
+    if (listeners.size > 0) return;
+    // Last subscriber gone: close the socket
+    if (reconnectTimer) clearTimeout(reconnectTimer);
+    reconnectTimer = null;
+    const ws = socket;
+    socket = null;
+    ws?.close();
+    setConnected(false);
+  };
+}
+
+export function isConnected(): boolean {
+  return connected;
+}
+
+export function send(data: object): boolean {
+  if (!socket || socket.readyState !== WebSocket.OPEN) return false;
+  socket.send(JSON.stringify(data));
+  return true;
+}
+
+// Apply a presence_batch diff to the online list fetched from /online-users
+export function applyPresenceChanges(users: OnlineUser[], changes: PresenceChange[]): OnlineUser[] {
+  const changed = new Set(changes.map((change) => change.user_id));
+  const arrivals = changes
+    .filter((change) => change.status === "online")
+    .map(({ user_id, username, avatar_url }) => ({ id: user_id, username, avatar_url }));
+  return [...users.filter((user) => !changed.has(user.id)), ...arrivals];
+}
@@ -0,0 +1,106 @@
+// Keeps the short-lived access token ("jwt" in localStorage) fresh using the
+// rotating refresh token, so API calls never need the password again.
+const AUTH_URL = "http://localhost:8000/api/v1/auth";
+// Refresh this long before the access token expires
+const REFRESH_MARGIN_MS = 60_000;
+// Spread tabs out so they rarely refresh the same token at once
+const REFRESH_JITTER_MS = 10_000;
+const RETRY_MS = 30_000;
+
+export interface SessionResponse {
+  access_token: string;
+  refresh_token: string;
+  token_type: string;
+  expires_in: number;
+  user: Record<string, unknown>;
+}
+
+let refreshTimer: ReturnType<typeof setTimeout> | null = null;
+// The refresh in flight, so concurrent callers in this tab rotate the token once
+let refreshing: Promise<boolean> | null = null;
+
+export function storeSession(data: SessionResponse) {
+  localStorage.setItem("jwt", data.access_token);
+  localStorage.setItem("refresh_token", data.refresh_token);
+  localStorage.setItem("jwt_expires_at", String(Date.now() + data.expires_in * 1000));
+  localStorage.setItem("user", JSON.stringify(data.user));
+  scheduleRefresh();
+}
+
+export function clearSession() {
+  if (refreshTimer) clearTimeout(refreshTimer);
+  refreshTimer = null;
+  localStorage.removeItem("jwt");
+  localStorage.removeItem("refresh_token");
+  localStorage.removeItem("jwt_expires_at");
+  localStorage.removeItem("user");
+}
+
+export function accessTokenExpired(): boolean {
+  const expiresAt = Number(localStorage.getItem("jwt_expires_at") || 0);
+  return expiresAt > 0 && Date.now() >= expiresAt;
+}
+
+export function refreshSession(): Promise<boolean> {
+  if (!refreshing) {
+    refreshing = rotateRefreshToken().finally(() => {
+      refreshing = null;
+    });
+  }
+  return refreshing;
+}
+
+async function rotateRefreshToken(): Promise<boolean> {
+  const refreshToken = localStorage.getItem("refresh_token");
+  if (!refreshToken) return false;
+
+  const response = await fetch(`${AUTH_URL}/refresh`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ refresh_token: refreshToken }),
+  });
+
+  if (!response.ok) {
+    if (localStorage.getItem("refresh_token") !== refreshToken) {
+      // Another tab rotated the token first and stored the new pair
+      scheduleRefresh();
+      return true;
+    }
+    clearSession();
+    return false;
+  }
+
+  storeSession(await response.json());
+  return true;
+}
+
+export function scheduleRefresh() {
+  if (refreshTimer) clearTimeout(refreshTimer);
+  refreshTimer = null;
+  if (!localStorage.getItem("refresh_token")) return;
+
+  const expiresAt = Number(localStorage.getItem("jwt_expires_at") || 0);
+  const delay = Math.max(0, expiresAt - Date.now() - REFRESH_MARGIN_MS - Math.random() * REFRESH_JITTER_MS);
+  refreshTimer = setTimeout(() => {
+    refreshSession().catch((error) => {
+      // Network trouble: keep the session and try again shortly
+      console.error("Token refresh failed:", error);
+      refreshTimer = setTimeout(scheduleRefresh, RETRY_MS);
+    });
+  }, delay);
+}
+
+export async function endSession() {
+  const refreshToken = localStorage.getItem("refresh_token");
+  clearSession();
+  if (!refreshToken) return;
+  try {
+    await fetch(`${AUTH_URL}/logout`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ refresh_token: refreshToken }),
+    });
+  } catch (error) {
+    console.error("Logout request failed:", error);
+  }
+}